@@ -0,0 +1,568 @@
+"""
+Headless HTTP API for DevTools Hub.
+
+Exposes each tool's core function as JSON endpoints (plus batch and
+streaming-upload variants) without Streamlit's per-session reruns.
+CPU-bound work runs on a process pool so the event loop never blocks.
+
+Run with:
+    uvicorn api:app --host 0.0.0.0 --port 8000
+"""
+import asyncio
+import functools
+import importlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Annotated, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+
+# Ensure project root is in path
+sys.path.append(str(Path(__file__).parent))
+
+from core.base64_converter import iter_encode_chunks
+from core.color_palette import wcag_level
+from core.jwt_decoder import MINT_MAX_TOKENS, mint_spec, mint_tokens
+from utils.cache import cached, cache_stats, store_stats
+from utils.metrics import input_size, render_prometheus, track
+from utils.uploads import CHUNK_SIZE, BinaryUploadError, Upload, UploadLimitError
+
+__version__ = "1.0.0"
+
+# ── Limits ────────────────────────────────────────────────────────────────────
+MAX_UPLOAD_MB = 50
+MAX_BATCH_ITEMS = 10_000
+MAX_UUIDS = 100_000
+INLINE_MAX_CHARS = 16 * 1024  # smaller inputs run on the event loop; pickling costs more
+API_WORKERS = int(os.environ.get("DEVTOOLS_API_WORKERS", 0)) or os.cpu_count() or 1
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Process-pool dispatch ─────────────────────────────────────────────────────
+# Functions are referenced by name so only plain data crosses process boundaries.
+TOOL_FUNCTIONS = {
+    "decode_jwt": "core.jwt_decoder:decode_jwt",
+    "format_json": "core.json_formatter:format_json",
+    "minify_json": "core.json_formatter:minify_json",
+    "ts_to_date": "core.timestamp_converter:ts_to_date",
+    "date_to_ts": "core.timestamp_converter:date_to_ts",
+    "generate_uuids": "core.uuid_generator:generate_uuids",
+    "encode_text": "core.base64_converter:encode_text",
+    "decode_text": "core.base64_converter:decode_text",
+    "encode_url": "core.url_encoder:encode_url",
+    "decode_url": "core.url_encoder:decode_url",
+    "safe_findall": "core.regex_tester:safe_findall",
+    "convert_markdown": "core.markdown_converter:convert_markdown_incremental",
+    "calculate_contrast_ratio": "core.color_palette:calculate_contrast_ratio",
+    "generate_robots": "core.robots_generator:generate_robots",
+}
+
+# Cache namespaces match the Streamlit pages, so both share the result store.
+CACHE_NAMESPACES = {
+    "core.jwt_decoder": "jwt", "core.json_formatter": "json", "core.timestamp_converter": "timestamp",
+    "core.uuid_generator": "uuid", "core.base64_converter": "base64", "core.url_encoder": "url",
+    "core.regex_tester": "regex", "core.markdown_converter": "markdown",
+    "core.color_palette": "color", "core.robots_generator": "robots",
+}
+
+# Random generators: only calls passing this seed argument are cached.
+SEED_ARGS = {"generate_uuids": "seed"}
+
+@functools.lru_cache(maxsize=None)
+def _resolve(name: str):
+    module, attr = TOOL_FUNCTIONS[name].split(":")
+    # Timed by run_tool/run_batch in the parent, where /metrics is served
+    return cached(CACHE_NAMESPACES[module], instrument=False, seed_arg=SEED_ARGS.get(name))(
+        getattr(importlib.import_module(module), attr)
+    )
+
+def _call(name: str, args: tuple):
+    """Run one tool function (in a worker process or inline)."""
+    return _resolve(name)(*args)
+
+def _call_batch(name: str, args_list: list):
+    """Run a tool function over many argument tuples, capturing per-item errors."""
+    fn = _resolve(name)
+    results = []
+    for args in args_list:
+        try:
+            results.append({"result": fn(*args)})
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+def _sub_file(pattern: str, repl: str, path: str, encoding: str, flags: int):
+    """
+    Worker-side streaming substitution from a spooled upload into a result
+    file; only paths cross the process boundary. Returns (result path, count).
+    """
+    from core.regex_tester import stream_sub
+    with open(path, "rb") as src:
+        out, total, _, _ = stream_sub(pattern, repl, src, flags, preview_limit=0, encoding=encoding)
+    with out, tempfile.NamedTemporaryFile(prefix="devtools-result-", delete=False) as dest:
+        try:
+            shutil.copyfileobj(out, dest, CHUNK_SIZE)
+        except BaseException:
+            os.unlink(dest.name)
+            raise
+    return dest.name, total
+
+def _flatten_file(path: str, encoding: str, delimiter: str, sample_size: int):
+    """
+    Worker-side JSON array/NDJSON to CSV flattening of a spooled upload into
+    a result file. Returns (result path, record count, number of late fields).
+    """
+    from core.json_formatter import flatten_to_csv
+    with open(path, encoding=encoding) as src:
+        out, _, count, late, _ = flatten_to_csv(iter(lambda: src.read(CHUNK_SIZE), ""), delimiter, sample_size)
+    with out, tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="",
+                                          prefix="devtools-result-", delete=False) as dest:
+        try:
+            shutil.copyfileobj(out, dest, CHUNK_SIZE)
+        except BaseException:
+            os.unlink(dest.name)
+            raise
+    return dest.name, count, len(late)
+
+def _mint_file(spec: dict, key: bytes, count: int) -> str:
+    """Mint tokens into a result file, signing large runs on the API's process pool."""
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", prefix="devtools-result-", delete=False) as dest:
+        try:
+            mint_tokens(spec, key, count, out=dest, executor=_pool)
+        except BaseException:
+            os.unlink(dest.name)
+            raise
+    return dest.name
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def _namespace(name: str) -> str:
+    return CACHE_NAMESPACES[TOOL_FUNCTIONS[name].split(":")[0]]
+
+async def run_tool(name: str, *args, inline: bool = False):
+    """Await a tool function, offloading to the process pool unless inline."""
+    with track(_namespace(name), name, input_size(args)):
+        if inline or _pool is None:
+            return _call(name, args)
+        return await asyncio.get_running_loop().run_in_executor(_pool, _call, name, args)
+
+async def run_batch(name: str, args_list: list):
+    if len(args_list) > MAX_BATCH_ITEMS:
+        raise HTTPException(413, f"Too many items ({len(args_list):,}). Max allowed is {MAX_BATCH_ITEMS:,}.")
+    with track(_namespace(name), f"{name}_batch", input_size(args_list)):
+        return await asyncio.get_running_loop().run_in_executor(_pool, _call_batch, name, args_list)
+
+def _bad_request(e: Exception) -> HTTPException:
+    return HTTPException(400, f"{type(e).__name__}: {e}")
+
+async def _spool_upload(file: UploadFile) -> Upload:
+    """Spool an upload to a temp file in a thread, enforcing the size limit while copying."""
+    try:
+        return await asyncio.to_thread(
+            Upload.spool, file.filename or "upload", file.file, MAX_UPLOAD_MB * 1024 * 1024
+        )
+    except UploadLimitError as e:
+        raise HTTPException(413, str(e))
+
+def _upload_text(upload: Upload) -> str:
+    try:
+        return upload.read_text()
+    except BinaryUploadError as e:
+        raise HTTPException(400, str(e))
+    except UnicodeDecodeError:
+        raise HTTPException(400, f"Unable to decode file as {upload.encoding}. Please send UTF-8 text.")
+
+def _stream_file(path: str):
+    """Yield a result file in chunks, deleting it once sent (or abandoned)."""
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+    finally:
+        os.unlink(path)
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes a resource however the response ends.
+    A generator's own finally never runs if the client disconnects before
+    the first chunk, and Starlette skips background tasks on disconnect.
+    """
+
+    def __init__(self, content, resource, **kwargs):
+        super().__init__(content, **kwargs)
+        self._resource = resource
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._resource.close()
+# ──────────────────────────────────────────────────────────────────────────────
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _pool
+    _pool = ProcessPoolExecutor(API_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        yield
+    finally:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+app = FastAPI(title="DevTools Hub API", version=__version__, lifespan=lifespan)
+
+# ── Request models ────────────────────────────────────────────────────────────
+class TokenIn(BaseModel):
+    token: str = Field(max_length=5000)
+
+class TokensIn(BaseModel):
+    tokens: list[str]
+
+class MintIn(BaseModel):
+    algorithm: str = Field("HS256", pattern="^(HS256|RS256|ES256|EdDSA)$")
+    key: str                                  # HS256 secret or PEM private key
+    claims: dict = {}
+    count: int = Field(1000, ge=1, le=MINT_MAX_TOKENS)
+    iat_offset: int = 0
+    iat_spread: int = Field(0, ge=0)
+    ttl: int = Field(3600, ge=0)
+    jti: bool = True
+    kid: str = ""
+    seed: Optional[int] = None
+    iat_base: Optional[int] = None            # Unix time iat is relative to (default: now)
+
+class JsonIn(BaseModel):
+    data: str
+    indent: int = 2
+    sort_keys: bool = False
+    ensure_ascii: bool = False
+
+class JsonBatchIn(BaseModel):
+    documents: list[str]
+    indent: int = 2
+    sort_keys: bool = False
+    ensure_ascii: bool = False
+    minify: bool = False
+
+class TimestampIn(BaseModel):
+    timestamp: float
+    format: str = "ISO 8601"
+    timezone: str = "UTC"
+
+class DateIn(BaseModel):
+    date: str
+    timezone: str = "UTC"
+
+class TimestampBatchIn(BaseModel):
+    values: list[str]
+    direction: str = Field("to_date", pattern="^(to_date|to_timestamp)$")
+    timezone: str = "UTC"
+
+class UuidIn(BaseModel):
+    count: int = Field(1, ge=1, le=MAX_UUIDS)
+    seed: Optional[int] = None
+
+class TextIn(BaseModel):
+    text: str
+
+class TextBatchIn(BaseModel):
+    items: list[str]
+
+class RegexIn(BaseModel):
+    pattern: str
+    text: str
+    ignore_case: bool = False
+
+class MarkdownIn(BaseModel):
+    markdown: str
+
+class MarkdownBatchIn(BaseModel):
+    documents: list[str]
+
+HexColor = Annotated[str, Field(pattern="^#[0-9a-fA-F]{6}$")]
+
+class ContrastIn(BaseModel):
+    foreground: HexColor
+    background: HexColor
+
+class ContrastBatchIn(BaseModel):
+    pairs: list[tuple[HexColor, HexColor]]
+
+class RobotsIn(BaseModel):
+    agents: list[str] = ["*"]
+    disallow: list[str] = []
+    allow: list[str] = []
+    crawl_delay: str = ""
+# ──────────────────────────────────────────────────────────────────────────────
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "version": __version__, "workers": API_WORKERS}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of per-tool latency, input size and error metrics."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/stats")
+async def cache_stats_endpoint():
+    """In-memory caches of this API process (inline calls only) and the shared result store."""
+    return {"memory": cache_stats(), "store": store_stats()}
+
+# ── JWT ───────────────────────────────────────────────────────────────────────
+@app.post("/jwt/decode")
+async def jwt_decode(body: TokenIn):
+    try:
+        header, payload = await run_tool("decode_jwt", body.token.strip(), inline=True)
+    except Exception as e:
+        raise _bad_request(e)
+    return {"header": header, "payload": payload}
+
+@app.post("/jwt/decode/batch")
+async def jwt_decode_batch(body: TokensIn):
+    results = await run_batch("decode_jwt", [(t.strip(),) for t in body.tokens])
+    for item in results:
+        if "result" in item:
+            header, payload = item.pop("result")
+            item.update(header=header, payload=payload)
+    return {"results": results}
+
+@app.post("/jwt/mint")
+async def jwt_mint(body: MintIn):
+    try:
+        spec = mint_spec(body.algorithm, body.claims, body.iat_offset, body.iat_spread, body.ttl,
+                         body.jti, body.seed, body.kid, body.iat_base)
+        with track("jwt", "mint", body.count):
+            path = await asyncio.to_thread(_mint_file, spec, body.key.encode(), body.count)
+    except ValueError as e:
+        raise _bad_request(e)
+    return StreamingResponse(_stream_file(path), media_type="text/plain; charset=utf-8",
+                             headers={"X-Tokens": str(body.count)})
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── JSON ──────────────────────────────────────────────────────────────────────
+@app.post("/json/format")
+async def json_format(body: JsonIn):
+    try:
+        result = await run_tool("format_json", body.data, body.indent, body.sort_keys, body.ensure_ascii,
+                                inline=len(body.data) < INLINE_MAX_CHARS)
+    except Exception as e:
+        raise _bad_request(e)
+    return {"result": result}
+
+@app.post("/json/minify")
+async def json_minify(body: TextIn):
+    try:
+        result = await run_tool("minify_json", body.text, inline=len(body.text) < INLINE_MAX_CHARS)
+    except Exception as e:
+        raise _bad_request(e)
+    return {"result": result}
+
+@app.post("/json/format/batch")
+async def json_format_batch(body: JsonBatchIn):
+    if body.minify:
+        return {"results": await run_batch("minify_json", [(d,) for d in body.documents])}
+    args = [(d, body.indent, body.sort_keys, body.ensure_ascii) for d in body.documents]
+    return {"results": await run_batch("format_json", args)}
+
+@app.post("/json/format/upload")
+async def json_format_upload(file: UploadFile = File(...), indent: int = Form(2),
+                             sort_keys: bool = Form(False), minify: bool = Form(False)):
+    with await _spool_upload(file) as upload:
+        data = _upload_text(upload)
+    try:
+        if minify:
+            result = await run_tool("minify_json", data)
+        else:
+            result = await run_tool("format_json", data, indent, sort_keys, False)
+    except Exception as e:
+        raise _bad_request(e)
+    return Response(result, media_type="application/json")
+
+@app.post("/json/flatten/upload")
+async def json_flatten_upload(file: UploadFile = File(...), tsv: bool = Form(False),
+                              sample_size: int = Form(1000, ge=1, le=100_000)):
+    with await _spool_upload(file) as upload:
+        if upload.encoding is None:
+            raise HTTPException(400, f"{upload.name} looks like a binary file, not text.")
+        try:
+            with track("json", "flatten_upload", upload.size):
+                result_path, count, late = await asyncio.get_running_loop().run_in_executor(
+                    _pool, _flatten_file, upload.path, upload.encoding, "\t" if tsv else ",", sample_size
+                )
+        except Exception as e:
+            raise _bad_request(e)
+    media_type = "text/tab-separated-values" if tsv else "text/csv"
+    return StreamingResponse(_stream_file(result_path), media_type=f"{media_type}; charset=utf-8",
+                             headers={"X-Records": str(count), "X-Unsampled-Fields": str(late)})
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Timestamps ────────────────────────────────────────────────────────────────
+@app.post("/timestamp/to-date")
+async def timestamp_to_date(body: TimestampIn):
+    try:
+        return {"result": await run_tool("ts_to_date", body.timestamp, body.format, body.timezone, inline=True)}
+    except Exception as e:
+        raise _bad_request(e)
+
+@app.post("/timestamp/to-timestamp")
+async def timestamp_from_date(body: DateIn):
+    try:
+        return {"result": await run_tool("date_to_ts", body.date, body.timezone, inline=True)}
+    except Exception as e:
+        raise _bad_request(e)
+
+@app.post("/timestamp/batch")
+async def timestamp_batch(body: TimestampBatchIn):
+    if body.direction == "to_date":
+        # Unparseable values get a per-item error like any other batch failure
+        results, args = [], []
+        for value in body.values:
+            try:
+                args.append((float(value), "ISO 8601", body.timezone))
+                results.append(None)
+            except ValueError as e:
+                results.append({"error": str(e)})
+        converted = iter(await run_batch("ts_to_date", args))
+        return {"results": [r if r is not None else next(converted) for r in results]}
+    return {"results": await run_batch("date_to_ts", [(v.strip(), body.timezone) for v in body.values])}
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── UUIDs ─────────────────────────────────────────────────────────────────────
+@app.post("/uuid/generate")
+async def uuid_generate(body: UuidIn):
+    return {"uuids": await run_tool("generate_uuids", body.count, body.seed, inline=body.count <= 1000)}
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Base64 ────────────────────────────────────────────────────────────────────
+@app.post("/base64/encode")
+async def base64_encode(body: TextIn):
+    return {"result": await run_tool("encode_text", body.text, inline=len(body.text) < INLINE_MAX_CHARS)}
+
+@app.post("/base64/decode")
+async def base64_decode(body: TextIn):
+    try:
+        return {"result": await run_tool("decode_text", body.text, inline=len(body.text) < INLINE_MAX_CHARS)}
+    except Exception as e:
+        raise _bad_request(e)
+
+@app.post("/base64/encode/batch")
+async def base64_encode_batch(body: TextBatchIn):
+    return {"results": await run_batch("encode_text", [(t,) for t in body.items])}
+
+@app.post("/base64/decode/batch")
+async def base64_decode_batch(body: TextBatchIn):
+    return {"results": await run_batch("decode_text", [(t,) for t in body.items])}
+
+@app.post("/base64/encode/upload")
+async def base64_encode_upload(file: UploadFile = File(...)):
+    upload = await _spool_upload(file)
+
+    def encode():
+        # Raw bytes, encoded chunk by chunk from the mmap while the response streams
+        with track("base64", "encode_upload", upload.size):
+            yield from iter_encode_chunks(upload.iter_chunks())
+
+    return _ClosingStreamingResponse(encode(), upload, media_type="text/plain")
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── URLs ──────────────────────────────────────────────────────────────────────
+@app.post("/url/encode")
+async def url_encode(body: TextIn):
+    return {"result": await run_tool("encode_url", body.text, inline=len(body.text) < INLINE_MAX_CHARS)}
+
+@app.post("/url/decode")
+async def url_decode(body: TextIn):
+    return {"result": await run_tool("decode_url", body.text, inline=len(body.text) < INLINE_MAX_CHARS)}
+
+@app.post("/url/encode/batch")
+async def url_encode_batch(body: TextBatchIn):
+    return {"results": await run_batch("encode_url", [(t,) for t in body.items])}
+
+@app.post("/url/decode/batch")
+async def url_decode_batch(body: TextBatchIn):
+    return {"results": await run_batch("decode_url", [(t,) for t in body.items])}
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Regex ─────────────────────────────────────────────────────────────────────
+@app.post("/regex/findall")
+async def regex_findall(body: RegexIn):
+    # Always offloaded: safe_findall's SIGALRM timeout needs a worker's main thread
+    flags = re.IGNORECASE if body.ignore_case else 0
+    try:
+        matches = await run_tool("safe_findall", body.pattern, body.text, flags)
+    except Exception as e:
+        raise _bad_request(e)
+    return {"count": len(matches), "matches": matches}
+
+@app.post("/regex/sub/upload")
+async def regex_sub_upload(file: UploadFile = File(...), pattern: str = Form(...),
+                           replacement: str = Form(""), ignore_case: bool = Form(False)):
+    flags = re.IGNORECASE if ignore_case else 0
+    with await _spool_upload(file) as upload:
+        if upload.encoding is None:
+            raise HTTPException(400, f"{upload.name} looks like a binary file, not text.")
+        try:
+            with track("regex", "sub_upload", upload.size):
+                result_path, total = await asyncio.get_running_loop().run_in_executor(
+                    _pool, _sub_file, pattern, replacement, upload.path, upload.encoding, flags
+                )
+        except Exception as e:
+            raise _bad_request(e)
+    return StreamingResponse(_stream_file(result_path), media_type="text/plain; charset=utf-8",
+                             headers={"X-Substitutions": str(total)})
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Markdown ──────────────────────────────────────────────────────────────────
+@app.post("/markdown/convert")
+async def markdown_convert(body: MarkdownIn):
+    try:
+        return {"html": await run_tool("convert_markdown", body.markdown)}
+    except Exception as e:
+        raise _bad_request(e)
+
+@app.post("/markdown/convert/batch")
+async def markdown_convert_batch(body: MarkdownBatchIn):
+    return {"results": await run_batch("convert_markdown", [(d,) for d in body.documents])}
+
+@app.post("/markdown/convert/upload")
+async def markdown_convert_upload(file: UploadFile = File(...)):
+    with await _spool_upload(file) as upload:
+        data = _upload_text(upload)
+    try:
+        html = await run_tool("convert_markdown", data)
+    except Exception as e:
+        raise _bad_request(e)
+    return HTMLResponse(html)
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Colors ────────────────────────────────────────────────────────────────────
+@app.post("/color/contrast")
+async def color_contrast(body: ContrastIn):
+    ratio = await run_tool("calculate_contrast_ratio", body.foreground.upper(), body.background.upper(), inline=True)
+    return {"ratio": round(ratio, 2), "level": wcag_level(ratio)}
+
+@app.post("/color/contrast/batch")
+async def color_contrast_batch(body: ContrastBatchIn):
+    results = await run_batch("calculate_contrast_ratio", [(fg.upper(), bg.upper()) for fg, bg in body.pairs])
+    for item in results:
+        if "result" in item:
+            ratio = item.pop("result")
+            item.update(ratio=round(ratio, 2), level=wcag_level(ratio))
+    return {"results": results}
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Robots.txt ────────────────────────────────────────────────────────────────
+@app.post("/robots/generate")
+async def robots_generate(body: RobotsIn):
+    txt = await run_tool("generate_robots", body.agents, body.disallow, body.allow, body.crawl_delay, inline=True)
+    return {"result": txt}
+# ──────────────────────────────────────────────────────────────────────────────
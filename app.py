@@ -1,5 +1,7 @@
 import streamlit as st
+import os
 import sys
+import importlib
 from pathlib import Path
 
 # Version info
@@ -8,80 +10,110 @@ __version__ = "1.0.0"
 # Ensure project root is in path
 sys.path.append(str(Path(__file__).parent))
 
-# Import modules
-from tools import (
-    jwt_decoder, json_formatter, timestamp_converter,
-    uuid_generator, base64_converter, url_encoder,
-    regex_tester, markdown_converter,
-    color_palette, robots_generator
-)
-from utils.common import add_footer
-
-# ── 1. Configure page BEFORE any markdown──
-st.set_page_config(
-    page_title="DevTools Hub - Free Developer Utilities",
-    page_icon="🛠️",
-    layout="wide",
-    initial_sidebar_state="collapsed"  # Hide sidebar by default
-)
-
-# ── 2. Inject Global CSS for theming ────────────────────────────────────────────
-st.markdown(
-    """
-    <style>
-      .main-header { text-align:center; color:#00d4aa; font-size:2.5rem; margin-bottom:0.5rem; }
-      .sub-header  { text-align:center; color:#fafafa; font-size:1.2rem; margin-bottom:2rem; }
-      .tool-card   { background:#262730; padding:1rem; border-radius:0.5rem; margin:0.5rem 0; border-left:4px solid #00d4aa; }
-      .stButton > button {
-        background:#262730 !important;
-        border:1px solid transparent !important;
-        border-left:4px solid #00d4aa !important;
-        color:#fafafa !important;
-        padding:1.5rem !important;
-        border-radius:0.5rem !important;
-        text-align:left !important;
-        width:100% !important;
-        height:auto !important;
-        transition: all 0.3s ease !important;
-      }
-      .stButton > button strong {
-        font-size: 1.3rem !important;
-        color: #00d4aa !important;
-    }
-
-      .stButton > button:hover {
-        transform: translateY(-3px) !important;
-        box-shadow: 0 6px 20px rgba(0, 212, 170, 0.3) !important;
-        border: 1px solid #00d4aa !important;
-        background:#2a2d3a !important;
-      }
-      .back-button { background: #00d4aa; color: #0e1117; border: none; padding: 8px 16px; border-radius: 4px; margin-bottom: 1rem; }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+from utils.common import add_footer, inject_csp, configure_logging
+from utils.cache import cache_stats, store_stats, clear_caches
+from utils.metrics import snapshot, start_metrics_server
+from utils import profiling
+
+# ── Tool registry ──────────────────────────────────────────────────────────────
+# key: (module, title, description). Modules are imported only when a tool is
+# opened, so the home page never pays for markdown2, bleach, NumPy or Pillow.
+TOOL_REGISTRY = {
+    "jwt": ("tools.jwt_decoder", "🔑 JWT Decoder", "Decode JSON Web Tokens without verification"),
+    "json": ("tools.json_formatter", "📝 JSON Formatter", "Format, validate, and beautify JSON data"),
+    "timestamp": ("tools.timestamp_converter", "⏰ Timestamp Converter", "Convert Unix timestamps to human dates"),
+    "uuid": ("tools.uuid_generator", "🆔 UUID Generator", "Generate unique identifiers in bulk"),
+    "base64": ("tools.base64_converter", "🔤 Base64 Converter", "Encode/decode text and files to Base64"),
+    "url": ("tools.url_encoder", "🔗 URL Encoder", "Encode special characters for URLs"),
+    "regex": ("tools.regex_tester", "🔍 Regex Tester", "Test regular expressions with sample text"),
+    "markdown": ("tools.markdown_converter", "📄 Markdown Converter", "Convert Markdown to HTML instantly"),
+    "color": ("tools.color_palette", "🎨 Color Palette", "Generate colors and check WCAG contrast"),
+    "robots": ("tools.robots_generator", "🤖 Robots.txt Generator", "Create robots.txt for search engines"),
+    "pipeline": ("tools.pipeline_builder", "🧩 Pipeline Builder", "Chain tools: URL → Base64 → JWT → JSON"),
+    "hash": ("tools.file_hasher", "#️⃣ File Hasher", "Checksum files and archives; verify SHA256SUMS"),
+}
+
+# Operator-only sidebar controls (process-wide profiling, cache clearing)
+ADMIN = os.environ.get("DEVTOOLS_ADMIN", "").lower() in ("1", "true", "yes")
+
+def load_tool(key: str):
+    """Import a tool's page module on first use (cached by sys.modules)."""
+    return importlib.import_module(TOOL_REGISTRY[key][0])
 # ────────────────────────────────────────────────────────────────────────────────
 
-# ── SEO & Social Metadata ──────────────────────────────────────────────────────
-st.markdown(
+def configure_page():
     """
-    <meta property="og:title" content="DevTools Hub – Free Developer Utilities" />
-    <meta property="og:description" content="Professional developer tools: JWT decoder, JSON formatter, Base64 converter, and more. Free & unlimited usage." />
-    <meta property="og:image" content="https://raw.githubusercontent.com/timothyvasala/dev-tools-hub/main/static/devtools-logo.png" />
-    <meta property="og:url" content="https://devtools-hub.streamlit.app" />
-    <meta property="og:type" content="website" />
-    <meta name="twitter:card" content="summary_large_image" />
-    <meta name="twitter:title" content="DevTools Hub – Free Developer Utilities" />
-    <meta name="twitter:description" content="Professional developer tools: JWT decoder, JSON formatter, Base64 converter, and more." />
-    <meta name="twitter:image" content="https://raw.githubusercontent.com/timothyvasala/dev-tools-hub/main/static/devtools-logo.png" />
-    """,
-    unsafe_allow_html=True
-)
-# ────────────────────────────────────────────────────────────────────────────────
+    Page config, CSP, theme CSS and social metadata for every run. Called
+    from main(), so the spawned pool workers that re-import this file as
+    __mp_main__ never touch Streamlit.
+    """
+    # ── 1. Configure page BEFORE any markdo
+    st.set_page_config(
+        page_title="DevTools Hub - Free Developer Utilities",
+        page_icon="🛠️",
+        layout="wide",
+        initial_sidebar_state="collapsed"  # Hide sidebar by default
+    )
+
+    inject_csp()
+
+    # ── 2. Inject Global CSS for theming ────────────────────────────────────────
+    st.markdown(
+        """
+        <style>
+          .main-header { text-align:center; color:#00d4aa; font-size:2.5rem; margin-bottom:0.5rem; }
+          .sub-header  { text-align:center; color:#fafafa; font-size:1.2rem; margin-bottom:2rem; }
+          .tool-card   { background:#262730; padding:1rem; border-radius:0.5rem; margin:0.5rem 0; border-left:4px solid #00d4aa; }
+          .stButton > button {
+            background:#262730 !important;
+            border:1px solid transparent !important;
+            border-left:4px solid #00d4aa !important;
+            color:#fafafa !important;
+            padding:1.5rem !important;
+            border-radius:0.5rem !important;
+            text-align:left !important;
+            width:100% !important;
+            height:auto !important;
+            transition: all 0.3s ease !important;
+          }
+          .stButton > button strong {
+            font-size: 1.3rem !important;
+            color: #00d4aa !important;
+        }
+
+          .stButton > button:hover {
+            transform: translateY(-3px) !important;
+            box-shadow: 0 6px 20px rgba(0, 212, 170, 0.3) !important;
+            border: 1px solid #00d4aa !important;
+            background:#2a2d3a !important;
+          }
+          .back-button { background: #00d4aa; color: #0e1117; border: none; padding: 8px 16px; border-radius: 4px; margin-bottom: 1rem; }
+        </style>
+        """,
+        unsafe_allow_html=True
+    )
+    # ────────────────────────────────────────────────────────────────────────────
 
-# Initialize session state
-if 'current_tool' not in st.session_state:
-    st.session_state.current_tool = 'home'
+    # ── SEO & Social Metadata ──────────────────────────────────────────────────
+    st.markdown(
+        """
+        <meta property="og:title" content="DevTools Hub – Free Developer Utilities" />
+        <meta property="og:description" content="Professional developer tools: JWT decoder, JSON formatter, Base64 converter, and more. Free & unlimited usage." />
+        <meta property="og:image" content="https://raw.githubusercontent.com/timothyvasala/dev-tools-hub/main/static/devtools-logo.png" />
+        <meta property="og:url" content="https://devtools-hub.streamlit.app" />
+        <meta property="og:type" content="website" />
+        <meta name="twitter:card" content="summary_large_image" />
+        <meta name="twitter:title" content="DevTools Hub – Free Developer Utilities" />
+        <meta name="twitter:description" content="Professional developer tools: JWT decoder, JSON formatter, Base64 converter, and more." />
+        <meta name="twitter:image" content="https://raw.githubusercontent.com/timothyvasala/dev-tools-hub/main/static/devtools-logo.png" />
+        """,
+        unsafe_allow_html=True
+    )
+    # ────────────────────────────────────────────────────────────────────────────
+
+    # Initialize session state
+    if 'current_tool' not in st.session_state:
+        st.session_state.current_tool = 'home'
 
 def render_home_page():
     """Render the home page with clickable tool cards"""
@@ -96,18 +128,7 @@ def render_home_page():
     st.markdown("Select any tool below. All tools support bulk operations, file uploads, and instant downloads.")
 
     # Tools information
-    tools_info = [
-        ("🔑 JWT Decoder", "Decode JSON Web Tokens without verification", "jwt"),
-        ("📝 JSON Formatter", "Format, validate, and beautify JSON data", "json"),
-        ("⏰ Timestamp Converter", "Convert Unix timestamps to human dates", "timestamp"),
-        ("🆔 UUID Generator", "Generate unique identifiers in bulk", "uuid"),
-        ("🔤 Base64 Converter", "Encode/decode text and files to Base64", "base64"),
-        ("🔗 URL Encoder", "Encode special characters for URLs", "url"),
-        ("🔍 Regex Tester", "Test regular expressions with sample text", "regex"),
-        ("📄 Markdown Converter", "Convert Markdown to HTML instantly", "markdown"),
-        ("🎨 Color Palette", "Generate colors and check WCAG contrast", "color"),
-        ("🤖 Robots.txt Generator", "Create robots.txt for search engines", "robots")
-    ]
+    tools_info = [(title, desc, key) for key, (_, title, desc) in TOOL_REGISTRY.items()]
 
     # Filter tools based on search
     if search_term:
@@ -157,7 +178,60 @@ def render_home_page():
         • **Always Updated** - Regular improvements
         """)
 
+def render_cache_panel():
+    """Sidebar panel with per-tool result cache statistics (read-only unless ADMIN)."""
+    with st.sidebar.expander("🧠 Result Cache"):
+        stats = cache_stats()
+        store = store_stats()
+        if stats:
+            total = sum(s["bytes"] for s in stats)
+            st.caption(f"{total / 1024 / 1024:.1f} MB cached across {len(stats)} tools")
+            st.dataframe(stats, hide_index=True, use_container_width=True)
+        else:
+            st.caption("No cached results yet.")
+        if store is not None:
+            st.caption(
+                f"Shared store: {store['entries']:,} results, {store['bytes'] / 1024 / 1024:.1f} MB, "
+                f"hit rate {store['hit_rate']:.0%}"
+            )
+        # Clearing is process-wide, so it is an operator action
+        if ADMIN and st.button("Clear caches", key="clear_caches"):
+            clear_caches()
+            st.rerun()
+
+def render_metrics_panel():
+    """Sidebar panel with per-tool call counts, input bytes and latency."""
+    with st.sidebar.expander("📈 Tool Metrics"):
+        rows = snapshot()
+        if rows:
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+        else:
+            st.caption("No tool calls recorded yet.")
+
+def render_profiling_panel():
+    """Sidebar panel for opt-in tracemalloc profiling of tool calls (operators only, see ADMIN)."""
+    with st.sidebar.expander("🧪 Memory Profiling"):
+        enabled = st.checkbox("Profile tool calls (slow)", value=profiling.is_enabled(), key="profile_memory")
+        if enabled != profiling.is_enabled():
+            profiling.set_enabled(enabled)
+        records = profiling.recent_profiles()
+        if not records:
+            st.caption("No profiled calls yet.")
+            return
+        st.dataframe(
+            [{k: v for k, v in r.items() if k != "top_sites"} for r in records],
+            hide_index=True, use_container_width=True
+        )
+        latest = records[0]
+        st.caption(f"Top allocation sites for the latest call ({latest['tool']}.{latest['op']}):")
+        st.dataframe(latest["top_sites"], hide_index=True, use_container_width=True)
+        if st.button("Clear profiles", key="clear_profiles"):
+            profiling.clear_profiles()
+            st.rerun()
+
 def main():
+    configure_page()
+
     # 3. Use your styled headers
     st.markdown('<div class="main-header">DevTools Hub</div>', unsafe_allow_html=True)
     st.markdown('<div class="sub-header">Professional, free developer utilities</div>', unsafe_allow_html=True)
@@ -172,33 +246,24 @@ def main():
     st.markdown('<div class="tool-card">', unsafe_allow_html=True)
 
     # Route to current tool
-    if st.session_state.current_tool == 'home':
+    if st.session_state.current_tool in TOOL_REGISTRY:
+        load_tool(st.session_state.current_tool).render()
+    else:
         render_home_page()
-    elif st.session_state.current_tool == 'jwt':
-        jwt_decoder.render()
-    elif st.session_state.current_tool == 'json':
-        json_formatter.render()
-    elif st.session_state.current_tool == 'timestamp':
-        timestamp_converter.render()
-    elif st.session_state.current_tool == 'uuid':
-        uuid_generator.render()
-    elif st.session_state.current_tool == 'base64':
-        base64_converter.render()
-    elif st.session_state.current_tool == 'url':
-        url_encoder.render()
-    elif st.session_state.current_tool == 'regex':
-        regex_tester.render()
-    elif st.session_state.current_tool == 'markdown':
-        markdown_converter.render()
-    elif st.session_state.current_tool == 'color':
-        color_palette.render()
-    elif st.session_state.current_tool == 'robots':
-        robots_generator.render()
 
     st.markdown('</div>', unsafe_allow_html=True)
 
+    render_cache_panel()
+    render_metrics_panel()
+    if ADMIN:
+        render_profiling_panel()
+
     # Footer
     add_footer()
 
+# Spawned pool workers re-import this file as __mp_main__: keep process-wide setup out of them
 if __name__ == "__main__":
+    configure_logging()
+    if os.environ.get("DEVTOOLS_METRICS_PORT"):
+        start_metrics_server(int(os.environ["DEVTOOLS_METRICS_PORT"]))
     main()
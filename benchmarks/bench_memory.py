@@ -0,0 +1,126 @@
+"""
+Memory regression harness: tracemalloc peak per MB of input for each tool.
+
+Every case builds a synthetic input of roughly --size-mb, then measures the
+peak traced memory of one call (inputs are allocated before tracing starts,
+so only the tool's own working set counts). The ratio peak / input size is
+compared against benchmarks/memory_baseline.json; the script exits non-zero
+when any case exceeds its baseline by more than --tolerance.
+
+Usage:
+    python benchmarks/bench_memory.py [--size-mb 2] [--tolerance 0.15] [--cases json,url]
+    python benchmarks/bench_memory.py --update   # record a new baseline
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import (
+    base64_converter, json_formatter, markdown_converter, regex_tester,
+    robots_generator, url_encoder,
+)
+from utils.profiling import measure_peak
+
+BASELINE = Path(__file__).with_name("memory_baseline.json")
+WHOLE_MARKDOWN_MAX_BYTES = 64 * 1024  # markdown2 is quadratic on long documents
+
+def _json_doc(size):
+    row = {"id": 0, "name": "user", "tags": ["a", "b"], "active": True, "score": 1.5}
+    n = max(1, size // len(json.dumps(row)))
+    return json.dumps([{**row, "id": i} for i in range(n)])
+
+def _text(size):
+    line = "The quick brown fox <jumps> over the lazy dog & contact bob@example.com\n"
+    return line * max(1, size // len(line))
+
+def _markdown(size):
+    block = "## Heading\n\nSome *emphasis* and a [link](https://example.com).\n\n- one\n- two\n\n"
+    return block * max(1, size // len(block))
+
+def _urls(size):
+    line = "https://example.com/shop/item-00000?ref=abc"
+    return [f"https://example.com/{('shop', 'admin', 'blog')[i % 3]}/item-{i:05d}?ref=abc"
+            for i in range(max(1, size // len(line)))]
+
+# name -> (function, args tuple, input size in bytes)
+def build_cases(size):
+    text = _text(size)
+    doc = _json_doc(size)
+    md = _markdown(size)
+    md_small = _markdown(min(size, WHOLE_MARKDOWN_MAX_BYTES))
+    urls = _urls(size)
+    labeled = [f"{u}\t{'deny' if '/admin/' in u else 'allow'}" for u in urls]
+    matcher = robots_generator.RobotsMatcher(robots_generator.parse_robots(
+        "User-agent: *\nDisallow: /admin/\nAllow: /admin/public\nDisallow: /*?ref=\nAllow: /shop/\n"
+    )["*"])
+    b64 = base64_converter.encode_text(text)
+    return {
+        "json.format_json": (json_formatter.format_json, (doc, 2, False, False), len(doc)),
+        "json.minify_json": (json_formatter.minify_json, (doc,), len(doc)),
+        "base64.encode_text": (base64_converter.encode_text, (text,), len(text)),
+        "base64.decode_text": (base64_converter.decode_text, (b64,), len(b64)),
+        "url.encode_url": (url_encoder.encode_url, (text,), len(text)),
+        "url.bulk_process": (url_encoder.bulk_process, (urls, "Encode"), sum(map(len, urls))),
+        "regex.safe_findall": (regex_tester.safe_findall, (r"\b\w+@\w+\.com\b", text), len(text)),
+        "regex.stream_sub": (
+            lambda data: regex_tester.stream_sub(r"fox", "cat", io.BytesIO(data))[0].close(),
+            (text.encode(),), len(text)
+        ),
+        "markdown.convert_markdown_to_html": (markdown_converter.convert_markdown_to_html, (md_small,), len(md_small)),
+        "markdown.convert_markdown_incremental": (markdown_converter.convert_markdown_incremental, (md,), len(md)),
+        "robots.check_urls_to_csv": (
+            lambda m, u: robots_generator.check_urls_to_csv(m, u)[0].close(),
+            (matcher, urls), sum(map(len, urls))
+        ),
+        "robots.synthesize_robots": (robots_generator.synthesize_robots, (labeled,), sum(map(len, labeled))),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=2.0)
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed fractional increase over baseline")
+    parser.add_argument("--cases", default="", help="comma-separated name prefixes to run (default: all)")
+    parser.add_argument("--update", action="store_true", help="write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    size = int(args.size_mb * 1024 * 1024)
+    prefixes = [p for p in args.cases.split(",") if p]
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {"cases": {}}
+
+    results, regressions = {}, []
+    for name, (fn, fn_args, input_bytes) in build_cases(size).items():
+        if prefixes and not any(name.startswith(p) for p in prefixes):
+            continue
+        markdown_converter._block_cache.clear()  # measure a cold incremental render
+        _, peak, _ = measure_peak(fn, *fn_args)
+        ratio = round(peak / input_bytes, 3)
+        expected = baseline["cases"].get(name)
+        status = "new"
+        if expected is not None:
+            status = "ok" if ratio <= expected * (1 + args.tolerance) else "REGRESSION"
+            if status == "REGRESSION":
+                regressions.append(name)
+        results[name] = {"input_mb": round(input_bytes / 1024 ** 2, 2), "peak_mb": round(peak / 1024 ** 2, 2),
+                         "peak_per_input_mb": ratio, "baseline": expected, "status": status}
+
+    print(json.dumps({"python": platform.python_version(), "results": results}, indent=2))
+
+    if args.update:
+        baseline["python"] = platform.python_version()
+        baseline["size_mb"] = args.size_mb
+        baseline["cases"].update({name: r["peak_per_input_mb"] for name, r in results.items()})
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {BASELINE}", file=sys.stderr)
+        return 0
+    if regressions:
+        print(f"Peak memory regressed: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
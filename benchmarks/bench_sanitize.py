@@ -0,0 +1,137 @@
+"""
+Benchmark HTML sanitization paths on Markdown corpora of increasing size.
+
+Compares:
+- legacy:  bleach.clean(...) with list-based allowlists on every call
+- cleaner: one reusable Cleaner with frozenset allowlists
+- cached:  sanitize_html() with its content-hash cache warm
+
+Before timing, every XSS vector and corpus is checked to produce identical
+output on all paths; the script exits non-zero if any path disagrees.
+
+Usage:
+    python benchmarks/bench_sanitize.py [--sizes 10,100,1000] [--repeat 3]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bleach
+import markdown2
+from utils.sanitizer import (
+    ALLOWED_TAGS, ALLOWED_ATTRS, ALLOWED_PROTOCOLS,
+    sanitize_html, sanitize_html_uncached
+)
+
+XSS_VECTORS = [
+    "<script>alert(1)</script>",
+    "<img src=x onerror=alert(1)>",
+    "<a href=\"javascript:alert(1)\">x</a>",
+    "<a href=\"JaVaScRiPt:alert(1)\">x</a>",
+    "<a href=\"&#106;avascript:alert(1)\">x</a>",
+    "<svg onload=alert(1)>",
+    "<iframe src=\"data:text/html,<script>alert(1)</script>\"></iframe>",
+    "<p style=\"background:url(javascript:alert(1))\">x</p>",
+    "<scr<script>ipt>alert(1)</scr</script>ipt>",
+    "<<script>script>alert(1)<</script>/script>",
+    "<code class=\"x\" onclick=\"alert(1)\">c</code>",
+    "<img src=\"data:image/svg+xml;base64,PHN2Zz4=\" alt=\"a\">",
+    "<a href=\"http://ok\" target=\"_blank\" onmouseover=\"x()\">ok</a>",
+    "<!-- <script>alert(1)</script> -->",
+    "<math><mi xlink:href=\"javascript:alert(1)\">x</mi></math>",
+    "<table><tr><td><form><input autofocus onfocus=alert(1)></form></td></tr></table>",
+    "<div><p>unclosed <em>tags",
+    "&lt;script&gt;already escaped&lt;/script&gt;",
+]
+
+SAMPLE_BLOCK = """## Section {i}
+
+Some **bold** and *emphasis* text with a [link](https://example.com/{i}) and
+`inline code`. <span onclick="alert({i})">inline html</span>
+
+- item one
+- item two with <img src=x onerror=alert({i})>
+
+```
+code block {i}
+```
+
+> A quote <script>alert({i})</script>
+
+| a | b |
+|---|---|
+| 1 | 2 |
+"""
+
+
+def legacy_clean(html: str) -> str:
+    return bleach.clean(
+        html,
+        tags=list(ALLOWED_TAGS),
+        attributes={tag: list(attrs) for tag, attrs in ALLOWED_ATTRS.items()},
+        protocols=list(ALLOWED_PROTOCOLS),
+        strip=True
+    )
+
+
+def build_corpus(sections: int) -> list[str]:
+    """Render a synthetic document to a list of per-block HTML fragments."""
+    return [markdown2.markdown(SAMPLE_BLOCK.format(i=i)) for i in range(sections)]
+
+
+def check_equivalence(fragments) -> list[str]:
+    failures = []
+    for html in fragments:
+        expected = legacy_clean(html)
+        for name, fn in (("cleaner", sanitize_html_uncached), ("cached", sanitize_html)):
+            # Run twice so the cached path is checked both cold and warm
+            for _ in range(2):
+                if fn(html) != expected:
+                    failures.append(f"{name} differs for {html[:60]!r}")
+    return failures
+
+
+def time_path(fn, fragments, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in fragments:
+            fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,1000", help="comma-separated section counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = check_equivalence(XSS_VECTORS + build_corpus(20))
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        return 1
+
+    results = []
+    for sections in (int(s) for s in args.sizes.split(",")):
+        fragments = build_corpus(sections)
+        kb = sum(len(f) for f in fragments) / 1024
+        for html in fragments:  # warm the cache for the cached path
+            sanitize_html(html)
+        row = {"sections": sections, "html_kb": round(kb, 1)}
+        for name, fn in (("legacy", legacy_clean), ("cleaner", sanitize_html_uncached), ("cached", sanitize_html)):
+            seconds = time_path(fn, fragments, args.repeat)
+            row[f"{name}_ms"] = round(seconds * 1000, 2)
+            row[f"{name}_mb_s"] = round(kb / 1024 / seconds, 2) if seconds else None
+        results.append(row)
+
+    print(json.dumps({"xss_equivalent": True, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Benchmark cold-start import time and first-render latency.
+
+Each measurement runs in a fresh interpreter so module caches are cold.
+"eager" reproduces the old app.py behaviour (every tool imported up front);
+"lazy" is the current registry, which imports a tool only when opened.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--tools home,markdown,color]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TOOL_MODULES = [
+    "tools.jwt_decoder", "tools.json_formatter", "tools.timestamp_converter",
+    "tools.uuid_generator", "tools.base64_converter", "tools.url_encoder",
+    "tools.regex_tester", "tools.markdown_converter",
+    "tools.color_palette", "tools.robots_generator", "tools.pipeline_builder",
+    "tools.file_hasher",
+]
+CORE_MODULES = [
+    "core.jwt_decoder", "core.json_formatter", "core.timestamp_converter",
+    "core.uuid_generator", "core.base64_converter", "core.url_encoder",
+    "core.regex_tester", "core.markdown_converter",
+    "core.color_palette", "core.robots_generator", "core.pipeline",
+    "core.file_hasher",
+]
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{imports}
+print(time.perf_counter() - start)
+"""
+
+RENDER_SNIPPET = """
+import sys, time, logging
+sys.path.insert(0, {root!r})
+logging.disable(logging.WARNING)
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+{imports}
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.session_state["current_tool"] = {tool!r}
+at.run()
+assert not at.exception, at.exception
+print(time.perf_counter() - start)
+"""
+
+
+def _imports(modules) -> str:
+    return "\n".join(f"import {name}" for name in modules)
+
+
+def measure(snippet: str, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", snippet], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]) * 1000)
+    return {"median_ms": round(statistics.median(samples), 1), "min_ms": round(min(samples), 1)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tools", default="home,markdown,color", help="comma-separated tool keys to render")
+    args = parser.parse_args(argv)
+
+    root = str(ROOT)
+    report = {
+        "import": {
+            "eager_all_tools": measure(IMPORT_SNIPPET.format(
+                root=root, imports=_imports(["streamlit", "utils.common", *TOOL_MODULES])), args.repeat),
+            "lazy_home": measure(IMPORT_SNIPPET.format(
+                root=root, imports=_imports(["streamlit", "utils.common"])), args.repeat),
+            "core_only": measure(IMPORT_SNIPPET.format(
+                root=root, imports=_imports(CORE_MODULES)), args.repeat),
+        },
+        "first_render": {},
+    }
+    for tool in args.tools.split(","):
+        row = {}
+        for mode, preload in (("eager", TOOL_MODULES), ("lazy", [])):
+            row[mode] = measure(RENDER_SNIPPET.format(
+                root=root, imports=_imports(preload), app=str(ROOT / "app.py"), tool=tool), args.repeat)
+        report["first_render"][tool] = row
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
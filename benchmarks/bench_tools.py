@@ -0,0 +1,276 @@
+"""
+Reproducible benchmark suite for every tool's core function.
+
+Each case drives a pure function from core/ (or utils.sanitizer) on a
+synthetic corpus generated from a fixed seed, at several sizes: byte sizes
+for text transforms and item counts for per-record operations. For every
+case and size it reports throughput, latency percentiles and tracemalloc
+peak memory as JSON.
+
+Runs can be saved and compared: with --baseline, any case whose throughput
+drops or whose p95 latency grows by more than --tolerance is flagged and
+the script exits non-zero. Timings are machine-specific, so compare runs
+from the same host.
+
+Usage:
+    python benchmarks/bench_tools.py [--sizes 1KB,1MB] [--items 1,1000] [--cases json,url]
+    python benchmarks/bench_tools.py --full --save results.json     # 1 KB → 100 MB, 1 → 1M items
+    python benchmarks/bench_tools.py --baseline results.json        # compare against a saved run
+"""
+import argparse
+import base64
+import json
+import math
+import platform
+import random
+import re
+import sys
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import (
+    base64_converter, color_palette, json_formatter, jwt_decoder, markdown_converter,
+    regex_tester, robots_generator, timestamp_converter, url_encoder, uuid_generator,
+)
+from utils.profiling import measure_peak
+from utils.sanitizer import sanitize_html_uncached
+
+DEFAULT_SIZES = "1KB,100KB,1MB,10MB"
+DEFAULT_ITEMS = "1,1000,100000"
+FULL_SIZES = "1KB,100KB,1MB,10MB,100MB"
+FULL_ITEMS = "1,1000,100000,1000000"
+SEED = 1234
+MIN_SAMPLES = 5
+MIN_SECONDS = 0.5   # small inputs are repeated until this much time is sampled
+MAX_SAMPLES = 1000
+
+# ── Corpus generators ─────────────────────────────────────────────────────────
+WORDS = ("alpha", "beta", "gamma", "delta", "café", "naïve", "über", "straße", "hello", "world")
+
+def _text(size, rng):
+    out, total = [], 0
+    while total < size:
+        line = " ".join(rng.choice(WORDS) for _ in range(8))
+        if rng.random() < 0.2:
+            line += f" mail{rng.randrange(1000)}@example.com"
+        out.append(line)
+        total += len(line) + 1
+    return "\n".join(out)[:size]
+
+def _json_doc(size, rng):
+    """A JSON array of at most size bytes (UTF-8), so JSON_LIMIT-sized cases stay valid."""
+    rows, total = [], 2
+    while True:
+        row = json.dumps({"id": len(rows), "name": rng.choice(WORDS), "score": round(rng.random(), 4),
+                          "tags": rng.sample(WORDS, 3), "nested": {"active": rng.random() < 0.5}})
+        if rows and total + len(row) + 1 > size:
+            break
+        rows.append(row)
+        total += len(row) + 1
+    return "[" + ",".join(rows) + "]"
+
+def _markdown(size, rng):
+    blocks, total = [], 0
+    while total < size:
+        i = len(blocks)
+        block = (f"## Section {i}\n\n{_text(120, rng)} with *emphasis* and [a link](https://example.com/{i}).\n\n"
+                 f"- item {i}\n- `code {i}`\n\n<script>alert({i})</script>\n")
+        blocks.append(block)
+        total += len(block) + 1
+    return "\n".join(blocks)
+
+def _b64url(obj):
+    return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+
+def _jwts(n, rng):
+    header = _b64url({"alg": "HS256", "typ": "JWT"})
+    return [f"{header}.{_b64url({'sub': str(i), 'iat': 1700000000 + i, 'role': rng.choice(WORDS)})}.sig"
+            for i in range(n)]
+
+def _colors(n, rng):
+    return [(f"#{rng.randrange(1 << 24):06X}", f"#{rng.randrange(1 << 24):06X}") for _ in range(n)]
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Cases ─────────────────────────────────────────────────────────────────────
+class Case(NamedTuple):
+    name: str
+    unit: str                       # "bytes" (sizes) or "items" (counts)
+    build: Callable                 # (size, rng) -> payload
+    run: Callable                   # payload (or one element of it when each=True) -> result
+    each: bool = False              # time run() per element of a list payload
+    max_size: int | None = None     # larger sizes are skipped (input limits, superlinear libraries)
+
+def _clear_blocks(md):
+    markdown_converter._block_cache.clear()
+    return markdown_converter.convert_markdown_incremental(md)
+
+EMAIL_RE = r"\b[\w.]+@[\w.]+\.com\b"
+JSON_LIMIT = 10 * 1024 * 1024
+
+MINT_SPEC = jwt_decoder.mint_spec("HS256", {"iss": "bench", "sub": "user-{i}"}, seed=SEED)
+
+CASES = [
+    Case("json.format_json", "bytes", _json_doc,
+         lambda d: json_formatter.format_json(d, 2, False, False), max_size=JSON_LIMIT),
+    Case("json.minify_json", "bytes", _json_doc, json_formatter.minify_json, max_size=JSON_LIMIT),
+    Case("json.json_security_check", "bytes", _json_doc, json_formatter.json_security_check, max_size=JSON_LIMIT),
+    Case("base64.encode_text", "bytes", _text, base64_converter.encode_text),
+    Case("base64.decode_text", "bytes",
+         lambda size, rng: base64_converter.encode_text(_text(size * 3 // 4, rng)), base64_converter.decode_text),
+    Case("url.encode_url", "bytes", _text, url_encoder.encode_url),
+    Case("url.decode_url", "bytes",
+         lambda size, rng: urllib.parse.quote(_text(size // 3, rng), safe=""), url_encoder.decode_url),
+    Case("regex.safe_findall", "bytes", _text,
+         lambda t: regex_tester.safe_findall(EMAIL_RE, t, timeout=60)),
+    Case("markdown.convert_markdown_to_html+sanitize_html", "bytes", _markdown,
+         lambda md: sanitize_html_uncached(markdown_converter.convert_markdown_to_html(md)),
+         max_size=256 * 1024),  # markdown2 is quadratic on long documents
+    Case("markdown.convert_markdown_incremental", "bytes", _markdown, _clear_blocks),
+    Case("jwt.decode_jwt", "items", lambda n, rng: _jwts(n, rng), jwt_decoder.decode_jwt, each=True),
+    Case("jwt.mint_tokens[HS256]", "items", lambda n, rng: n,
+         lambda n: jwt_decoder.mint_tokens(MINT_SPEC, b"bench-secret", n).close()),
+    Case("timestamp.ts_to_date", "items",
+         lambda n, rng: [rng.uniform(0, 2e9) for _ in range(n)],
+         lambda ts: timestamp_converter.ts_to_date(ts, "ISO 8601", "UTC"), each=True),
+    Case("timestamp.date_to_ts", "items",
+         lambda n, rng: [f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00" for _ in range(n)],
+         lambda s: timestamp_converter.date_to_ts(s, "UTC"), each=True),
+    Case("uuid.generate_uuids", "items", lambda n, rng: n, uuid_generator.generate_uuids),
+    Case("url.bulk_process", "items",
+         lambda n, rng: [f"https://example.com/{rng.choice(WORDS)}?q={i}&x=a b" for i in range(n)],
+         lambda lines: url_encoder.bulk_process(lines, "Encode")),
+    Case("color.calculate_contrast_ratio", "items", _colors,
+         lambda pair: color_palette.calculate_contrast_ratio(*pair), each=True),
+    Case("robots.generate_robots", "items",
+         lambda n, rng: [f"/{rng.choice(WORDS)}/{i}/" for i in range(n)],
+         lambda paths: robots_generator.generate_robots(["*"], paths, [], "")),
+]
+# ──────────────────────────────────────────────────────────────────────────────
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*$", re.IGNORECASE)
+
+def parse_size(text: str) -> int:
+    """Byte size with binary suffix: '1KB' -> 1024, '100MB' -> 104857600."""
+    m = _SIZE_RE.match(text)
+    if not m:
+        raise argparse.ArgumentTypeError(f"Bad size: {text!r}")
+    return int(float(m.group(1)) * 1024 ** " KMG".index(m.group(2).upper() or " "))
+
+def parse_count(text: str) -> int:
+    """Item count with decimal suffix: '1K' -> 1000, '1M' -> 1000000."""
+    m = _SIZE_RE.match(text)
+    if not m:
+        raise argparse.ArgumentTypeError(f"Bad count: {text!r}")
+    return int(float(m.group(1)) * 1000 ** " KMG".index(m.group(2).upper() or " "))
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+    return {"p50_ms": round(pick(0.50) * 1000, 4), "p95_ms": round(pick(0.95) * 1000, 4),
+            "p99_ms": round(pick(0.99) * 1000, 4), "max_ms": round(ordered[-1] * 1000, 4)}
+
+def run_case(case: Case, size: int, memory: bool) -> dict:
+    payload = case.build(size, random.Random(SEED))
+    timer = time.perf_counter
+    samples = []
+    if case.each:
+        passes = max(1, min(MAX_SAMPLES // max(len(payload), 1), MAX_SAMPLES))
+        for _ in range(passes):
+            for item in payload:
+                start = timer()
+                case.run(item)
+                samples.append(timer() - start)
+        work = len(payload) * passes
+    else:
+        case.run(payload)  # warm-up (imports, regex compilation)
+        while len(samples) < MIN_SAMPLES or (sum(samples) < MIN_SECONDS and len(samples) < MAX_SAMPLES):
+            start = timer()
+            case.run(payload)
+            samples.append(timer() - start)
+        work = size * len(samples)
+    total = sum(samples)
+    result = {"samples": len(samples), "total_s": round(total, 4), **_percentiles(samples)}
+    if case.unit == "bytes":
+        result["mb_per_s"] = round(work / 1024 ** 2 / total, 3) if total else None
+    else:
+        result["items_per_s"] = round(work / total, 1) if total else None
+    if memory:
+        fn = (lambda items: [case.run(item) for item in items]) if case.each else case.run
+        _, peak, _ = measure_peak(fn, payload)
+        result["peak_mb"] = round(peak / 1024 ** 2, 3)
+    return result
+
+def _throughput(r):
+    return r.get("mb_per_s") or r.get("items_per_s")
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Flag cases slower than baseline by more than tolerance."""
+    flagged = []
+    for name, sizes in results.items():
+        for label, r in sizes.items():
+            base = baseline.get("results", {}).get(name, {}).get(label)
+            if not base or "skipped" in r or "skipped" in base:
+                continue
+            reasons = []
+            if _throughput(base) and _throughput(r) < _throughput(base) * (1 - tolerance):
+                reasons.append(f"throughput {_throughput(r)} < {_throughput(base)}")
+            if base["p95_ms"] and r["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                reasons.append(f"p95 {r['p95_ms']} ms > {base['p95_ms']} ms")
+            if reasons:
+                r["regression"] = reasons
+                flagged.append(f"{name} @ {label}: {'; '.join(reasons)}")
+    return flagged
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=None, help=f"byte sizes for text cases (default {DEFAULT_SIZES})")
+    parser.add_argument("--items", default=None, help=f"item counts for record cases (default {DEFAULT_ITEMS})")
+    parser.add_argument("--full", action="store_true", help=f"use {FULL_SIZES} and {FULL_ITEMS}")
+    parser.add_argument("--cases", default="", help="comma-separated name prefixes to run (default: all)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--save", type=Path, help="write results JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against a previously saved run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed fractional slowdown (default 0.2)")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in (args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)).split(",")]
+    counts = [parse_count(s) for s in (args.items or (FULL_ITEMS if args.full else DEFAULT_ITEMS)).split(",")]
+    prefixes = [p for p in args.cases.split(",") if p]
+
+    results = {}
+    for case in CASES:
+        if prefixes and not any(case.name.startswith(p) for p in prefixes):
+            continue
+        results[case.name] = {}
+        for size in (sizes if case.unit == "bytes" else counts):
+            label = f"{size}B" if case.unit == "bytes" else f"{size}items"
+            if case.max_size is not None and size > case.max_size:
+                results[case.name][label] = {"skipped": f"above max size {case.max_size}"}
+                continue
+            results[case.name][label] = run_case(case, size, memory=not args.no_memory)
+            print(f"{case.name} @ {label}: done", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": SEED,
+        "results": results,
+    }
+    flagged = []
+    if args.baseline:
+        flagged = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        report["regressions"] = flagged
+    print(json.dumps(report, indent=2))
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+    if flagged:
+        print("Regressions:\n  " + "\n  ".join(flagged), file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
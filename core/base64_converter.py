@@ -0,0 +1,50 @@
+import base64
+
+# ── File Type Security ─────────────────────────────────────────────────────────
+ALLOWED_FILE_EXTENSIONS = ['.txt', '.json', '.csv', '.md', '.py', '.js', '.html', '.css', '.xml', '.yaml', '.yml']
+MAX_FILE_SIZE_MB = 5
+
+def validate_file_for_encoding(filename: str, size_bytes: int):
+    """Basic file validation for Base64 encoding"""
+    import os
+
+    # Check file extension
+    _, ext = os.path.splitext(filename.lower())
+    if ext not in ALLOWED_FILE_EXTENSIONS:
+        raise ValueError(f"File type '{ext}' not allowed. Allowed: {', '.join(ALLOWED_FILE_EXTENSIONS)}")
+
+    # Check file size
+    size_mb = size_bytes / (1024 * 1024)
+    if size_mb > MAX_FILE_SIZE_MB:
+        raise ValueError(f"File too large: {size_mb:.1f}MB (max: {MAX_FILE_SIZE_MB}MB)")
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Base64 operations ──────────────────────────────────────────────────────────
+def encode_text(data: str) -> str:
+    return base64.b64encode(data.encode()).decode()
+
+def decode_text(data: str) -> str:
+    return base64.b64decode(data).decode()
+
+def encode_file_content(data: str) -> str:
+    return base64.b64encode(data.encode()).decode()
+
+def decode_file_content(data: str) -> str:
+    return base64.b64decode(data).decode()
+
+def iter_encode_chunks(chunks):
+    """
+    Base64-encode a stream of byte chunks of any size, yielding ASCII bytes.
+    Leftover bytes are carried so every piece but the last is unpadded and
+    the concatenation equals b64encode of the whole input.
+    """
+    carry = b""
+    for chunk in chunks:
+        data = carry + bytes(chunk) if carry else chunk
+        cut = len(data) - len(data) % 3
+        if cut:
+            yield base64.b64encode(data[:cut])
+        carry = bytes(data[cut:])
+    if carry:
+        yield base64.b64encode(carry)
+# ────────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,351 @@
+import random
+import re
+import io
+import csv
+import json
+import math
+import numpy as np
+from PIL import Image
+from utils.named_colors import CSS_NAMED_COLORS
+from typing import List
+
+# ── Color operations ───────────────────────────────────────────────────────────
+def generate_random_palette(count: int, seed: int = None) -> List[str]:
+    """Generate a list of random hex colors with optional seed for reproducibility"""
+    rng = random.Random(seed)  # private RNG; never reseeds the global module
+    return [f"#{rng.randint(0, 0xFFFFFF):06X}" for _ in range(count)]
+
+def _to_linear(v: float) -> float:
+    """sRGB gamma expansion of one channel in [0, 1] (WCAG 2.x)."""
+    return v/12.92 if v <= 0.03928 else ((v+0.055)/1.055)**2.4
+
+def calculate_contrast_ratio(color1: str, color2: str) -> float:
+    """Calculate WCAG contrast ratio between two hex colors"""
+    def luminance(hex_color):
+        r, g, b = (_to_linear(int(hex_color[i:i+2], 16)/255) for i in (1, 3, 5))
+        return 0.2126*r + 0.7152*g + 0.0722*b
+
+    l1, l2 = luminance(color1), luminance(color2)
+    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ── Palette audit (vectorized) ────────────────────────────────────────────────
+PALETTE_AUDIT_MAX_COLORS = 4000   # N×N float32 matrix is 64 MB; ~110 MB peak with masks and pair indices
+WCAG_LEVELS = {"AA Large": 3.0, "AA": 4.5, "AAA": 7.0}
+
+_HEX_RE = r'#(?:[0-9a-fA-F]{6}|[0-9a-fA-F]{3})(?![0-9a-fA-F])'
+_RGB_RE = r'rgba?\(\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*(?:,\s*[\d.]+%?\s*)?\)'
+_COLOR_RE = re.compile(f'{_HEX_RE}|{_RGB_RE}')
+_TOKEN_RE = re.compile(rf'(?:--|\$|@)?([\w-]+)\s*:\s*({_HEX_RE}|{_RGB_RE})')
+
+def normalize_hex(value: str) -> str:
+    """Normalize '#abc', '#aabbcc' or 'rgb(r, g, b)' to '#AABBCC'."""
+    m = re.fullmatch(_RGB_RE, value.strip())
+    if m:
+        return "#" + "".join(f"{min(int(c), 255):02X}" for c in m.groups())
+    value = value.strip().lstrip("#")
+    if len(value) == 3:
+        value = "".join(c * 2 for c in value)
+    return f"#{value.upper()}"
+
+def _walk_json_tokens(obj, path=""):
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from _walk_json_tokens(value, f"{path}.{key}" if path else str(key))
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            yield from _walk_json_tokens(value, f"{path}[{i}]")
+    elif isinstance(obj, str) and _COLOR_RE.fullmatch(obj.strip()):
+        yield path or obj, obj
+
+def extract_palette_tokens(text: str) -> list[tuple[str, str]]:
+    """
+    Extract (label, #RRGGBB) pairs from pasted colors or a CSS/SCSS/JSON token file.
+    JSON tokens are labeled by dotted path, CSS/SCSS variables by name and
+    bare colors by their own value. Duplicate colors keep their first label.
+    """
+    pairs = []
+    try:
+        pairs = list(_walk_json_tokens(json.loads(text)))
+    except ValueError:
+        pass
+    if not pairs:
+        named = {m.start(2): (m.group(1), m.group(2)) for m in _TOKEN_RE.finditer(text)}
+        for m in _COLOR_RE.finditer(text):
+            pairs.append(named.get(m.start(), (m.group(0), m.group(0))))
+
+    seen, tokens = set(), []
+    for label, value in pairs:
+        color = normalize_hex(value)
+        if color not in seen:
+            seen.add(color)
+            tokens.append((label, color))
+    return tokens
+
+def relative_luminance(colors: List[str]) -> np.ndarray:
+    """WCAG relative luminance for many '#RRGGBB' colors at once."""
+    rgb = np.frombuffer(bytes.fromhex("".join(c[1:7] for c in colors)), dtype=np.uint8)
+    srgb = rgb.reshape(-1, 3).astype(np.float64) / 255
+    linear = np.where(srgb <= 0.03928, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+def contrast_matrix(colors: List[str]) -> np.ndarray:
+    """Full N×N WCAG contrast ratio matrix (float32), built in place without float64 temporaries."""
+    lum = (relative_luminance(colors) + 0.05).astype(np.float32)
+    matrix = np.divide.outer(lum, lum)
+    np.reciprocal(matrix, out=matrix, where=matrix < 1)   # max/min of each pair
+    return matrix
+
+def audit_palette(colors: tuple[str, ...], min_ratio: float = WCAG_LEVELS["AA Large"]):
+    """
+    Find every color pair meeting min_ratio.
+    Contrast is symmetric, so each unordered pair appears once.
+    Returns (row indices, column indices, ratios) sorted by ratio descending,
+    and {WCAG level: number of pairs passing it} over all pairs.
+    """
+    if len(colors) > PALETTE_AUDIT_MAX_COLORS:
+        raise ValueError(f"Too many colors ({len(colors):,}). Max allowed is {PALETTE_AUDIT_MAX_COLORS:,}.")
+    matrix = contrast_matrix(list(colors))
+    rows, cols = np.nonzero(np.triu(matrix >= min_ratio, k=1))
+    ratios = matrix[rows, cols]
+    order = np.argsort(-ratios, kind="stable")
+    # Symmetric with a diagonal of 1.0 (below every level): each pair is counted twice
+    counts = {name: int(np.count_nonzero(matrix >= ratio)) // 2 for name, ratio in WCAG_LEVELS.items()}
+    return rows[order], cols[order], ratios[order], counts
+
+def wcag_level(ratio: float) -> str:
+    """Highest WCAG level a contrast ratio passes for normal text."""
+    if ratio >= WCAG_LEVELS["AAA"]:
+        return "AAA"
+    if ratio >= WCAG_LEVELS["AA"]:
+        return "AA"
+    if ratio >= WCAG_LEVELS["AA Large"]:
+        return "AA Large"
+    return "Fail"
+
+def audit_report_csv(tokens: list[tuple[str, str]], rows, cols, ratios) -> str:
+    """Render audit results as CSV (one row per compliant pair)."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["color_a", "hex_a", "color_b", "hex_b", "ratio", "level"])
+    for i, j, ratio in zip(rows.tolist(), cols.tolist(), ratios.tolist()):
+        writer.writerow([*tokens[i], *tokens[j], f"{ratio:.2f}", wcag_level(ratio)])
+    return out.getvalue()
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Image palette extraction ──────────────────────────────────────────────────
+IMAGE_PIXEL_BUDGET = 256 * 256    # pixels clustered per image, regardless of input size
+KMEANS_MAX_ITER = 25
+
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+
+def srgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Convert an (N, 3) array of 0-255 sRGB values to CIELAB (D65)."""
+    srgb = np.asarray(rgb, dtype=np.float64) / 255
+    linear = np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+    xyz = (linear @ _RGB_TO_XYZ.T) / _D65_WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+def lab_to_hex(lab: np.ndarray) -> List[str]:
+    """Convert an (N, 3) CIELAB array back to '#RRGGBB' strings (clipped to sRGB gamut)."""
+    lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+    fy = (lab[:, 0] + 16) / 116
+    f = np.stack([fy + lab[:, 1] / 500, fy, fy - lab[:, 2] / 200], axis=1)
+    xyz = np.where(f > 6 / 29, f ** 3, 3 * (6 / 29) ** 2 * (f - 4 / 29)) * _D65_WHITE
+    linear = np.clip(xyz @ _XYZ_TO_RGB.T, 0, 1)
+    srgb = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in np.rint(srgb * 255).astype(int).tolist()]
+
+def load_image_pixels(image_bytes: bytes, budget: int = IMAGE_PIXEL_BUDGET) -> np.ndarray:
+    """
+    Decode an image to at most ~budget RGB pixels as an (N, 3) uint8 array.
+    JPEGs are decoded at reduced scale via draft(); other formats are
+    shrunk with reduce(). Mostly transparent pixels are dropped.
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        side = max(1, int(math.sqrt(budget)))
+        img.draft("RGB", (side, side))
+        factor = math.ceil(math.sqrt(img.width * img.height / budget))
+        if factor > 1:
+            img = img.reduce(factor)
+        rgba = np.asarray(img.convert("RGBA")).reshape(-1, 4)
+    opaque = rgba[rgba[:, 3] >= 128, :3]
+    return opaque if len(opaque) else rgba[:, :3]
+
+def kmeans(points: np.ndarray, k: int, rng: np.random.Generator, max_iter: int = KMEANS_MAX_ITER):
+    """
+    Vectorized k-means with k-means++ seeding.
+    Returns (centers, labels). k is reduced if there are fewer distinct points.
+    """
+    k = min(k, len(np.unique(points, axis=0)))
+    centers = [points[rng.integers(len(points))]]
+    dist = ((points - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        centers.append(points[rng.choice(len(points), p=dist / dist.sum())])
+        dist = np.minimum(dist, ((points - centers[-1]) ** 2).sum(axis=1))
+    centers = np.array(centers)
+
+    for _ in range(max_iter):
+        d = (points ** 2).sum(1)[:, None] - 2 * points @ centers.T + (centers ** 2).sum(1)[None, :]
+        labels = d.argmin(axis=1)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, points)
+        counts = np.bincount(labels, minlength=k)[:, None]
+        updated = np.where(counts > 0, sums / np.maximum(counts, 1), centers)
+        if np.allclose(updated, centers, atol=0.5):
+            centers = updated
+            break
+        centers = updated
+    return centers, labels
+
+def extract_image_palette(image_bytes: bytes, count: int) -> list[tuple[str, float]]:
+    """
+    Extract the count dominant colors of an image by clustering in CIELAB.
+    Returns (hex, share of pixels) tuples, most dominant first.
+    """
+    pixels = load_image_pixels(image_bytes)
+    lab = srgb_to_lab(pixels)
+    centers, labels = kmeans(lab, count, np.random.default_rng(0))
+    shares = np.bincount(labels, minlength=len(centers)) / len(labels)
+    order = np.argsort(-shares)
+    return list(zip(lab_to_hex(centers[order]), shares[order].round(4).tolist()))
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Perceptual palettes & color names ─────────────────────────────────────────
+PERCEPTUAL_BATCH = 512          # candidate colors drawn per sampling round
+PERCEPTUAL_MAX_CANDIDATES = 200_000
+
+def delta_e_2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """Vectorized CIEDE2000 color difference between broadcastable (..., 3) Lab arrays."""
+    L1, a1, b1 = np.moveaxis(np.asarray(lab1, dtype=np.float64), -1, 0)
+    L2, a2, b2 = np.moveaxis(np.asarray(lab2, dtype=np.float64), -1, 0)
+    c_bar = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - np.sqrt(c_bar ** 7 / (c_bar ** 7 + 25.0 ** 7)))
+    a1p, a2p = a1 * (1 + g), a2 * (1 + g)
+    c1p, c2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    dLp, dCp = L2 - L1, c2p - c1p
+    dh = h2p - h1p
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(c1p * c2p == 0, 0, dh)
+    dHp = 2 * np.sqrt(c1p * c2p) * np.sin(np.radians(dh / 2))
+
+    Lp_bar, Cp_bar = (L1 + L2) / 2, (c1p + c2p) / 2
+    h_sum = h1p + h2p
+    hp_bar = np.where(np.abs(h1p - h2p) > 180,
+                      np.where(h_sum < 360, h_sum + 360, h_sum - 360), h_sum) / 2
+    hp_bar = np.where(c1p * c2p == 0, h_sum, hp_bar)
+    t = (1 - 0.17 * np.cos(np.radians(hp_bar - 30)) + 0.24 * np.cos(np.radians(2 * hp_bar))
+         + 0.32 * np.cos(np.radians(3 * hp_bar + 6)) - 0.20 * np.cos(np.radians(4 * hp_bar - 63)))
+    sl = 1 + 0.015 * (Lp_bar - 50) ** 2 / np.sqrt(20 + (Lp_bar - 50) ** 2)
+    sc = 1 + 0.045 * Cp_bar
+    sh = 1 + 0.015 * Cp_bar * t
+    rt = (-2 * np.sqrt(Cp_bar ** 7 / (Cp_bar ** 7 + 25.0 ** 7))
+          * np.sin(np.radians(60 * np.exp(-(((hp_bar - 275) / 25) ** 2)))))
+    return np.sqrt((dLp / sl) ** 2 + (dCp / sc) ** 2 + (dHp / sh) ** 2
+                   + rt * (dCp / sc) * (dHp / sh))
+
+def generate_perceptual_palette(count: int, min_delta_e: float = 20.0, seed: int = None,
+                                background: str = None, min_contrast: float = None) -> List[str]:
+    """
+    Generate count colors that are pairwise at least min_delta_e apart (CIEDE2000).
+    If background and min_contrast are given, every color also meets that
+    WCAG contrast ratio against the background. Uses a private RNG, so
+    seeding never touches global random state. Raises ValueError when the
+    constraints cannot be met.
+    """
+    rng = np.random.default_rng(seed)
+    chosen_hex, chosen_lab = [], np.empty((0, 3))
+    bg_lum = relative_luminance([normalize_hex(background)])[0] + 0.05 if background else None
+
+    drawn = 0
+    while len(chosen_hex) < count and drawn < PERCEPTUAL_MAX_CANDIDATES:
+        rgb = rng.integers(0, 256, size=(PERCEPTUAL_BATCH, 3), dtype=np.uint8)
+        drawn += PERCEPTUAL_BATCH
+        hexes = [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in rgb.tolist()]
+        if bg_lum is not None and min_contrast:
+            lum = relative_luminance(hexes) + 0.05
+            ok = np.maximum(lum, bg_lum) / np.minimum(lum, bg_lum) >= min_contrast
+            rgb, hexes = rgb[ok], [h for h, keep in zip(hexes, ok) if keep]
+        labs = srgb_to_lab(rgb)
+        if len(chosen_lab) and len(labs):
+            # Drop candidates already too close to the palette in one vectorized pass
+            far = delta_e_2000(chosen_lab[:, None, :], labs[None, :, :]).min(axis=0) >= min_delta_e
+            labs, hexes = labs[far], [h for h, keep in zip(hexes, far) if keep]
+        for color, lab in zip(hexes, labs):
+            if len(chosen_lab) and delta_e_2000(chosen_lab, lab).min() < min_delta_e:
+                continue
+            chosen_hex.append(color)
+            chosen_lab = np.vstack([chosen_lab, lab])
+            if len(chosen_hex) == count:
+                break
+
+    if len(chosen_hex) < count:
+        raise ValueError(
+            f"Only found {len(chosen_hex)} of {count} colors meeting the constraints. "
+            "Lower the minimum ΔE or contrast."
+        )
+    return chosen_hex
+
+class ColorNameIndex:
+    """
+    KD-tree over colors in CIELAB for O(log n) nearest-name lookup.
+    Distance is Euclidean in Lab (ΔE*76), which is what a KD-tree can prune on.
+    """
+
+    def __init__(self, named_colors: dict[str, str]):
+        self.names = list(named_colors)
+        self.hexes = [normalize_hex(named_colors[n]) for n in self.names]
+        self.points = srgb_to_lab(
+            np.frombuffer(bytes.fromhex("".join(h[1:] for h in self.hexes)), dtype=np.uint8).reshape(-1, 3)
+        )
+        self._tree = self._build(list(range(len(self.names))), 0)
+
+    def _build(self, indices, depth):
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i, axis])
+        mid = len(indices) // 2
+        return (indices[mid], axis,
+                self._build(indices[:mid], depth + 1),
+                self._build(indices[mid + 1:], depth + 1))
+
+    def nearest(self, color: str) -> tuple[str, str, float]:
+        """Return (name, hex, ΔE*76 distance) of the closest named color."""
+        target = srgb_to_lab(np.frombuffer(bytes.fromhex(normalize_hex(color)[1:]), dtype=np.uint8)[None, :])[0]
+        best, best_d2 = None, float("inf")
+        stack = [self._tree]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            idx, axis, left, right = node
+            d2 = float(((self.points[idx] - target) ** 2).sum())
+            if d2 < best_d2:
+                best, best_d2 = idx, d2
+            diff = target[axis] - self.points[idx, axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            if diff * diff < best_d2:
+                stack.append(far)
+            stack.append(near)
+        return self.names[best], self.hexes[best], math.sqrt(best_d2)
+
+_name_index = None
+
+def nearest_color_name(color: str) -> tuple[str, str, float]:
+    """Nearest CSS named color for a hex color, via a lazily built KD-tree."""
+    global _name_index
+    if _name_index is None:
+        _name_index = ColorNameIndex(CSS_NAMED_COLORS)
+    return _name_index.nearest(color)
+# ──────────────────────────────────────────────────────────────────────────────
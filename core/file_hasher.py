@@ -0,0 +1,199 @@
+import functools
+import hashlib
+import os
+import re
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+# ── Hashing ───────────────────────────────────────────────────────────────────
+# Display name -> hashlib name
+ALGORITHMS = {
+    "MD5": "md5",
+    "SHA-1": "sha1",
+    "SHA-256": "sha256",
+    "SHA-512": "sha512",
+    "BLAKE2b": "blake2b",
+    "BLAKE2s": "blake2s",
+}
+HASH_CHUNK_SIZE = 1024 * 1024          # bytes read per pass over all algorithms
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+ARCHIVE_MAX_FILES = 100_000
+ARCHIVE_MAX_TOTAL_MB = 20 * 1024       # uncompressed; hashing is streamed, this bounds CPU time
+
+def iter_stream_chunks(stream, chunk_size: int = HASH_CHUNK_SIZE):
+    """Yield memoryviews of one reused buffer (valid until the next one), so memory stays flat."""
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    while n := stream.readinto(buf):
+        yield view[:n]
+
+def iter_file_chunks(path: str, chunk_size: int = HASH_CHUNK_SIZE):
+    with open(path, "rb", buffering=0) as f:
+        yield from iter_stream_chunks(f, chunk_size)
+
+def hash_chunks(chunks, algorithms) -> tuple[int, dict[str, str]]:
+    """
+    Feed every chunk to all algorithms in a single pass.
+    Returns (byte count, {algorithm: hex digest}).
+    """
+    hashers = [(name, hashlib.new(ALGORITHMS[name])) for name in algorithms]
+    size = 0
+    for chunk in chunks:
+        for _, h in hashers:
+            h.update(chunk)  # hashlib releases the GIL for large buffers
+        size += len(chunk)
+    return size, {name: h.hexdigest() for name, h in hashers}
+
+def _hash_source(source, algorithms) -> dict:
+    name, open_chunks = source
+    row = {"file": name, "size": 0, "error": ""}
+    try:
+        row["size"], digests = hash_chunks(open_chunks(), algorithms)
+        row.update(digests)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+def hash_files(sources, algorithms, workers: int = HASH_WORKERS) -> list[dict]:
+    """
+    Hash many files on a thread pool. sources are (name, open_chunks) pairs,
+    where open_chunks() returns an iterable of byte chunks. Returns one row
+    per file, in order: {"file", "size", <algorithm>: hex..., "error"}.
+    """
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        return list(pool.map(functools.partial(_hash_source, algorithms=algorithms), sources))
+
+def _zip_member_chunks(archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+    with archive.open(info) as member:
+        yield from iter_stream_chunks(member)
+
+def hash_archive(fileobj, algorithms, workers: int = HASH_WORKERS) -> list[dict]:
+    """
+    Hash every file in a zip or tar archive (seekable binary file object).
+    Zip members are read in parallel; a tar is one stream, hashed in order.
+    Raises ValueError for unsupported archives or when limits are exceeded.
+    """
+    count, total = 0, 0
+
+    def check_limits(size):
+        nonlocal count, total
+        count += 1
+        total += size
+        if count > ARCHIVE_MAX_FILES:
+            raise ValueError(f"Archive has too many files (max {ARCHIVE_MAX_FILES:,})")
+        if total > ARCHIVE_MAX_TOTAL_MB * 1024 * 1024:
+            raise ValueError(f"Archive expands beyond {ARCHIVE_MAX_TOTAL_MB:,} MB")
+
+    if zipfile.is_zipfile(fileobj):
+        with zipfile.ZipFile(fileobj) as archive:
+            sources = []
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                check_limits(info.file_size)
+                sources.append((info.filename, functools.partial(_zip_member_chunks, archive, info)))
+            return hash_files(sources, algorithms, workers)
+
+    fileobj.seek(0)
+    rows = []
+    try:
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for info in archive:
+                if not info.isfile():
+                    continue
+                check_limits(info.size)
+                member = archive.extractfile(info)
+                rows.append(_hash_source((info.name, lambda: iter_stream_chunks(member)), algorithms))
+    except tarfile.TarError:
+        raise ValueError("Unsupported archive. Upload a .zip, .tar or .tgz file.")
+    return rows
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Checksum manifests ────────────────────────────────────────────────────────
+# GNU coreutils: "<hex>  name" (text) or "<hex> *name" (binary)
+_GNU_LINE_RE = re.compile(r"^(?P<hex>[0-9a-fA-F]+) [ *](?P<name>.+)$")
+# BSD / `--tag`: "SHA256 (name) = <hex>"
+_BSD_LINE_RE = re.compile(r"^(?P<alg>[A-Za-z0-9-]+) ?\((?P<name>.+)\) ?= ?(?P<hex>[0-9a-fA-F]+)$")
+# Untagged lines only give the digest length, which several algorithms can share
+HEX_LENGTH_ALGORITHMS = {
+    32: ("MD5",), 40: ("SHA-1",), 64: ("SHA-256", "BLAKE2s"), 128: ("SHA-512", "BLAKE2b"),
+}
+BSD_TAG_ALGORITHMS = {
+    "MD5": "MD5", "SHA1": "SHA-1", "SHA256": "SHA-256", "SHA512": "SHA-512",
+    "BLAKE2B": "BLAKE2b", "BLAKE2B512": "BLAKE2b", "BLAKE2S": "BLAKE2s", "BLAKE2S256": "BLAKE2s",
+}
+
+def _manifest_name(name: str) -> str:
+    name = name.strip().replace("\\", "/")
+    return name[2:] if name.startswith("./") else name
+
+def parse_manifest(text: str) -> list[tuple[str, tuple[str, ...], str]]:
+    """
+    Parse sha256sum/md5sum/b2sum-style (or BSD --tag) checksum lines into
+    (file name, candidate algorithms, lowercase hex). Tagged lines name one
+    algorithm; untagged ones list every algorithm with that digest length
+    (e.g. SHA-512 and BLAKE2b). Blank and # lines are skipped.
+    """
+    entries = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if m := _BSD_LINE_RE.match(line):
+            algorithm = BSD_TAG_ALGORITHMS.get(m["alg"].upper().replace("-", ""))
+            if algorithm is None:
+                raise ValueError(f"Line {lineno}: unsupported algorithm '{m['alg']}'")
+            algorithms = (algorithm,)
+        elif m := _GNU_LINE_RE.match(line):
+            algorithms = HEX_LENGTH_ALGORITHMS.get(len(m["hex"]))
+            if algorithms is None:
+                raise ValueError(f"Line {lineno}: no algorithm has {len(m['hex'])}-character digests")
+        else:
+            raise ValueError(f"Line {lineno}: not a checksum line")
+        entries.append((_manifest_name(m["name"]), algorithms, m["hex"].lower()))
+    return entries
+
+def verify_manifest(entries, rows: list[dict]) -> list[dict]:
+    """
+    Compare manifest entries with hashed rows, matching by path and falling
+    back to the base name. An entry with several candidate algorithms is OK
+    if any of them matches, and reports the one that did. Status is OK,
+    FAILED, MISSING (listed but not hashed), ERROR (could not be read) or
+    NOT LISTED (hashed but not listed).
+    """
+    by_name = {_manifest_name(row["file"]): row for row in rows}
+    by_base = {}
+    for name, row in by_name.items():
+        by_base.setdefault(name.rsplit("/", 1)[-1], []).append(row)
+
+    results, matched = [], set()
+    for name, algorithms, expected in entries:
+        algorithm = " or ".join(algorithms)
+        row = by_name.get(name)
+        if row is None and len(candidates := by_base.get(name.rsplit("/", 1)[-1], [])) == 1:
+            row = candidates[0]
+        if row is None:
+            status, actual = "MISSING", ""
+        else:
+            matched.add(id(row))
+            actual = ""
+            status = "ERROR" if row["error"] else "FAILED"
+            if not row["error"]:
+                actual = " / ".join(row.get(a, "") for a in algorithms)
+                for candidate in algorithms:
+                    if row.get(candidate) == expected:
+                        algorithm, actual, status = candidate, expected, "OK"
+                        break
+        results.append({"file": name, "algorithm": algorithm, "expected": expected,
+                        "actual": actual, "status": status})
+    for row in rows:
+        if id(row) not in matched:
+            results.append({"file": row["file"], "algorithm": "", "expected": "",
+                            "actual": "", "status": "NOT LISTED"})
+    return results
+
+def format_manifest(rows: list[dict], algorithm: str) -> str:
+    """A sha256sum-style manifest of the rows that hashed successfully."""
+    return "".join(f"{row[algorithm]}  {row['file']}\n" for row in rows if not row["error"])
+# ──────────────────────────────────────────────────────────────────────────────
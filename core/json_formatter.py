@@ -0,0 +1,226 @@
+import csv
+import itertools
+import json
+import re
+import tempfile
+
+# ── Security wrapper for JSON operations ─────────────────────────────────────
+UTF8_CHUNK_CHARS = 1 << 20
+
+def utf8_length(data: str) -> int:
+    """UTF-8 encoded size of data without materializing the whole encoding."""
+    if data.isascii():
+        return len(data)
+    return sum(
+        len(data[i:i + UTF8_CHUNK_CHARS].encode('utf-8'))
+        for i in range(0, len(data), UTF8_CHUNK_CHARS)
+    )
+
+def parse_checked_json(data: str, max_size_mb=10, max_depth=50):
+    """Enforce size and nesting limits and return the parsed document."""
+    size_mb = utf8_length(data) / (1024 * 1024)
+    if size_mb > max_size_mb:
+        raise ValueError(f"JSON too large: {size_mb:.1f}MB (max: {max_size_mb}MB)")
+
+    try:
+        parsed_data = json.loads(data)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {str(e)}")
+
+    def check_depth(obj, current_depth=0):
+        if current_depth > max_depth:
+            raise ValueError(f"JSON too deeply nested: {current_depth} levels (max: {max_depth})")
+        if isinstance(obj, dict):
+            for value in obj.values():
+                check_depth(value, current_depth + 1)
+        elif isinstance(obj, list):
+            for item in obj:
+                check_depth(item, current_depth + 1)
+
+    check_depth(parsed_data)
+    return parsed_data
+
+def json_security_check(data: str, max_size_mb=10, max_depth=50):
+    parse_checked_json(data, max_size_mb, max_depth)
+    return True
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ── JSON operations ─────────────────────────────────────────────────────────────
+def format_json(data: str, indent: int, sort_keys: bool, ensure_ascii: bool) -> str:
+    parsed = parse_checked_json(data)
+    return json.dumps(parsed, indent=indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii)
+
+def minify_json(data: str) -> str:
+    parsed = parse_checked_json(data)
+    return json.dumps(parsed, separators=(',', ':'))
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ── Flattening (JSON array / NDJSON → CSV) ────────────────────────────────────
+FLATTEN_SAMPLE_RECORDS = 1000          # records read to infer the column set
+FLATTEN_BATCH_RECORDS = 1000           # rows handed to csv.writerows at a time
+FLATTEN_PREVIEW_RECORDS = 20
+FLATTEN_MAX_RECORD_CHARS = 64 * 1024 * 1024
+FLATTEN_SPOOL_MAX_MEMORY = 5 * 1024 * 1024
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_TRUNCATION_MARGIN = 16   # a token cut off by a chunk boundary (\uXXXX, false, 1e+) fails this close to the end
+NDJSON_PROBE_CHARS = 1 << 20  # how far a leading '[' is decoded to tell NDJSON of arrays from one array
+
+def iter_json_records(chunks):
+    """
+    Decode records one at a time from text chunks holding a top-level JSON
+    array or NDJSON (any whitespace-separated JSON values, arrays included).
+    Only the record being decoded is buffered, never the whole document.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buf, pos = "", 0
+    in_array = None          # decided by the first non-whitespace character
+    expect_value = closed = False
+    count = 0
+
+    def more(target: int = 1) -> bool:
+        """Append chunks until target characters are pending; False if the input had none left."""
+        nonlocal buf, pos
+        pending = [buf[pos:]]
+        size = len(pending[0])
+        for chunk in chunks:
+            pending.append(chunk)
+            size += len(chunk)
+            if size >= target:
+                break
+        if len(pending) == 1:
+            return False
+        buf, pos = "".join(pending), 0
+        return True
+
+    def starts_value_stream() -> bool:
+        """Whether the leading '[' value is followed by another value, making the input NDJSON."""
+        while True:
+            try:
+                _, end = decoder.raw_decode(buf, pos)
+            except (json.JSONDecodeError, RecursionError):
+                # Cut off (or invalid): decode further, up to the probe limit
+                if len(buf) - pos < NDJSON_PROBE_CHARS and more(2 * (len(buf) - pos)):
+                    continue
+                return False
+            after = _WHITESPACE.match(buf, end).end()
+            if after == len(buf) and more(len(buf) - pos + 1):
+                continue
+            return after < len(buf) and buf[after] not in ",]"
+
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos == len(buf):
+            if more():
+                continue
+            break
+        if closed:
+            raise ValueError("Unexpected data after the closing ']'")
+        if in_array is None:
+            in_array = buf[pos] == "[" and not starts_value_stream()
+            if in_array:
+                pos += 1
+                expect_value = True
+                continue
+        if in_array:
+            char = buf[pos]
+            if char == "]" and (not expect_value or count == 0):
+                pos += 1
+                closed = True
+                continue
+            if char == "," and not expect_value:
+                pos += 1
+                expect_value = True
+                continue
+            if not expect_value:
+                raise ValueError(f"Expected ',' or ']' after record {count:,}")
+
+        pending = len(buf) - pos
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as e:
+            # Only an error at the buffer's end (or an open string) can mean the
+            # record was cut off: read at least as much again and retry
+            truncated = e.pos >= len(buf) - _TRUNCATION_MARGIN or e.msg.startswith("Unterminated string")
+            if truncated and pending >= FLATTEN_MAX_RECORD_CHARS:
+                raise ValueError(f"Record {count + 1:,} is larger than {FLATTEN_MAX_RECORD_CHARS // 1024 // 1024} MB")
+            if truncated and more(2 * pending):
+                continue
+            raise ValueError(f"Invalid JSON in record {count + 1:,}: {e.msg} (character {e.pos - pos + 1} of the record)")
+        except RecursionError:
+            raise ValueError(f"Record {count + 1:,} is too deeply nested")
+        # A top-level number can stop short of a chunk boundary that cut it ("3." + "14")
+        number = type(value) in (int, float)
+        if (end == len(buf) or number and len(buf) - end < _TRUNCATION_MARGIN) and more(pending + 1):
+            continue
+        pos = end
+        expect_value = False
+        count += 1
+        yield value
+
+    if in_array and not closed:
+        raise ValueError("Unterminated JSON array (missing ']')")
+
+_compact_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+def flatten_record(record, sep: str = ".") -> dict:
+    """
+    Nested objects become dotted-path keys. Leaves are left for csv to write
+    (None as an empty cell), except booleans, lists and empty objects, which
+    become JSON text.
+    """
+    if not isinstance(record, dict):
+        record = {"value": record}
+    flat = {}
+
+    def walk(obj, prefix):
+        for key, value in obj.items():
+            path = prefix + key if prefix else key
+            kind = type(value)
+            if kind is dict and value:
+                walk(value, path + sep)
+            elif kind is bool:
+                flat[path] = "true" if value else "false"
+            elif kind is list or kind is dict:
+                flat[path] = _compact_json(value) if value else ("[]" if kind is list else "{}")
+            else:
+                flat[path] = value
+
+    walk(record, "")
+    return flat
+
+def flatten_to_csv(chunks, delimiter: str = ",", sample_size: int = FLATTEN_SAMPLE_RECORDS):
+    """
+    Stream records (see iter_json_records) into a spooled CSV/TSV file.
+    Columns are the union of dotted paths in the first sample_size records;
+    paths that only appear later are counted and reported, not added.
+    Returns (file rewound to 0, columns, record count, {late path: count}, preview rows).
+    """
+    records = iter_json_records(chunks)
+    sample = [flatten_record(r) for r in itertools.islice(records, max(1, sample_size))]
+    if not sample:
+        raise ValueError("No JSON records found.")
+    columns = list(dict.fromkeys(path for row in sample for path in row))
+    known = set(columns)
+    unknown: dict[str, int] = {}
+    preview = sample[:FLATTEN_PREVIEW_RECORDS]
+
+    out = tempfile.SpooledTemporaryFile(max_size=FLATTEN_SPOOL_MAX_MEMORY, mode="w+", newline="", encoding="utf-8")
+    writer = csv.writer(out, delimiter=delimiter)
+    writer.writerow(columns)
+    count = 0
+    batch = []
+    for flat in itertools.chain(sample, map(flatten_record, records)):
+        if not known.issuperset(flat):
+            for path in flat.keys() - known:
+                unknown[path] = unknown.get(path, 0) + 1
+        batch.append(list(map(flat.get, columns)))
+        if len(batch) >= FLATTEN_BATCH_RECORDS:
+            writer.writerows(batch)
+            count += len(batch)
+            batch.clear()
+    writer.writerows(batch)
+    count += len(batch)
+    out.seek(0)
+    return out, columns, count, unknown, preview
+# ────────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,214 @@
+import json
+import base64
+import hashlib
+import hmac
+import random
+import tempfile
+import time
+import uuid
+from collections import deque
+
+# ── Input Limits for JWT Tokens ───────────────────────────────────────────────
+MAX_TOKEN_LENGTH = 5000       # maximum characters per token
+MAX_TOKENS_BULK = 50          # maximum tokens in bulk mode
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── JWT decoding ───────────────────────────────────────────────────────────────
+def decode_jwt(token: str) -> tuple[dict, dict]:
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise ValueError("Invalid JWT format (must have 3 segments).")
+
+    def fix_padding(segment: str) -> str:
+        return segment + "=" * (-len(segment) % 4)
+
+    header_b64, payload_b64, _ = parts
+    header = json.loads(base64.urlsafe_b64decode(fix_padding(header_b64)))
+    payload = json.loads(base64.urlsafe_b64decode(fix_padding(payload_b64)))
+    return header, payload
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ── JWT minting (load-test fixtures) ───────────────────────────────────────────
+MINT_ALGORITHMS = ["HS256", "RS256", "ES256", "EdDSA"]
+MINT_BATCH_SIZE = 5000          # tokens signed per worker task (the key is parsed once per task)
+MINT_INLINE_MAX = 5000          # smaller runs are signed inline, skipping the pool round trip
+MINT_MAX_PENDING = 16           # batches submitted ahead of the writer, bounding memory
+MINT_MAX_TOKENS = 5_000_000
+MINT_SPOOL_MAX_MEMORY = 5 * 1024 * 1024
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def load_signer(algorithm: str, key: bytes):
+    """
+    Parse a signing key and return sign(message) -> signature.
+    HS256 takes the shared secret; the others a PEM private key (RSA, P-256, Ed25519).
+    Deliberately uncached: user keys must not outlive the run that uses them.
+    """
+    if algorithm == "HS256":
+        if not key:
+            raise ValueError("HS256 needs a non-empty secret.")
+        return lambda message: hmac.new(key, message, hashlib.sha256).digest()
+    if algorithm not in MINT_ALGORITHMS:
+        raise ValueError(f"Unsupported algorithm '{algorithm}'.")
+    try:
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+        from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+    except ImportError:
+        raise ValueError(f"{algorithm} signing needs the 'cryptography' package.")
+    try:
+        private_key = serialization.load_pem_private_key(key, password=None)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid PEM private key: {e}")
+
+    if algorithm == "RS256" and isinstance(private_key, rsa.RSAPrivateKey):
+        return lambda message: private_key.sign(message, padding.PKCS1v15(), hashes.SHA256())
+    if algorithm == "ES256" and isinstance(private_key, ec.EllipticCurvePrivateKey):
+        if private_key.curve.name != "secp256r1":
+            raise ValueError(f"ES256 needs a P-256 key, not {private_key.curve.name}.")
+
+        def sign_es256(message):
+            r, s = decode_dss_signature(private_key.sign(message, ec.ECDSA(hashes.SHA256())))
+            return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        return sign_es256
+    if algorithm == "EdDSA" and isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign
+    expected = {"RS256": "an RSA", "ES256": "a P-256 EC", "EdDSA": "an Ed25519"}[algorithm]
+    raise ValueError(f"{algorithm} needs {expected} private key.")
+
+def generate_signing_key(algorithm: str) -> tuple[str, str]:
+    """A fresh (private, public) PEM pair for RS256/ES256/EdDSA test fixtures."""
+    try:
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+    except ImportError:
+        raise ValueError("Generating key pairs needs the 'cryptography' package.")
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    elif algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f"{algorithm} does not use a key pair.")
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem.decode(), public_pem.decode()
+
+def mint_spec(algorithm: str, claims: dict, iat_offset: int = 0, iat_spread: int = 0,
+              ttl: int = 3600, add_jti: bool = True, seed: int | None = None, kid: str = "",
+              iat_base: int | None = None) -> dict:
+    """
+    Describe a batch of tokens. Top-level string claims containing {i} get the
+    token's index (e.g. "sub": "user-{i}"). iat is iat_base (default: now) +
+    iat_offset minus a random 0..iat_spread seconds, exp is iat + ttl (omitted
+    when ttl is 0), and jti is a random UUID. The same seed reproduces the
+    jti values and iat spread; pass iat_base too to reproduce whole tokens.
+    """
+    if not isinstance(claims, dict):
+        raise ValueError("The claims template must be a JSON object.")
+    header = {"alg": algorithm, "typ": "JWT", **({"kid": kid} if kid else {})}
+    return {
+        "alg": algorithm,
+        "header": _b64url(json.dumps(header, separators=(",", ":")).encode()),
+        "claims": claims,
+        "indexed": [k for k, v in claims.items() if isinstance(v, str) and "{i}" in v],
+        "iat": (int(time.time()) if iat_base is None else iat_base) + iat_offset,
+        "iat_spread": max(0, iat_spread),
+        "ttl": ttl,
+        "add_jti": add_jti,
+        "seed": random.randrange(1 << 63) if seed is None else seed,
+    }
+
+def _mint_batch(spec: dict, start: int, stop: int, sign) -> str:
+    """Tokens start..stop-1 (1-based indexes), newline-terminated."""
+    rng = random.Random(spec["seed"] * 1_000_003 + start)  # independent of which worker signs it
+    claims, indexed, spread, ttl = spec["claims"], spec["indexed"], spec["iat_spread"], spec["ttl"]
+    prefix = spec["header"] + b"."
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    lines = []
+    for i in range(start, stop):
+        payload = dict(claims)
+        for key in indexed:
+            payload[key] = claims[key].replace("{i}", str(i))
+        iat = spec["iat"] - (rng.randint(0, spread) if spread else 0)
+        payload["iat"] = iat
+        if ttl:
+            payload["exp"] = iat + ttl
+        if spec["add_jti"]:
+            payload["jti"] = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        signing_input = prefix + _b64url(dumps(payload).encode())
+        lines.append((signing_input + b"." + _b64url(sign(signing_input))).decode())
+    lines.append("")
+    return "\n".join(lines)
+
+def _mint_worker_batch(spec: dict, key: bytes, start: int, stop: int) -> str:
+    """Pool task: needs no worker initializer, so any shared process pool can run it."""
+    return _mint_batch(spec, start, stop, load_signer(spec["alg"], key))
+
+def mint_job_items(key: bytes, count: int) -> list[tuple[int, int, bytes]]:
+    """
+    (start, stop, key) work items for minting count tokens as a background
+    job. The key rides on the items, which jobs drop when they finish,
+    rather than on the job arguments, which are kept with the results.
+    """
+    if not 1 <= count <= MINT_MAX_TOKENS:
+        raise ValueError(f"Token count must be between 1 and {MINT_MAX_TOKENS:,}.")
+    return [(start, min(start + MINT_BATCH_SIZE, count + 1), key) for start in range(1, count + 1, MINT_BATCH_SIZE)]
+
+def mint_job_batch(item: tuple[int, int, bytes], spec: dict) -> str:
+    """Job function: sign one mint_job_items batch."""
+    start, stop, key = item
+    return _mint_worker_batch(spec, key, start, stop)
+
+def mint_tokens(spec: dict, key: bytes, count: int, out=None, executor=None, progress=None):
+    """
+    Sign count tokens (indexes 1..count) and write them, one per line and in
+    order, to out (default: a new spooled temp file). Large runs are signed
+    in batches on executor, a process pool owned by the caller, and inline
+    otherwise; progress(done) is called after each batch.
+    Returns the output file, rewound to 0 when it was created here.
+    """
+    if not 1 <= count <= MINT_MAX_TOKENS:
+        raise ValueError(f"Token count must be between 1 and {MINT_MAX_TOKENS:,}.")
+    sign = load_signer(spec["alg"], key)   # validates the key before anything is submitted
+    own_out = out is None
+    if own_out:
+        out = tempfile.SpooledTemporaryFile(max_size=MINT_SPOOL_MAX_MEMORY, mode="w+")
+    batches = [(start, min(start + MINT_BATCH_SIZE, count + 1)) for start in range(1, count + 1, MINT_BATCH_SIZE)]
+    pending = deque()
+
+    def collect(text, stop):
+        out.write(text)
+        if progress:
+            progress(stop - 1)
+
+    try:
+        if executor is None or count <= MINT_INLINE_MAX:
+            for start, stop in batches:
+                collect(_mint_batch(spec, start, stop, sign), stop)
+        else:
+            for start, stop in batches:
+                pending.append((executor.submit(_mint_worker_batch, spec, key, start, stop), stop))
+                if len(pending) >= MINT_MAX_PENDING:
+                    future, done = pending.popleft()
+                    collect(future.result(), done)
+            while pending:
+                future, done = pending.popleft()
+                collect(future.result(), done)
+    except BaseException:
+        # The pool is shared: do not leave the rest of this run queued on it
+        for future, _ in pending:
+            future.cancel()
+        if own_out:
+            out.close()
+        raise
+    if own_out:
+        out.seek(0)
+    return out
+# ────────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,283 @@
+import markdown2
+import re
+import io
+import os
+import csv
+import time
+import hashlib
+import posixpath
+import tarfile
+import zipfile
+import tempfile
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from utils.lru import LRUCache
+from utils.sanitizer import sanitize_html
+
+def convert_markdown_to_html(md_text: str) -> str:
+    """Convert Markdown text to HTML."""
+    return markdown2.markdown(md_text)
+
+# ── Incremental block-level rendering ─────────────────────────────────────────
+BLOCK_CACHE_MAX_ENTRIES = 4096   # rendered + sanitized blocks kept in memory
+
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+_LIST_ITEM_RE = re.compile(r'^ {0,3}(?:[*+-]|\d+[.)])(?:\s|$)')
+_REF_DEF_RE = re.compile(r'^ {0,3}\[([^\]]+)\]:\s*\S+(\s+(?:"[^"]*"|\'[^\']*\'|\([^)]*\)))?\s*$')
+_REF_LABEL_RE = re.compile(r'^ {0,3}\[([^\]]+)\]:\s*$')
+# markdown2 lets a definition's URL, then its title, continue on the next line
+_REF_URL_LINE_RE = re.compile(r'^\s*<?\S+?>?(\s+["\'(].*["\')])?\s*$')
+_REF_TITLE_LINE_RE = re.compile(r'^\s*["\'(].*["\')]\s*$')
+_BRACKET_RE = re.compile(r'\[([^\[\]]+)\]')
+# Block-level tags markdown2 passes through as raw HTML, blank lines included
+_HTML_BLOCK_RE = re.compile(
+    r'^<(address|article|aside|blockquote|body|canvas|dd|del|div|dl|dt|fieldset|figcaption|figure'
+    r'|footer|form|h[1-6]|head|header|html|iframe|ins|li|main|math|nav|noscript|ol|p|pre|script|section'
+    r'|style|table|tfoot|ul|video)\b'
+)
+
+_block_cache = LRUCache(BLOCK_CACHE_MAX_ENTRIES)
+
+def _html_depth(tag: str, line: str) -> int:
+    return len(re.findall(rf'<{tag}\b', line)) - line.count(f'</{tag}>')
+
+def _open_html_block(line: str):
+    """Return (tag, depth) for a raw HTML block or comment left open by line, else None."""
+    m = _HTML_BLOCK_RE.match(line)
+    if m and _html_depth(m.group(1), line) > 0:
+        return m.group(1), _html_depth(m.group(1), line)
+    start = line.rfind("<!--")
+    if start >= 0 and "-->" not in line[start + 4:]:
+        return "!--", 1
+    return None
+
+def _continue_html_block(html, line: str):
+    """Advance an open HTML block or comment by one line; None once it closes."""
+    tag, depth = html
+    if tag == "!--":
+        return None if "-->" in line else html
+    depth += _html_depth(tag, line)
+    return (tag, depth) if depth > 0 else None
+
+def split_markdown_blocks(md_text: str) -> tuple[list[str], dict[str, str]]:
+    """
+    Split Markdown into independently renderable top-level blocks.
+    - Fenced code, raw HTML blocks and HTML comments are never split, even
+      across blank lines, since markdown2 passes them through whole.
+    - Indented lines and consecutive list items stay with their block, so
+      loose lists and nested content render as one unit.
+    - Reference link definitions (with a URL or title on the following
+      line, as markdown2 allows) are pulled out into a {label: text} map
+      so each block can be rendered with just the definitions it uses.
+    """
+    blocks, refs = [], {}
+    current, pending_blank = [], 0
+    fence, html, in_list = None, None, False
+    open_ref = None  # (label, "url" or "title") a definition may continue with
+
+    for line in md_text.splitlines():
+        if fence:
+            current.append(line)
+            m = _FENCE_RE.match(line)
+            if m and m.group(1)[0] == fence[0] and len(m.group(1)) >= len(fence) \
+                    and not line.strip().strip(fence[0]):
+                fence = None
+            continue
+
+        if html:
+            current.append(line)
+            html = _continue_html_block(html, line)
+            continue
+
+        if open_ref:
+            label, wants = open_ref
+            open_ref = None
+            cont = (_REF_URL_LINE_RE if wants == "url" else _REF_TITLE_LINE_RE).match(line)
+            if cont:
+                refs[label] += "\n" + line.strip()
+                if wants == "url" and not cont.group(1):
+                    open_ref = label, "title"
+                continue
+
+        if not line.strip():
+            if current:
+                pending_blank += 1
+            continue
+
+        ref = _REF_DEF_RE.match(line) or _REF_LABEL_RE.match(line)
+        if ref and (pending_blank or not current):
+            label = ref.group(1).strip().lower()
+            refs[label] = line.strip()
+            if ref.re is _REF_LABEL_RE:
+                open_ref = label, "url"
+            elif not ref.group(2):
+                open_ref = label, "title"
+            continue
+
+        indented = line[:1] in (" ", "\t")
+        is_list_item = bool(_LIST_ITEM_RE.match(line))
+        if current and pending_blank and not indented and not (in_list and is_list_item):
+            blocks.append("\n".join(current))
+            current, in_list = [], False
+        if current and pending_blank:
+            current.extend([""] * pending_blank)
+        pending_blank = 0
+
+        # Lazy continuation lines keep an open list going until the next block
+        in_list = in_list or is_list_item
+        current.append(line)
+
+        m = _FENCE_RE.match(line)
+        if m:
+            fence = m.group(1)
+        else:
+            html = _open_html_block(line)
+
+    if current:
+        blocks.append("\n".join(current))
+    return blocks, refs
+
+def convert_markdown_incremental(md_text: str) -> str:
+    """
+    Convert Markdown to sanitized HTML one top-level block at a time.
+    Each block's sanitized HTML is cached by content hash (including the
+    reference definitions it uses), so editing a large document only
+    re-renders the blocks that changed.
+    """
+    blocks, refs = split_markdown_blocks(md_text)
+    parts = []
+    for block in blocks:
+        used = [refs[label] for label in
+                sorted({m.lower() for m in _BRACKET_RE.findall(block)} & refs.keys())]
+        source = block + "\n\n" + "\n".join(used) if used else block
+        key = hashlib.blake2b(source.encode("utf-8"), digest_size=16).digest()
+        html = _block_cache.get(key)
+        if html is None:
+            html = sanitize_html(markdown2.markdown(source))
+            _block_cache.put(key, html)
+        parts.append(html)
+    return "\n".join(parts)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ── Batch archive conversion ──────────────────────────────────────────────────
+MARKDOWN_EXTENSIONS = ('.md', '.markdown')
+ARCHIVE_MAX_FILES = 20000
+ARCHIVE_MAX_TOTAL_MB = 500                   # uncompressed, guards against archive bombs
+ARCHIVE_SPOOL_MAX_MEMORY = 20 * 1024 * 1024  # output zip bytes kept in RAM
+
+# href values with no scheme, not absolute and not a bare fragment
+_MD_LINK_RE = re.compile(
+    r'(<a\s[^>]*?href=")(?![a-zA-Z][a-zA-Z0-9+.-]*:|/|#)([^"?#]*?)\.(?:md|markdown)([?#][^"]*)?"',
+    re.IGNORECASE
+)
+
+def rewrite_md_links(html: str) -> str:
+    """Point relative links to .md/.markdown files at their converted .html pages."""
+    return _MD_LINK_RE.sub(lambda m: f'{m.group(1)}{m.group(2)}.html{m.group(3) or ""}"', html)
+
+def _safe_member_name(name: str):
+    """Normalize an archive member path, rejecting absolute or escaping paths."""
+    name = posixpath.normpath(name.replace("\\", "/"))
+    if name.startswith(("/", "../")) or name in (".", "..") or ":" in name.split("/")[0]:
+        return None
+    return name
+
+def iter_markdown_archive(data: bytes):
+    """
+    Yield (path, bytes) for every Markdown file in a zip or tar archive.
+    Raises ValueError for unsupported archives or when limits are exceeded.
+    """
+    buffer = io.BytesIO(data)
+    count, total = 0, 0
+
+    def check_limits(size):
+        nonlocal count, total
+        count += 1
+        total += size
+        if count > ARCHIVE_MAX_FILES:
+            raise ValueError(f"Archive has too many Markdown files (max {ARCHIVE_MAX_FILES:,})")
+        if total > ARCHIVE_MAX_TOTAL_MB * 1024 * 1024:
+            raise ValueError(f"Archive expands beyond {ARCHIVE_MAX_TOTAL_MB} MB")
+
+    if zipfile.is_zipfile(buffer):
+        with zipfile.ZipFile(buffer) as archive:
+            for info in archive.infolist():
+                name = _safe_member_name(info.filename)
+                if info.is_dir() or not name or not name.lower().endswith(MARKDOWN_EXTENSIONS):
+                    continue
+                check_limits(info.file_size)
+                yield name, archive.read(info)
+        return
+
+    buffer.seek(0)
+    try:
+        archive = tarfile.open(fileobj=buffer, mode="r:*")
+    except tarfile.TarError:
+        raise ValueError("Unsupported archive. Upload a .zip, .tar or .tgz file.")
+    with archive:
+        for info in archive:
+            name = _safe_member_name(info.name)
+            if not info.isfile() or not name or not name.lower().endswith(MARKDOWN_EXTENSIONS):
+                continue
+            check_limits(info.size)
+            yield name, archive.extractfile(info).read()
+
+def _convert_document(item: tuple[str, bytes]):
+    """Process-pool worker: convert one document, never raising."""
+    name, data = item
+    start = time.perf_counter()
+    try:
+        html = rewrite_md_links(convert_markdown_incremental(data.decode("utf-8")))
+        return name, html.encode("utf-8"), time.perf_counter() - start, None
+    except Exception as e:
+        return name, None, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+def convert_archive(data: bytes, max_workers: int = None):
+    """
+    Convert every Markdown file in a zip/tar archive to sanitized HTML on a
+    process pool. Results are streamed into a zip spooled to a temp file as
+    they complete, with a report.csv of per-file timings and errors.
+    Returns (spooled zip rewound to 0, report rows).
+    """
+    workers = max_workers or os.cpu_count() or 1
+    window = workers * 4  # bounds documents held in memory at once
+    out = tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_MAX_MEMORY, mode="w+b")
+    report = []
+
+    def collect(future):
+        name, html, seconds, error = future.result()
+        html_name = posixpath.splitext(name)[0] + ".html"
+        if html is not None:
+            bundle.writestr(html_name, html)
+        report.append({
+            "file": name,
+            "output": html_name if html is not None else "",
+            "ms": round(seconds * 1000, 2),
+            "status": "ok" if error is None else "error",
+            "error": error or ""
+        })
+
+    try:
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as bundle, \
+                ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            pending = deque()
+            for item in iter_markdown_archive(data):
+                pending.append(pool.submit(_convert_document, item))
+                if len(pending) >= window:
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+
+            summary = io.StringIO()
+            writer = csv.DictWriter(summary, fieldnames=["file", "output", "ms", "status", "error"])
+            writer.writeheader()
+            writer.writerows(report)
+            bundle.writestr("report.csv", summary.getvalue())
+    except BaseException:
+        out.close()
+        raise
+
+    out.seek(0)
+    return out, report
+# ──────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,257 @@
+"""
+Cross-tool pipelines: tool functions composed into a DAG of steps.
+
+A step is a dict {"id", "op", "param", "input"}: the operation (a key of
+OPERATIONS), its single optional parameter, and the id of the step whose
+output it consumes ("input" for the pipeline input). Several steps may read
+the same upstream step, so pipelines can branch.
+
+Values travel between steps as Python objects, so a decoded JWT reaches the
+following JSON query as a dict rather than re-serialized text. Scalar
+operations applied to a list (e.g. the matches of regex_extract) run on
+each element.
+
+Every intermediate value is cached under a Merkle-style key: the content
+hash of the pipeline input followed by each upstream operation and its
+parameter. Editing a later step therefore reuses the unchanged earlier ones.
+The cache holds its own copies, so callers may modify the values they get.
+run_bulk() streams a pipeline over input lines without caching them: lines
+rarely repeat, and a large file would evict every interactive entry.
+"""
+import hashlib
+import json
+import tempfile
+import time
+
+from core.base64_converter import decode_text, encode_text
+from core.json_formatter import format_json, parse_checked_json
+from core.jwt_decoder import decode_jwt
+from core.regex_tester import RegexTimeoutError, timed_findall
+from core.timestamp_converter import ts_to_date
+from core.url_encoder import decode_url, encode_url
+from utils.cache import get_cache
+
+INPUT = "input"
+CACHE_TOOL = "pipeline"
+BULK_SPOOL_MAX_MEMORY = 5 * 1024 * 1024
+MAX_BULK_ERRORS = 100   # error messages kept from a bulk run (all are counted)
+REGEX_TIMEOUT = 2       # seconds per regex_extract call; a bulk run stops at the first timeout
+
+class StepError(ValueError):
+    """A step failed; the message names the step."""
+
+    def __init__(self, step: dict, error: Exception):
+        super().__init__(f"Step '{step['id']}' ({step['op']}): {error}")
+        self.step_id = step["id"]
+
+# ── Operations ────────────────────────────────────────────────────────────────
+def _jwt_decode(token, _):
+    header, payload = decode_jwt(token.strip())
+    return {"header": header, "payload": payload}
+
+def _json_parse(value, _):
+    return parse_checked_json(value) if isinstance(value, str) else value
+
+def _json_query(value, path):
+    """Follow a dotted path of keys and list indexes, e.g. payload.roles.0."""
+    value = _json_parse(value, None)
+    for part in filter(None, (path or "").split(".")):
+        if isinstance(value, dict):
+            if part not in value:
+                raise ValueError(f"No key '{part}' (keys: {', '.join(map(str, value)) or 'none'})")
+            value = value[part]
+        elif isinstance(value, list):
+            try:
+                value = value[int(part)]
+            except (ValueError, IndexError):
+                raise ValueError(f"No index '{part}' in a list of {len(value)}")
+        else:
+            raise ValueError(f"Cannot look up '{part}' in a {type(value).__name__}")
+    return value
+
+def _json_format(value, indent):
+    indent = int(indent or 2)
+    if isinstance(value, str):
+        return format_json(value, indent, False, False)
+    return json.dumps(value, indent=indent, ensure_ascii=False)
+
+def _regex_extract(text, pattern):
+    if not pattern:
+        raise ValueError("A regex pattern is required.")
+    return timed_findall(pattern, text, timeout=REGEX_TIMEOUT)
+
+def _claims_summary(value, _):
+    """Registered claims of a decoded JWT (or bare payload), with readable times."""
+    payload = value.get("payload", value) if isinstance(value, dict) else value
+    if not isinstance(payload, dict):
+        raise ValueError("Expected JWT claims (an object).")
+    summary = {k: payload[k] for k in ("iss", "sub", "aud", "jti") if k in payload}
+    for claim in ("iat", "nbf", "exp"):
+        if isinstance(payload.get(claim), (int, float)):
+            summary[claim] = ts_to_date(payload[claim], "ISO 8601", "UTC")
+    if isinstance(payload.get("exp"), (int, float)):
+        summary["expired"] = payload["exp"] < time.time()
+    summary["other_claims"] = sorted(set(payload) - {"iss", "sub", "aud", "jti", "iat", "nbf", "exp"})
+    return summary
+
+def _timestamp_to_date(value, _):
+    return ts_to_date(float(value), "ISO 8601", "UTC")
+
+# name: (function(value, param), parameter label or None, applies per list element, description)
+OPERATIONS = {
+    "url_decode": (lambda v, _: decode_url(v), None, True, "Percent-decode text"),
+    "url_encode": (lambda v, _: encode_url(v), None, True, "Percent-encode text"),
+    "base64_decode": (lambda v, _: decode_text(v.strip()), None, True, "Decode Base64 to text"),
+    "base64_encode": (lambda v, _: encode_text(v), None, True, "Encode text as Base64"),
+    "regex_extract": (_regex_extract, "pattern", True, "All matches of a pattern (a list)"),
+    "jwt_decode": (_jwt_decode, None, True, "Decode a JWT into header and payload"),
+    "claims_summary": (_claims_summary, None, True, "Registered JWT claims with readable times"),
+    "json_parse": (_json_parse, None, False, "Parse JSON text"),
+    "json_query": (_json_query, "dotted path", False, "Select a value, e.g. payload.sub or items.0.id"),
+    "json_format": (_json_format, "indent", False, "Pretty-print as JSON"),
+    "timestamp_to_date": (_timestamp_to_date, None, True, "Unix timestamp to ISO 8601 (UTC)"),
+}
+
+TEMPLATES = {
+    "URL → Base64 → JSON": [
+        {"id": "decoded_url", "op": "url_decode", "param": "", "input": INPUT},
+        {"id": "decoded_b64", "op": "base64_decode", "param": "", "input": "decoded_url"},
+        {"id": "formatted", "op": "json_format", "param": "2", "input": "decoded_b64"},
+    ],
+    "Regex → JWT → Claims": [
+        {"id": "tokens", "op": "regex_extract", "param": r"eyJ[\w-]+\.[\w-]+\.[\w-]*", "input": INPUT},
+        {"id": "decoded", "op": "jwt_decode", "param": "", "input": "tokens"},
+        {"id": "claims", "op": "claims_summary", "param": "", "input": "decoded"},
+    ],
+    "Base64 → JWT → JSON query": [
+        {"id": "token", "op": "base64_decode", "param": "", "input": INPUT},
+        {"id": "decoded", "op": "jwt_decode", "param": "", "input": "token"},
+        {"id": "subject", "op": "json_query", "param": "payload.sub", "input": "decoded"},
+    ],
+}
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Execution ─────────────────────────────────────────────────────────────────
+def plan(steps: list[dict]) -> list[dict]:
+    """Validate steps and return them in dependency order."""
+    by_id = {}
+    for step in steps:
+        step_id = step["id"]
+        if not step_id or step_id == INPUT:
+            raise ValueError(f"Invalid step id '{step_id}'.")
+        if step_id in by_id:
+            raise ValueError(f"Duplicate step id '{step_id}'.")
+        if step["op"] not in OPERATIONS:
+            raise ValueError(f"Step '{step_id}': unknown operation '{step['op']}'.")
+        by_id[step_id] = step
+    if not by_id:
+        raise ValueError("The pipeline has no steps.")
+
+    ordered, state = [], {}   # state: 1 = visiting, 2 = done
+    for step_id in by_id:
+        trail = []
+        while step_id != INPUT and state.get(step_id) != 2:
+            if state.get(step_id) == 1:
+                raise ValueError(f"Steps form a cycle at '{step_id}'.")
+            if step_id not in by_id:
+                raise ValueError(f"Unknown input '{step_id}' (use '{INPUT}' or another step id).")
+            state[step_id] = 1
+            trail.append(step_id)
+            step_id = by_id[step_id]["input"] or INPUT
+        for done in reversed(trail):
+            state[done] = 2
+            ordered.append(by_id[done])
+    return ordered
+
+def _apply(step: dict, value):
+    fn, _, elementwise, _ = OPERATIONS[step["op"]]
+    param = step.get("param") or ""
+    try:
+        if elementwise and isinstance(value, list):
+            return [fn(item, param) for item in value]
+        return fn(value, param)
+    except Exception as e:
+        raise StepError(step, e) from e
+
+def _step_key(parent: bytes, step: dict) -> bytes:
+    h = hashlib.blake2b(parent, digest_size=20)
+    h.update(f"\0{step['op']}\0{step.get('param') or ''}".encode())
+    return h.digest()
+
+def _detach(value):
+    """Copy the dicts and lists of a JSON-like value; everything else is immutable."""
+    if isinstance(value, dict):
+        return {key: _detach(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    return value
+
+def run_pipeline(steps: list[dict], text: str):
+    """
+    Run every step on text. Returns ({step id: value}, number of steps served
+    from the cache). Raises StepError for the first failing step.
+    """
+    cache = get_cache(CACHE_TOOL)
+    keys = {INPUT: hashlib.blake2b(text.encode("utf-8"), digest_size=20).digest()}
+    values = {INPUT: text}
+    reused = 0
+    for step in plan(steps):
+        parent = step["input"] or INPUT
+        key = keys[step["id"]] = _step_key(keys[parent], step)
+        hit, value = cache.get(key)
+        if hit:
+            reused += 1
+            value = _detach(value)
+        else:
+            value = _apply(step, values[parent])
+            cache.put(key, _detach(value))
+        values[step["id"]] = value
+    del values[INPUT]
+    return values, reused
+
+def leaf_ids(steps: list[dict]) -> list[str]:
+    """Steps no other step reads: the pipeline's outputs."""
+    consumed = {step["input"] for step in steps}
+    return [step["id"] for step in steps if step["id"] not in consumed]
+
+def run_bulk(steps: list[dict], lines, preview_limit: int = 20):
+    """
+    Run the pipeline on every non-empty line, streaming one JSON object per
+    line (the line number and each output step's value) to a spooled file.
+    Returns (file rewound to 0, ok count, error count, errors, preview).
+    """
+    ordered = plan(steps)
+    outputs = leaf_ids(ordered)
+    out = tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_MAX_MEMORY, mode="w+")
+    ok = failed = 0
+    errors, preview = [], []
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        values = {INPUT: line}
+        try:
+            for step in ordered:
+                values[step["id"]] = _apply(step, values[step["input"] or INPUT])
+        except StepError as e:
+            if isinstance(e.__cause__, RegexTimeoutError):
+                raise  # the pattern is pathological; it would time out on every line
+            failed += 1
+            if len(errors) < MAX_BULK_ERRORS:
+                errors.append((lineno, str(e)))
+            continue
+        record = {"line": lineno, **{step_id: values[step_id] for step_id in outputs}}
+        row = json.dumps(record, ensure_ascii=False, default=str)
+        out.write(row + "\n")
+        ok += 1
+        if len(preview) < preview_limit:
+            preview.append(row)
+    out.seek(0)
+    return out, ok, failed, errors, preview
+
+def render_value(value) -> tuple[str, str]:
+    """Text and highlighting language for displaying a step's value."""
+    if isinstance(value, str):
+        return value, "text"
+    return json.dumps(value, indent=2, ensure_ascii=False, default=str), "json"
+# ──────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,110 @@
+import re
+import io
+import time
+import signal
+import tempfile
+import regex  # matching with a timeout that works off the main thread
+
+# ── ReDoS Protection ─────────────────────────────────────────────────────────
+class RegexTimeoutError(Exception):
+    pass
+
+def _timeout_handler(signum, frame):
+    raise RegexTimeoutError("Regex execution timed out (complex pattern)")
+
+def safe_findall(pattern: str, text: str, flags=0, timeout: int = 5):
+    signal.signal(signal.SIGALRM, _timeout_handler)
+    signal.alarm(timeout)
+    try:
+        compiled = re.compile(pattern, flags)
+        return compiled.findall(text)
+    finally:
+        signal.alarm(0)
+
+_REGEX_FLAGS = [(re.IGNORECASE, regex.IGNORECASE), (re.MULTILINE, regex.MULTILINE), (re.DOTALL, regex.DOTALL),
+                (re.VERBOSE, regex.VERBOSE), (re.ASCII, regex.ASCII), (re.UNICODE, regex.UNICODE)]
+
+def compile_timed(pattern: str, flags=0):
+    """
+    Compile for matching with a timeout in any thread, where safe_findall's
+    SIGALRM cannot be armed (Streamlit script threads, thread pools). The
+    pattern is validated with re first, so errors are re.error and syntax
+    stays re's; matching runs on the re-compatible regex module.
+    """
+    re.compile(pattern, flags)
+    return regex.compile(pattern, sum(new for old, new in _REGEX_FLAGS if flags & old))
+
+FINDALL_INLINE_MAX_CHARS = 100_000     # longer test strings are searched on the job queue
+
+def timed_findall(pattern: str, text: str, flags=0, timeout: float = 5):
+    """findall that raises RegexTimeoutError after timeout seconds, in any thread."""
+    try:
+        return compile_timed(pattern, flags).findall(text, timeout=timeout)
+    except TimeoutError:
+        raise RegexTimeoutError("Regex execution timed out (complex pattern)")
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Streaming substitution ────────────────────────────────────────────────────
+SUB_PREVIEW_LIMIT = 20                 # changed lines shown in the diff preview
+SUB_SPOOL_MAX_MEMORY = 5 * 1024 * 1024 # bytes kept in RAM before spilling to disk
+SUB_TIMEOUT = 60                       # seconds allowed for a whole file
+
+def _split_line_ending(line: str) -> tuple[str, str]:
+    """Split a line into its content and its original line terminator."""
+    if line.endswith("\r\n"):
+        return line[:-2], "\r\n"
+    if line.endswith(("\n", "\r")):
+        return line[:-1], line[-1]
+    return line, ""
+
+def stream_sub(pattern: str, repl: str, stream, flags=0,
+               preview_limit: int = SUB_PREVIEW_LIMIT, timeout: int = SUB_TIMEOUT,
+               encoding: str = "utf-8"):
+    """
+    Apply subn line by line to a binary text stream in the given
+    encoding, with timeout seconds for the whole stream enforced inside
+    each match as well as between lines. Output is always UTF-8.
+    Supports backreferences (\\1) and named groups (\\g<name>) in repl.
+    Line terminators are preserved and never seen by the pattern.
+    Returns (spooled output file rewound to 0, substitution count, changed
+    line count, preview list of (line number, old line, new line)).
+    """
+    compiled = compile_timed(pattern, flags)
+    re.compile(pattern, flags).subn(repl, "")  # report a bad repl as re.error before reading
+    deadline = time.monotonic() + timeout
+    out = tempfile.SpooledTemporaryFile(max_size=SUB_SPOOL_MAX_MEMORY, mode="w+b")
+    reader = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    total, changed, preview = 0, 0, []
+    try:
+        for lineno, line in enumerate(reader, 1):
+            content, ending = _split_line_ending(line)
+            # The remaining budget also bounds a single catastrophic line
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise TimeoutError
+                new, count = compiled.subn(repl, content, timeout=remaining)
+            except TimeoutError:
+                raise RegexTimeoutError("Substitution timed out (file too large or pattern too complex)")
+            if count:
+                total += count
+                changed += 1
+                if len(preview) < preview_limit:
+                    preview.append((lineno, content, new))
+            out.write((new + ending).encode("utf-8"))
+    except BaseException:
+        out.close()
+        raise
+    finally:
+        # Leave the caller's stream open
+        reader.detach()
+    out.seek(0)
+    return out, total, changed, preview
+
+def format_sub_preview(preview) -> str:
+    """Render substitution preview entries as a unified-diff style listing."""
+    chunks = []
+    for lineno, old, new in preview:
+        chunks.append(f"@@ line {lineno} @@\n-{old}\n+{new}")
+    return "\n".join(chunks)
+# ──────────────────────────────────────────────────────────────────────────────
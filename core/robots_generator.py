@@ -0,0 +1,294 @@
+import re
+import csv
+import bisect
+import posixpath
+import tempfile
+
+# ── robots.txt generation ─────────────────────────────────────────────────────
+def generate_robots(agents: list[str], disallow_paths: list[str], allow_paths: list[str], crawl_delay: str) -> str:
+    """
+    Generate robots.txt content based on user-agents, disallow/allow paths, and optional crawl-delay.
+    """
+    lines = []
+    for ua in agents:
+        lines.append(f"User-agent: {ua}")
+        for path in disallow_paths:
+            lines.append(f"Disallow: {path}")
+        for path in allow_paths:
+            lines.append(f"Allow: {path}")
+        if crawl_delay.isdigit():
+            lines.append(f"Crawl-delay: {crawl_delay}")
+        lines.append("")  # blank line between agents
+    return "\n".join(lines).strip()
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ── robots.txt parsing & matching (RFC 9309) ──────────────────────────────────
+RESULTS_SPOOL_MAX_MEMORY = 5 * 1024 * 1024
+
+def parse_robots(text: str) -> dict[str, list[tuple[bool, str]]]:
+    """
+    Parse robots.txt into {lowercased user-agent: [(is_allow, path pattern), ...]}.
+    Consecutive user-agent lines share a group, and groups naming the same
+    agent are merged. Comments, unknown keys and empty rules are ignored.
+    """
+    groups: dict[str, list[tuple[bool, str]]] = {}
+    agents, in_rules = [], False
+    for raw in text.splitlines():
+        line = raw.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        key, value = (part.strip() for part in line.split(":", 1))
+        key = key.lower()
+        if key == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            groups.setdefault(value.lower(), [])
+        elif key in ("allow", "disallow") and agents:
+            in_rules = True
+            if value:
+                for agent in agents:
+                    groups[agent].append((key == "allow", value))
+    return groups
+
+def _pattern_to_regex(pattern: str) -> str:
+    """Translate a robots path pattern ('*' wildcard, trailing '$' anchor) to regex."""
+    anchored = pattern.endswith("$")
+    if anchored:
+        pattern = pattern[:-1]
+    # Any other '$' is literal, matching the percent-encoded '$' of url_path
+    pattern = pattern.replace("$", "%24")
+    body = ".*".join(re.escape(part) for part in re.sub(r"\*+", "*", pattern).split("*"))
+    return body + (r"\Z" if anchored else "")
+
+class RobotsMatcher:
+    """
+    Allow/Disallow rules for one user-agent compiled into a single regex.
+    Alternatives are ordered by RFC 9309 precedence (longest pattern wins,
+    Allow wins ties), so the first alternative that matches is the
+    deciding rule and one regex call answers each URL.
+    """
+
+    def __init__(self, rules: list[tuple[bool, str]]):
+        self.rules = sorted(set(rules), key=lambda rule: (-len(rule[1]), not rule[0], rule[1]))
+        if self.rules:
+            self._regex = re.compile("|".join(f"({_pattern_to_regex(p)})" for _, p in self.rules), re.DOTALL)
+        else:
+            self._regex = None
+
+    @classmethod
+    def for_agent(cls, robots_txt: str, user_agent: str = "*") -> "RobotsMatcher":
+        """
+        Build the matcher for a crawler's product token: an exact group match,
+        else the longest group token the agent starts with, else the '*' group.
+        """
+        groups = parse_robots(robots_txt)
+        agent = user_agent.strip().lower()
+        if agent not in groups:
+            prefixes = [name for name in groups if name != "*" and agent.startswith(name)]
+            agent = max(prefixes, key=len) if prefixes else "*"
+        return cls(groups.get(agent, []))
+
+    @staticmethod
+    def url_path(url: str) -> str:
+        """
+        Reduce a URL to its path and query, the part robots rules match against.
+        Accepts full URLs, scheme-less host/path ('example.com/a') and bare paths.
+        A literal '*' or '$' is percent-encoded (RFC 9309 2.2.3), so a path
+        can be written back as a pattern that matches only itself.
+        """
+        if not url.startswith("/"):
+            scheme = url.find("://")
+            # A "://" after the first "/" belongs to the path or query, not a scheme
+            host_start = scheme + 3 if scheme >= 0 and "/" not in url[:scheme] else 0
+            slash = url.find("/", host_start)
+            url = url[slash:] if slash >= 0 else "/"
+        url = url.split("#", 1)[0] or "/"
+        if "*" in url or "$" in url:
+            url = url.replace("*", "%2A").replace("$", "%24")
+        return url
+
+    def match(self, url: str):
+        """Return (allowed, deciding rule or None) for a URL or path."""
+        path = self.url_path(url)
+        if path == "/robots.txt" or self._regex is None:
+            return True, None
+        m = self._regex.match(path)
+        if m is None:
+            return True, None
+        return self.rules[m.lastindex - 1][0], self.rules[m.lastindex - 1]
+
+    def check_many(self, urls):
+        """Yield (url, allowed, rule text) for an iterable of URLs, skipping blank lines."""
+        match = self.match
+        for url in urls:
+            url = url.strip()
+            if not url:
+                continue
+            allowed, rule = match(url)
+            rule_text = f"{'Allow' if rule[0] else 'Disallow'}: {rule[1]}" if rule else ""
+            yield url, allowed, rule_text
+
+def check_urls_to_csv(matcher: RobotsMatcher, urls, preview_limit: int = 200):
+    """
+    Stream decisions for many URLs into a spooled CSV file.
+    Returns (file rewound to 0, allowed count, blocked count, preview rows).
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=RESULTS_SPOOL_MAX_MEMORY, mode="w+", newline="")
+    writer = csv.writer(out)
+    writer.writerow(["url", "decision", "rule"])
+    allowed_count = blocked_count = 0
+    preview = []
+    for url, allowed, rule in matcher.check_many(urls):
+        decision = "allowed" if allowed else "blocked"
+        writer.writerow([url, decision, rule])
+        if allowed:
+            allowed_count += 1
+        else:
+            blocked_count += 1
+        if len(preview) < preview_limit:
+            preview.append({"url": url, "decision": decision, "rule": rule})
+    out.seek(0)
+    return out, allowed_count, blocked_count, preview
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── robots.txt synthesis ──────────────────────────────────────────────────────
+ALLOW_LABELS = {"allow", "allowed", "1", "true", "yes"}
+DENY_LABELS = {"deny", "denied", "disallow", "disallowed", "block", "blocked", "0", "false", "no"}
+
+# A label field before or after the URL; the URL keeps any spaces or commas of its own
+_LABEL_FIRST_RE = re.compile(r"([^,\t ]+)[,\t ]+(.+)")
+_LABEL_LAST_RE = re.compile(r"(.+?)[,\t ]+([^,\t ]+)")
+
+def parse_labeled_urls(lines):
+    """
+    Yield (path, allowed) from lines like 'allow,/a', '/a deny' or 'https://x/a\tblocked'.
+    The label is the first or last field; everything else is the URL.
+    Raises ValueError naming the first line without a recognizable label.
+    """
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip(", \t\r\n")
+        if not line:
+            continue
+        first, last = _LABEL_FIRST_RE.fullmatch(line), _LABEL_LAST_RE.fullmatch(line)
+        candidates = ([(first[1], first[2])] if first else []) + ([(last[2], last[1])] if last else [])
+        for label, url in candidates:
+            label = label.lower()
+            if label in ALLOW_LABELS or label in DENY_LABELS:
+                yield RobotsMatcher.url_path(url), label in ALLOW_LABELS
+                break
+        else:
+            if lineno > 1:  # tolerate a header row
+                raise ValueError(f"Line {lineno}: expected a URL and an allow/deny label in {line!r}")
+
+def build_url_trie(labeled):
+    """
+    Build a radix trie of [prefix, label, children] nodes from (path, allowed)
+    pairs: the root is "/" and every other node is a labeled path or a point
+    where labeled paths diverge, so a rule at any character prefix is a rule
+    at some node. Returns (root, pairs read).
+    Raises ValueError if the same path is labeled both ways.
+    """
+    labels = {}
+    count = 0
+    for path, allowed in labeled:
+        if labels.setdefault(path, allowed) != allowed:
+            raise ValueError(f"Conflicting labels for {path}")
+        count += 1
+
+    root = ["/", labels.get("/"), []]
+    stack, previous = [root], "/"
+    # Sorted paths share a prefix with their predecessor, so the trie is built
+    # like a Cartesian tree from adjacent common-prefix lengths
+    for path in sorted(labels):
+        if path == "/":
+            continue
+        common = len(posixpath.commonprefix((previous, path)))
+        last = None
+        while len(stack[-1][0]) > common:
+            last = stack.pop()
+        if len(stack[-1][0]) < common:
+            fork = [path[:common], None, [stack[-1][2].pop()]]
+            stack[-1][2].append(fork)
+            stack.append(fork)
+        node = [path, labels[path], []]
+        stack[-1][2].append(node)
+        stack.append(node)
+        previous = path
+    return root, count
+
+def _solve_trie(root):
+    """
+    Bottom-up DP: for each node and inherited decision d, the fewest rules in
+    its subtree that make every labeled URL's decision correct. A node may
+    carry a prefix rule (deciding its subtree below longer rules) and, when
+    labeled, an exact "$" rule for its own path. Appends [cost_allow,
+    cost_deny, choice_allow, choice_deny] to each node, indexed by `not d`.
+    """
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        label, children = node[1], node[2]
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+        sums = {e: sum(child[3 if e else 4] for child in children) for e in (True, False)}
+        costs, choices = [], []
+        for inherited in (True, False):
+            options = []
+            for rule, e in enumerate((inherited, not inherited)):
+                exact = label is not None and label != e
+                # On a tie, prefer no rule, then a prefix rule to an exact one
+                options.append(((rule + exact + sums[e], exact, rule), e))
+            (cost, _, _), decision = min(options)
+            costs.append(cost)
+            choices.append(decision)
+        node.extend(costs + choices)
+
+def synthesize_rules(root) -> list[tuple[bool, str]]:
+    """
+    Compute a minimal Allow/Disallow rule set reproducing every label, given
+    robots' default of allowed: no smaller set of literal prefix and exact
+    ("$") rules exists. Wildcard rules are not searched for.
+    """
+    _solve_trie(root)
+    rules = []
+    stack = [(root, True)]
+    while stack:
+        node, inherited = stack.pop()
+        prefix, label, children = node[0], node[1], node[2]
+        decision = node[5] if inherited else node[6]
+        if decision != inherited:
+            rules.append((decision, prefix))
+        if label is not None and label != decision:
+            rules.append((label, prefix + "$"))
+        stack.extend((child, decision) for child in children)
+    rules.sort(key=lambda rule: rule[1])
+    return rules
+
+def iter_trie_labels(root):
+    """Yield (path, allowed) for every labeled path in the trie."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node[1] is not None:
+            yield node[0], node[1]
+        stack.extend(node[2])
+
+def synthesize_robots(lines, user_agent: str = "*"):
+    """
+    Build robots.txt reproducing an allow/deny-labeled URL inventory exactly,
+    with the fewest prefix and exact rules (see synthesize_rules).
+    Returns (robots.txt text, rules, URL count, mismatched paths after
+    validating every URL against the compiled matcher).
+    """
+    root, count = build_url_trie(parse_labeled_urls(lines))
+    rules = synthesize_rules(root)
+    matcher = RobotsMatcher(rules)
+    mismatches = [path for path, allowed in iter_trie_labels(root) if matcher.match(path)[0] != allowed]
+
+    body = [f"User-agent: {user_agent}"]
+    body += [f"{'Allow' if allowed else 'Disallow'}: {pattern}" for allowed, pattern in rules]
+    return "\n".join(body), rules, count, mismatches
+# ──────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+# ── Timestamp conversions ──────────────────────────────────────────────────────
+def ts_to_date(ts_value: float, fmt: str, tz_str: str) -> str:
+    """Convert Unix timestamp (seconds or ms) to formatted date string."""
+    if ts_value > 1e12:
+        ts_value /= 1000
+    tz = timezone.utc if tz_str == "UTC" else None
+    dt = datetime.fromtimestamp(ts_value, tz=tz)
+    return dt.isoformat() if fmt == "ISO 8601" else dt.strftime(fmt)
+
+def date_to_ts(date_str: str, tz_str: str) -> int:
+    """Convert date string to Unix timestamp (seconds)."""
+    # Handle ISO vs space-separated format
+    if "T" in date_str:
+        dt = datetime.fromisoformat(date_str)
+    else:
+        dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
+    if tz_str == "UTC":
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+def bulk_convert_line(line: str, direction: str) -> str:
+    """Convert one bulk-mode line (UTC): a timestamp "→ Date" or a date "→ Timestamp"."""
+    if direction == "→ Date":
+        return f"{line} → {ts_to_date(float(line), 'ISO 8601', 'UTC')}"
+    return f"{line} → {date_to_ts(line, 'UTC')}"
+# ────────────────────────────────────────────────────────────────────────────────
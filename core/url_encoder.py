@@ -0,0 +1,17 @@
+import urllib.parse
+
+# ── URL operations ─────────────────────────────────────────────────────────────
+def encode_url(text: str) -> str:
+    return urllib.parse.quote(text, safe='')
+
+def decode_url(text: str) -> str:
+    return urllib.parse.unquote(text)
+
+def process_line(line: str, direction: str) -> str:
+    if direction == "Encode":
+        return f"{line} → {urllib.parse.quote(line, safe='')}"
+    return f"{line} → {urllib.parse.unquote(line)}"
+
+def bulk_process(lines: list[str], direction: str) -> list[str]:
+    return [process_line(line, direction) for line in lines]
+# ────────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,15 @@
+import random
+import uuid
+
+# ── UUID generation ────────────────────────────────────────────────────────────
+def generate_uuids(count: int, seed: int | None = None) -> list[str]:
+    """
+    Generate a list of version 4 UUIDs.
+    If seed is provided, the UUIDs come from a private RNG seeded with it,
+    so the same seed always yields the same list.
+    """
+    if seed is None:
+        return [str(uuid.uuid4()) for _ in range(count)]
+    rng = random.Random(seed)
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(count)]
+# ────────────────────────────────────────────────────────────────────────────────
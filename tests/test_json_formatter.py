@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from core.json_formatter import iter_json_records
+
+
+DOCUMENTS = [
+    '[3.14, -1e-5, 14, 2E+3, 0]',
+    '[{"a": 1.5, "b": "caf\\u00e9"}, true, false, null, "x\\"y"]',
+    '[\n  {"id": 1},\n  {"id": 2}\n]\n',
+    '3.14\n14\n-2.5e-3\n',
+    '{"a": [1, 2]}\n{"a": 10.25}\n"s"\n',
+    '[1, 2.5]\n[3, 4]\n',
+    '[{"a": 1}] [{"b": 2}]',
+]
+
+
+def expected_records(doc):
+    stripped = doc.strip()
+    try:
+        value = json.loads(stripped)
+    except json.JSONDecodeError:
+        value = None
+    if isinstance(value, list):
+        return value
+    decoder, records, pos = json.JSONDecoder(), [], 0
+    while True:
+        while pos < len(doc) and doc[pos].isspace():
+            pos += 1
+        if pos == len(doc):
+            return records
+        record, pos = decoder.raw_decode(doc, pos)
+        records.append(record)
+
+
+@pytest.mark.parametrize("doc", DOCUMENTS)
+def test_records_split_at_every_offset(doc):
+    expected = expected_records(doc)
+    for i in range(len(doc) + 1):
+        assert list(iter_json_records([doc[:i], doc[i:]])) == expected, f"split at {i}"
+
+
+@pytest.mark.parametrize("doc", DOCUMENTS)
+def test_records_one_character_per_chunk(doc):
+    assert list(iter_json_records(iter(doc))) == expected_records(doc)
+
+
+def test_ndjson_of_arrays_is_not_one_array():
+    assert list(iter_json_records(['[1, 2]\n[3, 4]\n'])) == [[1, 2], [3, 4]]
+
+
+@pytest.mark.parametrize("doc", ['[3.]', '3.\n', '[1 2]', '[1, 2]]'])
+def test_invalid_input_is_reported(doc):
+    with pytest.raises(ValueError):
+        list(iter_json_records([doc]))
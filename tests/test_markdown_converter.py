@@ -0,0 +1,44 @@
+import markdown2
+import pytest
+
+from core.markdown_converter import convert_markdown_incremental, split_markdown_blocks
+from utils.sanitizer import sanitize_html
+
+
+def full_render(md_text: str) -> str:
+    return sanitize_html(markdown2.markdown(md_text))
+
+
+def squash(html: str) -> str:
+    # Blocks are joined with newlines, so only whitespace between tags may differ
+    return "".join(html.split())
+
+
+@pytest.mark.parametrize("md_text", [
+    "<!--\n\ncomment\n\n-->\n\ntext",
+    "a <!-- b\n\nc --> d\n\ne",
+    "<div>\n\nhello\n\n</div>",
+    "a\n\n<div>\n<p>x</p>\n\ny\n</div>\n\nb",
+    "<div><div>\n\n</div>\n\nstill\n</div>\n\nout",
+    "<table>\n<tr><td>\n\ncell\n\n</td></tr>\n</table>\n\nafter",
+    "para\n<div>\n\nx\n\n</div>\nz",
+    "- a\n\n  <div>\n\n  x\n\n  </div>\n\n- b",
+    "see [x]\n\n[x]: http://a\n  \"title\"\n\nmore",
+    "[x]: http://a\n\"title\"\n\n[x] link",
+    "[x]:\n  http://a\n  'T'\n\n[x] y",
+    "# h\n\n<!-- one line -->\n\npara",
+    "```\n<div>\n```\n\nok",
+    "<hr>\n\npara\n\n<hr/>",
+])
+def test_incremental_matches_full_render(md_text):
+    assert squash(convert_markdown_incremental(md_text)) == squash(full_render(md_text))
+
+
+def test_html_comment_is_one_block():
+    blocks, _ = split_markdown_blocks("<!--\n\ncomment\n\n-->\n\ntext")
+    assert blocks == ["<!--\n\ncomment\n\n-->", "text"]
+
+
+def test_reference_title_on_next_line_is_part_of_definition():
+    _, refs = split_markdown_blocks("[x]: http://a\n  \"title\"\n\n[x]")
+    assert refs == {"x": "[x]: http://a\n\"title\""}
@@ -0,0 +1,52 @@
+import base64
+import json
+
+from core.pipeline import CACHE_TOOL, run_pipeline
+from utils.cache import get_cache
+
+STEPS = [
+    {"id": "parsed", "op": "json_parse", "param": "", "input": "input"},
+    {"id": "roles", "op": "json_query", "param": "user.roles", "input": "parsed"},
+]
+
+
+def setup_function():
+    get_cache(CACHE_TOOL).clear()
+
+
+def test_cached_values_are_reused():
+    text = json.dumps({"user": {"roles": ["admin", "dev"]}})
+    first, reused = run_pipeline(STEPS, text)
+    assert reused == 0
+    again, reused = run_pipeline(STEPS, text)
+    assert reused == 2
+    assert again == first
+
+
+def test_callers_cannot_corrupt_the_cache():
+    text = json.dumps({"user": {"roles": ["admin", "dev"]}})
+    values, _ = run_pipeline(STEPS, text)
+    values["roles"].append("root")
+    values["parsed"]["user"]["name"] = "mallory"
+
+    again, reused = run_pipeline(STEPS, text)
+    assert reused == 2
+    assert again["roles"] == ["admin", "dev"]
+    assert again["parsed"] == {"user": {"roles": ["admin", "dev"]}}
+
+    # A hit hands out copies too
+    again["roles"].clear()
+    assert run_pipeline(STEPS, text)[0]["roles"] == ["admin", "dev"]
+
+
+def test_branches_share_cached_prefix():
+    token = base64.b64encode(json.dumps({"a": {"b": 1}}).encode()).decode()
+    steps = [
+        {"id": "text", "op": "base64_decode", "param": "", "input": "input"},
+        {"id": "a", "op": "json_query", "param": "a", "input": "text"},
+        {"id": "b", "op": "json_query", "param": "a.b", "input": "text"},
+    ]
+    values, reused = run_pipeline(steps, token)
+    assert (values["a"], values["b"], reused) == ({"b": 1}, 1, 0)
+    values["a"]["b"] = 2
+    assert run_pipeline(steps, token)[0]["b"] == 1
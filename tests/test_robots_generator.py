@@ -0,0 +1,64 @@
+import itertools
+import random
+
+import pytest
+
+from core.robots_generator import RobotsMatcher, synthesize_robots
+
+
+def random_inventory(rng):
+    paths = {"/" + "".join(rng.choice("ab/") for _ in range(rng.randint(0, 4))) for _ in range(rng.randint(1, 4))}
+    return {path: rng.random() < 0.5 for path in paths}
+
+
+def decide(rules, path):
+    """Longest matching literal or exact rule wins, Allow on ties; allowed by default."""
+    best = None
+    for allowed, pattern in rules:
+        hit = path == pattern[:-1] if pattern.endswith("$") else path.startswith(pattern)
+        if hit and (best is None or (len(pattern), allowed) > best):
+            best = len(pattern), allowed
+    return True if best is None else best[1]
+
+
+def brute_force_minimum(inventory):
+    """Fewest prefix or exact rules classifying the inventory; rules that match no path are never needed."""
+    prefixes = {path[:i] for path in inventory for i in range(1, len(path) + 1)}
+    candidates = [(allowed, pattern) for pattern in sorted(prefixes | {p + "$" for p in inventory})
+                  for allowed in (True, False)]
+    for size in itertools.count():
+        for rules in itertools.combinations(candidates, size):
+            if all(decide(rules, path) == allowed for path, allowed in inventory.items()):
+                return size
+
+
+def test_minimal_on_small_inventories():
+    rng = random.Random(34)
+    for _ in range(300):
+        inventory = random_inventory(rng)
+        lines = [f"{'allow' if allowed else 'deny'},{path}" for path, allowed in inventory.items()]
+        _, rules, count, mismatches = synthesize_robots(lines)
+        assert count == len(inventory)
+        assert mismatches == []
+        assert all(decide(rules, path) == allowed for path, allowed in inventory.items()), inventory
+        assert len(rules) == brute_force_minimum(inventory), inventory
+
+
+@pytest.mark.parametrize("inventory, expected", [
+    ({"/ab/": False, "/b/ab/ab": True, "/a/": False}, [(False, "/a")]),
+    ({"/a/": True, "/a/x": False, "/a/y": False, "/b": False, "/c": False}, [(False, "/"), (True, "/a/$")]),
+])
+def test_known_inventories(inventory, expected):
+    lines = [f"{path} {'allow' if allowed else 'deny'}" for path, allowed in inventory.items()]
+    assert synthesize_robots(lines)[1] == expected
+
+
+def test_wildcard_characters_are_escaped():
+    lines = ["deny /a*b", "allow /a*c", "allow /a$", "deny /a$b", "allow /ab"]
+    _, rules, _, mismatches = synthesize_robots(lines)
+    assert mismatches == []
+    assert not any("*" in pattern or "$b" in pattern for _, pattern in rules)
+    matcher = RobotsMatcher(rules)
+    assert matcher.match("/a*b")[0] is False
+    assert matcher.match("/axb")[0] is True
+    assert matcher.match("/a$b")[0] is False
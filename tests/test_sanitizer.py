@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import bleach
+import markdown2
+import pytest
+
+from utils.sanitizer import (
+    ALLOWED_ATTRS, ALLOWED_PROTOCOLS, ALLOWED_TAGS,
+    sanitize_html, sanitize_html_uncached
+)
+
+XSS_VECTORS = [
+    "<script>alert(1)</script>",
+    "<img src=x onerror=alert(1)>",
+    "<a href=\"javascript:alert(1)\">x</a>",
+    "<a href=\"JaVaScRiPt:alert(1)\">x</a>",
+    "<a href=\"&#106;avascript:alert(1)\">x</a>",
+    "<a href=\"java\tscript:alert(1)\">x</a>",
+    "<svg onload=alert(1)>",
+    "<iframe src=\"data:text/html,<script>alert(1)</script>\"></iframe>",
+    "<p style=\"background:url(javascript:alert(1))\">x</p>",
+    "<scr<script>ipt>alert(1)</scr</script>ipt>",
+    "<<script>script>alert(1)<</script>/script>",
+    "<code class=\"x\" onclick=\"alert(1)\">c</code>",
+    "<img src=\"data:image/svg+xml;base64,PHN2Zz4=\" alt=\"a\">",
+    "<a href=\"http://ok\" target=\"_blank\" onmouseover=\"x()\">ok</a>",
+    "<!-- <script>alert(1)</script> -->",
+    "<math><mi xlink:href=\"javascript:alert(1)\">x</mi></math>",
+    "<table><tr><td><form><input autofocus onfocus=alert(1)></form></td></tr></table>",
+    "<div><p>unclosed <em>tags",
+    "&lt;script&gt;already escaped&lt;/script&gt;",
+    "<details open ontoggle=alert(1)>",
+    "<object data=\"javascript:alert(1)\"></object>",
+]
+
+MARKDOWN_SAMPLES = [
+    "Some **bold** text with a [link](https://example.com) and `code`.",
+    "- item\n- item with <img src=x onerror=alert(1)>",
+    "> A quote <script>alert(1)</script>",
+    "[click](javascript:alert(1)) <span onclick=\"alert(1)\">x</span>",
+    "```\n<script>alert(1)</script>\n```",
+    "| a | b |\n|---|---|\n| 1 | <b onmouseover=x()>2</b> |",
+]
+
+CORPUS = XSS_VECTORS + [markdown2.markdown(md) for md in MARKDOWN_SAMPLES]
+
+
+def fresh_clean(html):
+    """A one-off bleach.clean with the same allowlists: the reference output."""
+    return bleach.clean(
+        html,
+        tags=list(ALLOWED_TAGS),
+        attributes={tag: list(attrs) for tag, attrs in ALLOWED_ATTRS.items()},
+        protocols=list(ALLOWED_PROTOCOLS),
+        strip=True
+    )
+
+
+@pytest.mark.parametrize("html", CORPUS)
+def test_reused_cleaner_matches_bleach(html):
+    expected = fresh_clean(html)
+    # Twice: the thread's Cleaner must not carry state between calls
+    assert sanitize_html_uncached(html) == expected
+    assert sanitize_html_uncached(html) == expected
+
+
+@pytest.mark.parametrize("html", CORPUS)
+def test_cached_output_matches_bleach(html):
+    expected = fresh_clean(html)
+    # Cold, then warm from the content-hash cache
+    assert sanitize_html(html) == expected
+    assert sanitize_html(html) == expected
+    # Clean output is recorded as its own fixed point
+    assert sanitize_html(expected) == fresh_clean(expected)
+
+
+def test_threads_match_bleach():
+    expected = [fresh_clean(html) for html in CORPUS]
+    with ThreadPoolExecutor(4) as pool:
+        for _ in range(3):
+            assert list(pool.map(sanitize_html_uncached, CORPUS)) == expected
+            assert list(pool.map(sanitize_html, CORPUS)) == expected
+
+
+def test_no_script_survives():
+    for html in CORPUS:
+        clean = sanitize_html(html).lower()
+        assert "<script" not in clean
+        assert "href=\"javascript" not in clean and "src=\"javascript" not in clean
+        assert " onerror=" not in clean and " onclick=" not in clean
@@ -1,44 +1,20 @@
 import streamlit as st
-import base64
-from utils.common import setup_page, show_result, handle_file_upload, validate_input, add_footer
+from core import base64_converter as _core
+from utils.cache import cached
+from utils.metrics import timed
+from utils.common import setup_page, show_result, download_result, handle_file_upload, validate_input, add_footer
 
-# ── File Type Security ─────────────────────────────────────────────────────────
-ALLOWED_FILE_EXTENSIONS = ['.txt', '.json', '.csv', '.md', '.py', '.js', '.html', '.css', '.xml', '.yaml', '.yml']
-MAX_FILE_SIZE_MB = 5
+# ── Cache Base64 operations ───────────────────────────────────────────────────
+encode_text = cached("base64")(_core.encode_text)
+decode_text = cached("base64")(_core.decode_text)
+decode_file_content = cached("base64")(_core.decode_file_content)
 
-def validate_file_for_encoding(filename: str, size_bytes: int):
-    """Basic file validation for Base64 encoding"""
-    import os
-
-    # Check file extension
-    _, ext = os.path.splitext(filename.lower())
-    if ext not in ALLOWED_FILE_EXTENSIONS:
-        raise ValueError(f"File type '{ext}' not allowed. Allowed: {', '.join(ALLOWED_FILE_EXTENSIONS)}")
-
-    # Check file size
-    size_mb = size_bytes / (1024 * 1024)
-    if size_mb > MAX_FILE_SIZE_MB:
-        raise ValueError(f"File too large: {size_mb:.1f}MB (max: {MAX_FILE_SIZE_MB}MB)")
+@timed("base64")
+def encode_upload(upload) -> str:
+    """Encode an upload's raw bytes chunk by chunk (any encoding, or binary)."""
+    return b"".join(_core.iter_encode_chunks(upload.iter_chunks())).decode("ascii")
 # ──────────────────────────────────────────────────────────────────────────────
 
-# ── Cache Base64 operations ────────────────────────────────────────────────────
-@st.cache_data(show_spinner=False)
-def encode_text(data: str) -> str:
-    return base64.b64encode(data.encode()).decode()
-
-@st.cache_data(show_spinner=False)
-def decode_text(data: str) -> str:
-    return base64.b64decode(data).decode()
-
-@st.cache_data(show_spinner=False)
-def encode_file_content(data: str) -> str:
-    return base64.b64encode(data.encode()).decode()
-
-@st.cache_data(show_spinner=False)
-def decode_file_content(data: str) -> str:
-    return base64.b64decode(data).decode()
-# ────────────────────────────────────────────────────────────────────────────────
-
 def render():
     # 1. Header
     setup_page(
@@ -59,7 +35,7 @@ def render():
             else:
                 encoded = encode_text(text)
                 show_result(encoded)
-                st.download_button("📥 Download as .txt", encoded, "encoded.txt", "text/plain")
+                download_result("📥 Download as .txt", encoded, "encoded.txt", "text/plain")
 
     # 4. Decode Text
     elif mode == "Decode Text":
@@ -72,17 +48,17 @@ def render():
                 try:
                     decoded = decode_text(b64)
                     show_result(decoded)
-                    st.download_button("📥 Download as .txt", decoded, "decoded.txt", "text/plain")
+                    download_result("📥 Download as .txt", decoded, "decoded.txt", "text/plain")
                 except Exception as e:
                     st.error(f"❌ Decoding error: {e}")
 
     # 5. Encode File
     elif mode == "Encode File":
-        content = handle_file_upload(max_mb=10)
-        if content and st.button("🔒 Encode File"):
-            encoded = encode_file_content(content)
+        upload = handle_file_upload(max_mb=10, as_upload=True)
+        if upload and st.button("🔒 Encode File"):
+            encoded = encode_upload(upload)
             show_result(encoded)
-            st.download_button("📥 Download as .txt", encoded, "file_encoded.txt", "text/plain")
+            download_result("📥 Download as .txt", encoded, "file_encoded.txt", "text/plain")
 
     # 6. Decode File
     else:  # mode == "Decode File"
@@ -91,7 +67,7 @@ def render():
             try:
                 decoded = decode_file_content(b64file)
                 show_result(decoded)
-                st.download_button("📥 Download as .txt", decoded, "file_decoded.txt", "text/plain")
+                download_result("📥 Download as .txt", decoded, "file_decoded.txt", "text/plain")
             except Exception as e:
                 st.error(f"❌ Decoding error: {e}")
 
@@ -1,28 +1,19 @@
 import streamlit as st
-import random
-from utils.common import setup_page, show_result, add_footer
-from typing import List
-
-# ── Cache heavy color operations ───────────────────────────────────────────────
-@st.cache_data(show_spinner=False)
-def generate_random_palette(count: int, seed: int = None) -> List[str]:
-    """Generate a list of random hex colors with optional seed for reproducibility"""
-    if seed:
-        random.seed(seed)
-    return [f"#{random.randint(0, 0xFFFFFF):06X}" for _ in range(count)]
-
-@st.cache_data(show_spinner=False)
-def calculate_contrast_ratio(color1: str, color2: str) -> float:
-    """Calculate WCAG contrast ratio between two hex colors"""
-    def luminance(hex_color):
-        r, g, b = tuple(int(hex_color[i:i+2], 16)/255 for i in (1, 3, 5))
-        for v in (r, g, b):
-            v = v/12.92 if v <= 0.03928 else ((v+0.055)/1.055)**2.4
-        return 0.2126*r + 0.7152*g + 0.0722*b
-
-    l1, l2 = luminance(color1), luminance(color2)
-    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
-# ────────────────────────────────────────────────────────────────────────────────
+from core.color_palette import (
+    WCAG_LEVELS, extract_palette_tokens, wcag_level, audit_report_csv, nearest_color_name
+)
+from core import color_palette as _core
+from utils.cache import cached
+from utils.common import setup_page, show_result, download_result, handle_file_upload, add_footer
+
+# ── Cache heavy color operations ──────────────────────────────────────────────
+generate_random_palette = cached("color", seed_arg="seed")(_core.generate_random_palette)
+calculate_contrast_ratio = cached("color")(_core.calculate_contrast_ratio)
+audit_palette = cached("color")(_core.audit_palette)
+# Keyed by a content hash of the image bytes
+extract_image_palette = cached("color")(_core.extract_image_palette)
+generate_perceptual_palette = cached("color", seed_arg="seed")(_core.generate_perceptual_palette)
+# ──────────────────────────────────────────────────────────────────────────────
 
 def render():
     # 1. Header
@@ -32,7 +23,7 @@ def render():
     )
 
     # 2. Mode
-    mode = st.radio("Mode:", ["Random Palette", "Contrast Checker"])
+    mode = st.radio("Mode:", ["Random Palette", "Image Palette", "Contrast Checker", "Palette Audit"])
 
     if mode == "Random Palette":
         col1, col2 = st.columns([2, 1])
@@ -42,8 +33,26 @@ def render():
             use_seed = st.checkbox("Use seed for reproducible colors")
             seed = st.number_input("Seed:", value=42) if use_seed else None
 
+        perceptual = st.checkbox("Perceptually distinct colors (CIEDE2000)", value=True)
+        if perceptual:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                min_delta_e = st.slider("Minimum ΔE between colors:", 5, 50, 20)
+            with col2:
+                background = st.color_picker("Background", "#0E1117")
+            with col3:
+                min_contrast = st.selectbox("Min contrast vs background:", [None, *WCAG_LEVELS.values()],
+                                            format_func=lambda r: "None" if r is None else f"{r}:1")
+
         if st.button("🎲 Generate"):
-            palette = generate_random_palette(count, seed)
+            if perceptual:
+                try:
+                    palette = generate_perceptual_palette(count, min_delta_e, seed, background, min_contrast)
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                    return
+            else:
+                palette = generate_random_palette(count, seed)
 
             # Display colors visually
             cols = st.columns(min(count, 5))  # Max 5 columns per row
@@ -55,19 +64,56 @@ def render():
                         unsafe_allow_html=True
                     )
                     st.code(color, language="css")
+                    st.caption(f"≈ {nearest_color_name(color)[0]}")
 
             # Show result as text
             result = "\n".join(palette)
             show_result(result)
 
-            st.download_button(
+            download_result(
                 label="📥 Download Palette",
                 data=result,
                 file_name="color_palette.txt",
                 mime="text/plain"
             )
 
-    else:
+    elif mode == "Image Palette":
+        image = handle_file_upload(["png", "jpg", "jpeg", "webp", "gif", "bmp"], max_mb=25, raw=True)
+        count = st.slider("Colors to extract:", min_value=2, max_value=16, value=6)
+
+        if image is not None:
+            st.image(image, width=320)
+        if st.button("🖼️ Extract Palette"):
+            if image is None:
+                st.error("❌ Please upload an image.")
+                return
+            try:
+                palette = extract_image_palette(image.getvalue(), count)
+            except Exception as e:
+                st.error(f"❌ Could not read image: {e}")
+                return
+
+            cols = st.columns(min(len(palette), 4))
+            for i, (color, share) in enumerate(palette):
+                with cols[i % 4]:
+                    st.markdown(
+                        f'<div style="background:{color};height:80px;border-radius:8px;'
+                        f'border:2px solid #444;margin:4px 0;"></div>',
+                        unsafe_allow_html=True
+                    )
+                    st.code(f"{color}  {share:.1%}", language="css")
+                    st.caption(f"≈ {nearest_color_name(color)[0]}")
+
+            result = "\n".join(color for color, _ in palette)
+            show_result(result)
+            download_result(
+                label="📥 Download Palette",
+                data=result,
+                file_name="image_palette.txt",
+                mime="text/plain"
+            )
+
+    elif mode == "Contrast Checker":
         st.subheader("WCAG Contrast Checker")
         col1, col2 = st.columns(2)
 
@@ -119,5 +165,49 @@ def render():
                    "- AAA Normal text: ≥7:1\n"
                    "- AAA Large text: ≥4.5:1")
 
+    else:
+        st.subheader("Palette Contrast Audit")
+        text = st.text_area(
+            "Paste colors or design tokens:", height=150,
+            placeholder="#0E1117\n--brand-primary: #00D4AA;\n$text-muted: rgb(176, 176, 176);"
+        )
+        content = handle_file_upload(["css", "scss", "json", "txt"], max_mb=5)
+        if content:
+            text = content
+        level = st.selectbox("Minimum level:", list(WCAG_LEVELS), index=1)
+
+        if st.button("🔎 Audit Palette"):
+            tokens = extract_palette_tokens(text or "")
+            if len(tokens) < 2:
+                st.error("❌ Please provide at least two distinct colors.")
+                return
+            try:
+                rows, cols, ratios, counts = audit_palette(tuple(c for _, c in tokens), WCAG_LEVELS[level])
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                return
+
+            total_pairs = len(tokens) * (len(tokens) - 1) // 2
+            st.success(f"✅ {len(ratios):,} of {total_pairs:,} pairs meet {level} "
+                       f"({len(tokens):,} colors)")
+            st.text(" • ".join(f"{name}: {n:,}" for name, n in counts.items()))
+
+            preview = [
+                {"color_a": tokens[i][0], "hex_a": tokens[i][1],
+                 "color_b": tokens[j][0], "hex_b": tokens[j][1],
+                 "ratio": round(float(r), 2), "level": wcag_level(float(r))}
+                for i, j, r in zip(rows[:200].tolist(), cols[:200].tolist(), ratios[:200].tolist())
+            ]
+            if preview:
+                st.dataframe(preview, use_container_width=True)
+                if len(ratios) > len(preview):
+                    st.caption(f"Showing the {len(preview)} highest-contrast pairs. Download for the full list.")
+            download_result(
+                label="📥 Download Audit (.csv)",
+                data=lambda: audit_report_csv(tokens, rows, cols, ratios),
+                file_name="palette_audit.csv",
+                mime="text/csv"
+            )
+
     # Footer
     # add_footer()
@@ -0,0 +1,112 @@
+import streamlit as st
+import csv
+import io
+import tarfile
+import zipfile
+from core import file_hasher as _core
+from core.file_hasher import ALGORITHMS
+from utils.metrics import timed
+from utils.common import setup_page, show_result, download_result, handle_file_uploads, add_footer
+
+# ── Instrument hashing (inputs are files, so results are not cached) ──────────
+hash_files = timed("hash")(_core.hash_files)
+hash_archive = timed("hash")(_core.hash_archive)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def render():
+    # 1. Header
+    setup_page(
+        "#️⃣ File Hasher & Checksum Verifier",
+        "Compute MD5, SHA and BLAKE2 digests of files or archive members, and verify checksum manifests."
+    )
+
+    # 2. Inputs
+    source = st.radio("Hash:", ["Uploaded files", "Every file in an archive"], horizontal=True)
+    algorithms = st.multiselect("Algorithms:", list(ALGORITHMS), default=["SHA-256"])
+    if source == "Uploaded files":
+        uploads = handle_file_uploads(max_mb=200, relaxed_names=True)
+    else:
+        uploads = handle_file_uploads(
+            ["zip", "tar", "tgz", "gz"], max_mb=200, label="Upload an archive (.zip, .tar, .tar.gz):",
+            relaxed_names=True
+        )[:1]
+    with st.expander("✅ Verify against a checksum manifest"):
+        manifest_text = st.text_area(
+            "Paste sha256sum / md5sum / b2sum output (or BSD --tag lines):", height=120,
+            placeholder="e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855  release.zip"
+        )
+
+    # 3. Hash all files in one read pass per file
+    if not st.button("#️⃣ Compute Hashes", use_container_width=True):
+        return
+    if not uploads:
+        st.error("❌ Please upload at least one file.")
+        return
+    try:
+        manifest = _core.parse_manifest(manifest_text) if manifest_text.strip() else []
+    except ValueError as e:
+        st.error(f"❌ Manifest: {e}")
+        return
+    # Hash whatever the manifest needs in the same pass
+    needed = list(dict.fromkeys(algorithms + [a for _, candidates, _ in manifest for a in candidates]))
+    if not needed:
+        st.error("❌ Please choose at least one algorithm.")
+        return
+
+    with st.spinner("Hashing..."):
+        if source == "Uploaded files":
+            rows = hash_files([(u.name, u.iter_chunks) for u in uploads], needed)
+        else:
+            try:
+                rows = hash_archive(uploads[0].open_binary(), needed)
+            except (ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+                st.error(f"❌ {e}")
+                return
+
+    failed = [row for row in rows if row["error"]]
+    total_mb = sum(row["size"] for row in rows) / 1024 / 1024
+    if failed:
+        st.warning(f"⚠️ Hashed {len(rows) - len(failed)} of {len(rows)} files; {len(failed)} could not be read.")
+    else:
+        st.success(f"✅ Hashed {len(rows):,} files ({total_mb:,.1f} MB)")
+    columns = ["file", "size"] + needed + (["error"] if failed else [])
+    st.dataframe([{c: row.get(c, "") for c in columns} for row in rows], use_container_width=True)
+
+    # 4. Verification
+    if manifest:
+        results = _core.verify_manifest(manifest, rows)
+        bad = [r for r in results if r["status"] not in ("OK", "NOT LISTED")]
+        if bad:
+            st.error(f"❌ {len(bad)} of {len(manifest)} manifest entries did not verify.")
+        else:
+            st.success(f"✅ All {len(manifest)} manifest entries verified.")
+        st.dataframe(sorted(results, key=lambda r: r["status"] == "OK"), use_container_width=True)
+
+    # 5. Downloads: a manifest for the first algorithm and a CSV of every digest
+    primary = needed[0]
+    manifest_out = _core.format_manifest(rows, primary)
+    show_result(manifest_out)
+    download_result(
+        f"📥 Download {primary.replace('-', '')}SUMS",
+        manifest_out,
+        f"{primary.replace('-', '')}SUMS",
+        "text/plain"
+    )
+    download_result(
+        "📥 Download all digests (.csv)",
+        lambda: _rows_to_csv(rows, columns),
+        "checksums.csv",
+        "text/csv"
+    )
+
+    # add_footer()
+
+def _rows_to_csv(rows, columns) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+if __name__ == "__main__":
+    render()
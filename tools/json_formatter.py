@@ -1,47 +1,17 @@
 import streamlit as st
 import json
-from utils.common import setup_page, show_result, handle_file_upload, validate_input, add_footer
-import sys
-from functools import wraps
+from core import json_formatter as _core
+from core.json_formatter import FLATTEN_SAMPLE_RECORDS
+from utils.cache import cached
+from utils.metrics import timed
+from utils.common import setup_page, show_result, download_result, handle_file_upload, validate_input, add_footer
 
-# ── Security wrapper for JSON operations ─────────────────────────────────────
-def json_security_check(data: str, max_size_mb=10, max_depth=50):
-    size_mb = len(data.encode('utf-8')) / (1024 * 1024)
-    if size_mb > max_size_mb:
-        raise ValueError(f"JSON too large: {size_mb:.1f}MB (max: {max_size_mb}MB)")
-
-    try:
-        parsed_data = json.loads(data)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON: {str(e)}")
-
-    def check_depth(obj, current_depth=0):
-        if current_depth > max_depth:
-            raise ValueError(f"JSON too deeply nested: {current_depth} levels (max: {max_depth})")
-        if isinstance(obj, dict):
-            for value in obj.values():
-                check_depth(value, current_depth + 1)
-        elif isinstance(obj, list):
-            for item in obj:
-                check_depth(item, current_depth + 1)
-
-    check_depth(parsed_data)
-    return True
-# ────────────────────────────────────────────────────────────────────────────────
-
-# ── Cache heavy JSON operations ─────────────────────────────────────────────────
-@st.cache_data(show_spinner=False)
-def format_json(data: str, indent: int, sort_keys: bool, ensure_ascii: bool) -> str:
-    json_security_check(data)
-    parsed = json.loads(data)
-    return json.dumps(parsed, indent=indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii)
-
-@st.cache_data(show_spinner=False)
-def minify_json(data: str) -> str:
-    json_security_check(data)
-    parsed = json.loads(data)
-    return json.dumps(parsed, separators=(',', ':'))
-# ────────────────────────────────────────────────────────────────────────────────
+# ── Cache heavy JSON operations ───────────────────────────────────────────────
+format_json = cached("json")(_core.format_json)
+minify_json = cached("json")(_core.minify_json)
+# Flattening consumes a stream, so it is timed but not cached
+flatten_to_csv = timed("json")(_core.flatten_to_csv)
+# ──────────────────────────────────────────────────────────────────────────────
 
 def render():
     setup_page(
@@ -85,7 +55,7 @@ def render():
                 formatted = format_json(raw_json, indent, sort_keys, ensure_ascii)
                 st.success("✅ Valid JSON!")
                 show_result(formatted, language="json")
-                st.download_button(
+                download_result(
                     label="📥 Download JSON",
                     data=formatted,
                     file_name="formatted.json",
@@ -104,7 +74,7 @@ def render():
             minified = minify_json(raw_json)
             st.success("✅ JSON Minified!")
             show_result(minified, language="json")
-            st.download_button(
+            download_result(
                 label="📥 Download Minified",
                 data=minified,
                 file_name="minified.json",
@@ -113,4 +83,60 @@ def render():
         except Exception as e:
             st.error(f"❌ Error Minifying JSON: {e}")
 
+    # Flatten a JSON array or NDJSON export to CSV/TSV, streamed record by record
+    st.markdown("---")
+    st.subheader("📊 Flatten to CSV / TSV")
+    flat_source = st.radio("Records from:", ["Paste JSON", "Upload File"], horizontal=True, key="flatten_source")
+    flat_text, flat_upload = "", None
+    if flat_source == "Paste JSON":
+        flat_text = st.text_area(
+            "Paste a JSON array of objects, or NDJSON (one object per line):", height=150,
+            placeholder='[{"id": 1, "user": {"name": "Alice"}}, {"id": 2, "user": {"name": "Bob"}}]',
+            key="flatten_paste"
+        )
+    else:
+        flat_upload = handle_file_upload(
+            ["json", "ndjson", "jsonl", "txt"], max_mb=200, as_upload=True, key="flatten_upload"
+        )
+    col1, col2 = st.columns(2)
+    with col1:
+        out_format = st.selectbox("Output format:", ["CSV", "TSV"], key="flatten_format")
+    with col2:
+        sample_size = st.number_input(
+            "Records sampled for columns:", min_value=1, max_value=100_000, value=FLATTEN_SAMPLE_RECORDS
+        )
+
+    if st.button("📊 Flatten", use_container_width=True):
+        if flat_upload is None and not flat_text.strip():
+            st.error("❌ Please paste JSON or upload a file.")
+        else:
+            chunks = flat_upload.iter_text() if flat_upload else [flat_text]
+            delimiter = "," if out_format == "CSV" else "\t"
+            try:
+                out, columns, count, late, preview = flatten_to_csv(chunks, delimiter, sample_size)
+            except UnicodeDecodeError:
+                st.error(f"❌ Unable to decode file as {flat_upload.encoding}. Please save it as UTF-8.")
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                st.success(f"✅ Flattened {count:,} records into {len(columns)} columns")
+                if late:
+                    names = ", ".join(list(late)[:10]) + (", ..." if len(late) > 10 else "")
+                    st.warning(
+                        f"⚠️ {len(late)} fields first appear after the sampled records and were left out: "
+                        f"{names}. Increase the sample to include them."
+                    )
+                st.dataframe(
+                    [{c: "" if row.get(c) is None else str(row[c]) for c in columns} for row in preview],
+                    use_container_width=True
+                )
+                if count > len(preview):
+                    st.caption(f"Showing the first {len(preview)} records. Download for the full table.")
+                download_result(
+                    f"📥 Download {out_format}",
+                    out,
+                    f"flattened.{out_format.lower()}",
+                    "text/csv" if out_format == "CSV" else "text/tab-separated-values"
+                )
+
     # add_footer()
@@ -1,37 +1,19 @@
 import streamlit as st
-import markdown2
-import bleach
-from utils.common import setup_page, show_result, handle_file_upload, validate_input, add_footer
+import os
+import time
+import tarfile
+import zipfile
+from core import markdown_converter as _core
+from utils.cache import cached
+from utils.metrics import timed
+from utils.common import setup_page, show_result, download_result, handle_file_upload, validate_input, add_footer
 
-# ── HTML Sanitization ──────────────────────────────────────────────────────────
-ALLOWED_TAGS = [
-    'p', 'br', 'strong', 'em', 'u', 'strike',
-    'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-    'ul', 'ol', 'li', 'blockquote', 'code', 'pre',
-    'a', 'img', 'table', 'thead', 'tbody', 'tr', 'td', 'th'
-]
-ALLOWED_ATTRS = {
-    'a': ['href', 'title', 'target', 'rel'],
-    'img': ['src', 'alt', 'title', 'width', 'height'],
-    'code': ['class']
-}
-
-def sanitize_html(html: str) -> str:
-    """
-    Clean HTML to remove disallowed tags and attributes, preventing XSS.
-    """
-    return bleach.clean(
-        html,
-        tags=ALLOWED_TAGS,
-        attributes=ALLOWED_ATTRS,
-        strip=True
-    )
-# ────────────────────────────────────────────────────────────────────────────────
-
-@st.cache_data(show_spinner=False)
-def convert_markdown_to_html(md_text: str) -> str:
-    """Convert Markdown text to HTML."""
-    return markdown2.markdown(md_text)
+# ── Cache whole-document conversion ───────────────────────────────────────────
+convert_markdown_to_html = cached("markdown")(_core.convert_markdown_to_html)
+# Block-level and archive conversion keep their own caches; only time them
+convert_markdown_incremental = timed("markdown")(_core.convert_markdown_incremental)
+convert_archive = timed("markdown")(_core.convert_archive)
+# ──────────────────────────────────────────────────────────────────────────────
 
 def render():
     setup_page(
@@ -43,19 +25,53 @@ def render():
 
     # Wrap inputs and buttons in a form so buttons are always visible
     with st.form("md_form", clear_on_submit=False):
-        method = st.radio("Input method:", ["Paste Markdown", "Upload File"], key="md_method")
+        method = st.radio("Input method:", ["Paste Markdown", "Upload File", "Upload Archive"], key="md_method")
         if method == "Paste Markdown":
             raw_md = st.text_area(
                 "Enter Markdown content:", height=200,
                 placeholder="# Title\n\nSome **bold** text.", key="md_paste"
             )
-        else:
+        elif method == "Upload File":
             content = handle_file_upload(["md", "txt"], max_mb=10)
             if content:
                 raw_md = content
+        else:
+            st.caption("Zip or tar of .md files. Relative .md links are rewritten to .html.")
+            archive = handle_file_upload(["zip", "tar", "tgz"], max_mb=200, raw=True)
 
         convert_btn = st.form_submit_button("🔄 Convert to HTML")
 
+    if convert_btn and method == "Upload Archive":
+        if archive is None:
+            st.error("❌ Please upload a .zip, .tar or .tgz archive before converting.")
+            return
+        try:
+            with st.spinner(f"Converting on {os.cpu_count() or 1} worker processes..."):
+                start = time.perf_counter()
+                bundle, report = convert_archive(archive.read())
+                elapsed = time.perf_counter() - start
+        except (ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+            st.error(f"❌ {e}")
+            return
+
+        failed = [row for row in report if row["status"] != "ok"]
+        if not report:
+            st.warning("🔍 No .md files found in the archive.")
+        elif failed:
+            st.warning(f"⚠️ Converted {len(report) - len(failed)} of {len(report)} files in {elapsed:.1f}s")
+        else:
+            st.success(f"✅ Converted {len(report)} files in {elapsed:.1f}s")
+        if report:
+            st.dataframe(sorted(report, key=lambda row: (row["status"] == "ok", -row["ms"])),
+                         use_container_width=True)
+        download_result(
+            label="📥 Download HTML (.zip)",
+            data=bundle,
+            file_name="converted_html.zip",
+            mime="application/zip"
+        )
+        return
+
     if convert_btn:
         if not raw_md or not raw_md.strip():
             st.error("❌ Please enter or upload some Markdown before converting.")
@@ -65,11 +81,10 @@ def render():
                 st.error(f"❌ {msg}")
             else:
                 try:
-                    raw_html = convert_markdown_to_html(raw_md)
-                    clean_html = sanitize_html(raw_html)
+                    clean_html = convert_markdown_incremental(raw_md)
                     st.success("✅ Conversion successful!")
                     show_result(clean_html, language="html")
-                    st.download_button(
+                    download_result(
                         label="📥 Download HTML",
                         data=clean_html,
                         file_name="converted.html",
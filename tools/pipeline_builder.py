@@ -0,0 +1,90 @@
+import streamlit as st
+from core import pipeline as _core
+from core.pipeline import INPUT, OPERATIONS, TEMPLATES, StepError
+from utils.metrics import timed
+from utils.uploads import BinaryUploadError
+from utils.common import setup_page, show_result, download_result, handle_file_upload, add_footer
+
+# ── Instrument pipeline runs (intermediate steps keep their own cache) ────────
+run_pipeline = timed("pipeline")(_core.run_pipeline)
+run_bulk = timed("pipeline")(_core.run_bulk)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def render():
+    setup_page(
+        "🧩 Pipeline Builder",
+        "Chain tools together; intermediate results stay in memory and are reused when later steps change."
+    )
+
+    # 1. Steps: start from a template, then edit, add or remove rows
+    template = st.selectbox("Start from:", list(TEMPLATES))
+    steps = st.data_editor(
+        TEMPLATES[template],
+        key=f"pipeline_steps_{template}",
+        num_rows="dynamic",
+        use_container_width=True,
+        column_config={
+            "id": st.column_config.TextColumn("Step id", required=True),
+            "op": st.column_config.SelectboxColumn("Operation", options=list(OPERATIONS), required=True),
+            "param": st.column_config.TextColumn("Parameter"),
+            "input": st.column_config.TextColumn(f"Reads from ('{INPUT}' or a step id)", default=INPUT),
+        },
+    )
+    with st.expander("ℹ️ Operations"):
+        st.markdown("\n".join(
+            f"- **{name}**{f' (*{param}*)' if param else ''}: {description}"
+            for name, (_, param, _, description) in OPERATIONS.items()
+        ))
+        st.caption("Scalar operations applied to a list (e.g. regex matches) run on each element.")
+
+    # 2. Input
+    mode = st.radio("Run on:", ["Single input", "Bulk (one item per line)"], horizontal=True)
+    text = st.text_area("Input:", height=150, placeholder="Paste a value, or one value per line in bulk mode")
+    upload = None
+    if mode != "Single input":
+        upload = handle_file_upload(["txt", "csv", "log"], max_mb=200, as_upload=True)
+
+    if not st.button("▶️ Run Pipeline", use_container_width=True):
+        return
+    if upload is None and not text.strip():
+        st.error("❌ Please enter some input.")
+        return
+
+    # 3. Run
+    if mode == "Single input":
+        try:
+            values, reused = run_pipeline(steps, text.strip())
+        except (StepError, ValueError) as e:
+            st.error(f"❌ {e}")
+            return
+        st.success(f"✅ Ran {len(values)} steps ({reused} reused from cache)")
+        outputs = set(_core.leaf_ids(steps))
+        for step_id, value in values.items():
+            with st.expander(f"{'📤' if step_id in outputs else '↪️'} {step_id}", expanded=step_id in outputs):
+                rendered, language = _core.render_value(value)
+                show_result(rendered, language=language, key=f"pipeline_page_{step_id}")
+    else:
+        lines = upload.iter_lines(errors="replace") if upload else text.splitlines()
+        try:
+            out, ok, failed, errors, preview = run_bulk(steps, lines)
+        except (BinaryUploadError, ValueError) as e:
+            st.error(f"❌ {e}")
+            return
+        st.success(f"✅ Processed {ok:,} items" + (f", {failed:,} failed" if failed else ""))
+        for lineno, message in errors[:10]:
+            st.error(f"❌ Line {lineno}: {message}")
+        if preview:
+            show_result("\n".join(preview), language="json")
+            if ok > len(preview):
+                st.caption(f"Showing the first {len(preview)} results. Download for the full list.")
+        download_result(
+            "📥 Download results (.ndjson)",
+            out,
+            "pipeline_results.ndjson",
+            "application/x-ndjson"
+        )
+
+    # add_footer()
+
+if __name__ == "__main__":
+    render()
@@ -1,25 +1,14 @@
 import streamlit as st
 import re
-import json
-import time
-import signal
-from utils.common import setup_page, show_result, handle_file_upload, add_footer
+import io
+from core.regex_tester import RegexTimeoutError, FINDALL_INLINE_MAX_CHARS, SUB_PREVIEW_LIMIT, format_sub_preview, timed_findall
+from core import regex_tester as _core
+from utils.metrics import timed
+from utils.uploads import BinaryUploadError
+from utils.common import setup_page, show_result, download_result, handle_file_upload, add_footer, submit_job, show_job, clear_job
 
-# ── ReDoS Protection ─────────────────────────────────────────────────────────
-class RegexTimeoutError(Exception):
-    pass
-
-def _timeout_handler(signum, frame):
-    raise RegexTimeoutError("Regex execution timed out (complex pattern)")
-
-def safe_findall(pattern: str, text: str, flags=0, timeout: int = 5):
-    signal.signal(signal.SIGALRM, _timeout_handler)
-    signal.alarm(timeout)
-    try:
-        compiled = re.compile(pattern, flags)
-        return compiled.findall(text)
-    finally:
-        signal.alarm(0)
+# ── Instrument substitution (results depend on timeouts, so not cached) ───────
+stream_sub = timed("regex")(_core.stream_sub)
 # ──────────────────────────────────────────────────────────────────────────────
 
 def render():
@@ -67,29 +56,103 @@ def render():
         else:
             flags = re.IGNORECASE if ignore_case else 0
             try:
-                if global_match:
+                compiled = re.compile(pattern, flags)
+            except re.error as e:
+                st.error(f"❌ Invalid pattern: {e}")
+            else:
+                if global_match and len(test_string) <= FINDALL_INLINE_MAX_CHARS:
+                    clear_job("regex_job")
                     try:
-                        matches = safe_findall(pattern, test_string, flags)
+                        show_matches(timed_findall(pattern, test_string, flags))
                     except RegexTimeoutError as e:
                         st.error(f"❌ {e}")
-                        return
-                    if matches:
-                        st.success(f"✅ Found {len(matches)} matches!")
-                        for i, m in enumerate(matches, 1):
-                            st.text(f"{i}: {m}")
-                    else:
-                        st.warning("🔍 No matches found!")
+                elif global_match:
+                    # A single item: the worker's main thread can arm safe_findall's SIGALRM timeout
+                    submit_job("regex_job", "regex", _core.safe_findall, [pattern], test_string, flags, batch_size=1)
                 else:
-                    match = re.compile(pattern, flags).search(test_string)
+                    match = compiled.search(test_string)
                     if match:
                         st.success(f"✅ Match: {match.group()}")
                         st.text(f"Position: {match.start()}–{match.end()}")
                     else:
                         st.warning("🔍 No match found!")
+
+    # Find All on a long test string runs in the background; reruns and reloads reattach to the same job
+    if global_match:
+        job = show_job("regex_job")
+        if job and job.done:
+            if job.errors:
+                st.error(f"❌ {job.errors[0][1]}")
+            else:
+                show_matches(job.results[0])
+
+    # Find & Replace (re.sub) over the test string or a streamed file
+    st.markdown("---")
+    st.subheader("🔁 Find & Replace")
+    replacement = st.text_input(
+        "Replacement:",
+        value="",
+        placeholder=r"\1, \g<name> or plain text",
+    )
+    source = st.radio("Apply to:", ["Test String", "Upload File"], horizontal=True)
+    upload = None
+    if source == "Upload File":
+        upload = handle_file_upload(["txt", "csv", "md", "json", "log", "xml", "html"], max_mb=200, as_upload=True)
+    preview_limit = st.number_input(
+        "Changes to preview:", min_value=1, max_value=500, value=SUB_PREVIEW_LIMIT
+    )
+
+    if st.button("🔁 Replace All", use_container_width=True):
+        if not pattern:
+            st.error("❌ Please enter a regex pattern!")
+        elif source == "Upload File" and upload is None:
+            st.error("❌ Please upload a file!")
+        elif source == "Test String" and not test_string:
+            st.error("❌ Please enter test text!")
+        else:
+            flags = re.IGNORECASE if ignore_case else 0
+            if upload is not None:
+                stream, encoding = upload.open_binary(), upload.encoding
+            else:
+                stream, encoding = io.BytesIO(test_string.encode("utf-8")), "utf-8"
+            try:
+                if encoding is None:
+                    raise BinaryUploadError(f"{upload.name} looks like a binary file, not text.")
+                out, total, changed, preview = stream_sub(
+                    pattern, replacement, stream, flags, preview_limit=preview_limit, encoding=encoding
+                )
             except re.error as e:
-                st.error(f"❌ Invalid pattern: {e}")
+                st.error(f"❌ Invalid pattern or replacement: {e}")
+            except RegexTimeoutError as e:
+                st.error(f"❌ {e}")
+            except BinaryUploadError as e:
+                st.error(f"❌ {e}")
+            except UnicodeDecodeError:
+                st.error(f"❌ Unable to decode file as {encoding}. Please save it as UTF-8.")
+            else:
+                if total:
+                    st.success(f"✅ {total} substitutions made!")
+                    show_result(format_sub_preview(preview), language="diff")
+                    if changed > len(preview):
+                        st.caption(f"Showing the first {len(preview)} of {changed:,} changed lines.")
+                else:
+                    st.warning("🔍 No matches found!")
+                file_name = getattr(upload, "name", "result.txt")
+                download_result(
+                    "📥 Download Result",
+                    out,
+                    f"replaced_{file_name}",
+                    "text/plain"
+                )
 
     add_footer()
 
+def show_matches(matches):
+    if matches:
+        st.success(f"✅ Found {len(matches)} matches!")
+        show_result("\n".join(f"{i}: {m}" for i, m in enumerate(matches, 1)))
+    else:
+        st.warning("🔍 No matches found!")
+
 if __name__ == "__main__":
     render()
@@ -1,24 +1,16 @@
 import streamlit as st
-from utils.common import setup_page, show_result, add_footer
+from core.robots_generator import RobotsMatcher
+from core import robots_generator as _core
+from utils.cache import cached
+from utils.metrics import timed
+from utils.uploads import BinaryUploadError
+from utils.common import setup_page, show_result, download_result, handle_file_upload, add_footer
 
 # ── Cache robots.txt generation ───────────────────────────────────────────────
-@st.cache_data(show_spinner=False)
-def generate_robots(agents: list[str], disallow_paths: list[str], allow_paths: list[str], crawl_delay: str) -> str:
-    """
-    Generate robots.txt content based on user-agents, disallow/allow paths, and optional crawl-delay.
-    """
-    lines = []
-    for ua in agents:
-        lines.append(f"User-agent: {ua}")
-        for path in disallow_paths:
-            lines.append(f"Disallow: {path}")
-        for path in allow_paths:
-            lines.append(f"Allow: {path}")
-        if crawl_delay.isdigit():
-            lines.append(f"Crawl-delay: {crawl_delay}")
-        lines.append("")  # blank line between agents
-    return "\n".join(lines).strip()
-# ────────────────────────────────────────────────────────────────────────────────
+generate_robots = cached("robots")(_core.generate_robots)
+check_urls_to_csv = timed("robots")(_core.check_urls_to_csv)
+synthesize_robots = timed("robots")(_core.synthesize_robots)
+# ──────────────────────────────────────────────────────────────────────────────
 
 def render():
     # 1. Header
@@ -27,36 +19,115 @@ def render():
         "Create a robots.txt to control crawler access."
     )
 
-    # 2. Settings
-    user_agents_input = st.text_area(
-        "User-agent(s) (one per line):", height=100,
-        placeholder="*\nGooglebot"
-    )
-    disallow_input = st.text_area(
-        "Disallow paths (one per line):", height=100,
-        placeholder="/admin\n/private"
-    )
-    allow_input = st.text_area(
-        "Allow paths (one per line):", height=100,
-        placeholder="/public"
-    )
-    crawl_delay = st.text_input("Crawl-delay (seconds):", "")
-
-    # Parse inputs
-    agents = [ua.strip() for ua in user_agents_input.split("\n") if ua.strip()]
-    disallow_paths = [p.strip() for p in disallow_input.split("\n") if p.strip()]
-    allow_paths = [p.strip() for p in allow_input.split("\n") if p.strip()]
-
-    # 3. Generate
-    if st.button("⚙️ Generate robots.txt"):
-        txt = generate_robots(agents, disallow_paths, allow_paths, crawl_delay)
-        show_result(txt)
-        st.download_button(
-            "📥 Download robots.txt",
-            txt,
-            "robots.txt",
-            "text/plain"
+    mode = st.radio("Mode:", ["Generate robots.txt", "Synthesize from URLs", "Test URLs"])
+
+    if mode == "Generate robots.txt":
+        # 2. Settings
+        user_agents_input = st.text_area(
+            "User-agent(s) (one per line):", height=100,
+            placeholder="*\nGooglebot"
+        )
+        disallow_input = st.text_area(
+            "Disallow paths (one per line):", height=100,
+            placeholder="/admin\n/private"
+        )
+        allow_input = st.text_area(
+            "Allow paths (one per line):", height=100,
+            placeholder="/public"
+        )
+        crawl_delay = st.text_input("Crawl-delay (seconds):", "")
+
+        # Parse inputs
+        agents = [ua.strip() for ua in user_agents_input.split("\n") if ua.strip()]
+        disallow_paths = [p.strip() for p in disallow_input.split("\n") if p.strip()]
+        allow_paths = [p.strip() for p in allow_input.split("\n") if p.strip()]
+
+        # 3. Generate
+        if st.button("⚙️ Generate robots.txt"):
+            txt = generate_robots(agents, disallow_paths, allow_paths, crawl_delay)
+            show_result(txt)
+            download_result(
+                "📥 Download robots.txt",
+                txt,
+                "robots.txt",
+                "text/plain"
+            )
+
+    elif mode == "Synthesize from URLs":
+        # 2. Labeled URL inventory
+        user_agent = st.text_input("User-agent:", "*")
+        inventory = st.text_area(
+            "Labeled URLs (one per line: URL and allow/deny):", height=150,
+            placeholder="/admin/,deny\n/admin/public,allow\nhttps://example.com/blog/draft deny"
+        )
+        upload = handle_file_upload(["txt", "csv", "tsv"], max_mb=200, as_upload=True)
+
+        # 3. Compute the fewest prefix and exact ($) rules and validate them
+        if st.button("🧮 Synthesize robots.txt"):
+            if upload is None and not inventory.strip():
+                st.error("❌ Please enter or upload a labeled URL inventory.")
+                return
+            lines = upload.iter_lines(errors="replace") if upload else inventory.splitlines()
+            try:
+                txt, rules, count, mismatches = synthesize_robots(lines, user_agent.strip() or "*")
+            except ValueError as e:  # includes BinaryUploadError
+                st.error(f"❌ {e}")
+                return
+
+            if mismatches:
+                st.error(f"❌ {len(mismatches):,} URLs are not reproduced: {', '.join(mismatches[:5])}")
+            else:
+                st.success(f"✅ {len(rules):,} rules reproduce all {count:,} labeled URLs")
+                st.caption("No smaller set of prefix and exact-match ($) rules exists; wildcard rules are not searched.")
+            show_result(txt)
+            download_result(
+                "📥 Download robots.txt",
+                txt,
+                "robots.txt",
+                "text/plain"
+            )
+
+    else:
+        # 2. robots.txt under test and the crawl list
+        robots_txt = st.text_area(
+            "robots.txt content:", height=150,
+            placeholder="User-agent: *\nDisallow: /private\nAllow: /private/public\nDisallow: /*.pdf$"
         )
+        user_agent = st.text_input("User-agent to test as:", "*")
+        urls_input = st.text_area(
+            "URLs or paths to test (one per line):", height=150,
+            placeholder="https://example.com/private/page\n/docs/guide.pdf"
+        )
+        upload = handle_file_upload(["txt", "csv"], max_mb=200, as_upload=True)
+
+        # 3. Check every URL
+        if st.button("🧪 Test URLs"):
+            if not robots_txt.strip():
+                st.error("❌ Please paste a robots.txt to test against.")
+                return
+            if upload is None and not urls_input.strip():
+                st.error("❌ Please enter or upload some URLs.")
+                return
+
+            matcher = RobotsMatcher.for_agent(robots_txt, user_agent or "*")
+            urls = upload.iter_lines(errors="replace") if upload else urls_input.splitlines()
+            try:
+                out, allowed, blocked, preview = check_urls_to_csv(matcher, urls)
+            except BinaryUploadError as e:
+                st.error(f"❌ {e}")
+                return
+
+            st.success(f"✅ Tested {allowed + blocked:,} URLs: {allowed:,} allowed, {blocked:,} blocked")
+            if preview:
+                st.dataframe(preview, use_container_width=True)
+                if allowed + blocked > len(preview):
+                    st.caption(f"Showing the first {len(preview)} results. Download for the full list.")
+            download_result(
+                "📥 Download results (.csv)",
+                out,
+                "robots_test_results.csv",
+                "text/csv"
+            )
 
     # 4. Footer
     # add_footer()
@@ -1,30 +1,14 @@
 import streamlit as st
 from datetime import datetime, timezone
 import time
-from utils.common import setup_page, show_result, add_footer
+from core import timestamp_converter as _core
+from utils.cache import cached
+from utils.common import setup_page, show_result, add_footer, submit_job, show_job
 
-# ── Cache timestamp conversions ────────────────────────────────────────────────
-@st.cache_data(show_spinner=False)
-def ts_to_date(ts_value: float, fmt: str, tz_str: str) -> str:
-    """Convert Unix timestamp (seconds or ms) to formatted date string."""
-    if ts_value > 1e12:
-        ts_value /= 1000
-    tz = timezone.utc if tz_str == "UTC" else None
-    dt = datetime.fromtimestamp(ts_value, tz=tz)
-    return dt.isoformat() if fmt == "ISO 8601" else dt.strftime(fmt)
-
-@st.cache_data(show_spinner=False)
-def date_to_ts(date_str: str, tz_str: str) -> int:
-    """Convert date string to Unix timestamp (seconds)."""
-    # Handle ISO vs space-separated format
-    if "T" in date_str:
-        dt = datetime.fromisoformat(date_str)
-    else:
-        dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-    if tz_str == "UTC":
-        dt = dt.replace(tzinfo=timezone.utc)
-    return int(dt.timestamp())
-# ────────────────────────────────────────────────────────────────────────────────
+# ── Cache timestamp conversions ───────────────────────────────────────────────
+ts_to_date = cached("timestamp")(_core.ts_to_date)
+date_to_ts = cached("timestamp")(_core.date_to_ts)
+# ──────────────────────────────────────────────────────────────────────────────
 
 def render():
     # 1. Header
@@ -64,22 +48,16 @@ def render():
         direction = st.selectbox("Direction:", ["→ Date", "→ Timestamp"])
         if st.button("🔄 Bulk Convert"):
             lines = [l.strip() for l in text.split("\n") if l.strip()]
-            results, errors = [], []
-            for i, line in enumerate(lines, 1):
-                try:
-                    if direction == "→ Date":
-                        ts_val = float(line)
-                        out = ts_to_date(ts_val, "ISO 8601", "UTC")
-                        results.append(f"{line} → {out}")
-                    else:
-                        ts = date_to_ts(line, "UTC")
-                        results.append(f"{line} → {ts}")
-                except Exception as e:
-                    errors.append(f"Line {i}: {e}")
+            submit_job("timestamp_job", "timestamp", _core.bulk_convert_line, lines, direction)
+
+        # Runs in the background; reruns and reloads reattach to the same job
+        job = show_job("timestamp_job")
+        if job:
+            results = [r for r in job.results[:job.done] if r is not None]
             if results:
                 show_result("\n".join(results))
-            for err in errors:
-                st.error(err)
+            for i, err in job.errors:
+                st.error(f"Line {i + 1}: {err}")
 
     # 3. Sidebar: show current timestamp
     with st.sidebar.expander("🕒 Current Time"):
@@ -1,26 +1,12 @@
 import streamlit as st
-import urllib.parse
-from utils.common import setup_page, show_result, validate_input, add_footer
+from core import url_encoder as _core
+from utils.cache import cached
+from utils.common import setup_page, show_result, download_result, validate_input, add_footer, submit_job, show_job
 
-# ── Cache URL operations ───────────────────────────────────────────────────────
-@st.cache_data(show_spinner=False)
-def encode_url(text: str) -> str:
-    return urllib.parse.quote(text, safe='')
-
-@st.cache_data(show_spinner=False)
-def decode_url(text: str) -> str:
-    return urllib.parse.unquote(text)
-
-@st.cache_data(show_spinner=False)
-def bulk_process(lines: list[str], direction: str) -> list[str]:
-    results = []
-    for line in lines:
-        if direction == "Encode":
-            results.append(f"{line} → {urllib.parse.quote(line, safe='')}")
-        else:
-            results.append(f"{line} → {urllib.parse.unquote(line)}")
-    return results
-# ────────────────────────────────────────────────────────────────────────────────
+# ── Cache URL operations ──────────────────────────────────────────────────────
+encode_url = cached("url")(_core.encode_url)
+decode_url = cached("url")(_core.decode_url)
+# ──────────────────────────────────────────────────────────────────────────────
 
 def render():
     # 1. Header
@@ -42,7 +28,7 @@ def render():
             else:
                 encoded = encode_url(text)
                 show_result(encoded)
-                st.download_button("📥 Download", encoded, "encoded_url.txt", "text/plain")
+                download_result("📥 Download", encoded, "encoded_url.txt", "text/plain")
 
     elif mode == "Decode URL":
         encoded_text = st.text_area("Enter URL-encoded text to decode:", height=150,
@@ -55,7 +41,7 @@ def render():
                 try:
                     decoded = decode_url(encoded_text)
                     show_result(decoded)
-                    st.download_button("📥 Download", decoded, "decoded_url.txt", "text/plain")
+                    download_result("📥 Download", decoded, "decoded_url.txt", "text/plain")
                 except Exception as e:
                     st.error(f"❌ Decoding error: {e}")
 
@@ -68,17 +54,21 @@ def render():
                 st.error("❌ Please enter some text")
             else:
                 lines = [line.strip() for line in bulk_text.split('\n') if line.strip()]
-                results = bulk_process(lines, direction)
+                submit_job("url_job", "url", _core.process_line, lines, direction)
 
-                if results:
-                    st.success(f"✅ Processed {len(results)} items")
-                    show_result('\n'.join(results))
-                    st.download_button(
-                        "📥 Download Results",
-                        '\n'.join(results),
-                        f"bulk_url_{direction.lower()}.txt",
-                        "text/plain"
-                    )
+        # Runs in the background; reruns and reloads reattach to the same job
+        job = show_job("url_job")
+        if job and job.done:
+            results = job.results[:job.done]
+            st.success(f"✅ Processed {len(results)} items")
+            output = '\n'.join(results)
+            show_result(output)
+            download_result(
+                "📥 Download Results",
+                output,
+                f"bulk_url_{job.args[0].lower()}.txt",
+                "text/plain"
+            )
 
     # 6. Info box
     with st.expander("ℹ️ About URL Encoding"):
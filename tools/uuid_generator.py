@@ -1,19 +1,11 @@
 import streamlit as st
-import uuid
-from utils.common import setup_page, show_result, add_footer
+from core import uuid_generator as _core
+from utils.cache import cached
+from utils.common import setup_page, show_result, download_result, add_footer
 
-# ── Cache UUID generation when using a seed ────────────────────────────────────
-@st.cache_data(show_spinner=False)
-def generate_uuids(count: int, seed: int | None = None) -> list[str]:
-    """
-    Generate a list of version 4 UUIDs.
-    If seed is provided, uses it to seed the RNG for reproducible results.
-    """
-    if seed is not None:
-        import random
-        random.seed(seed)
-    return [str(uuid.uuid4()) for _ in range(count)]
-# ────────────────────────────────────────────────────────────────────────────────
+# ── Cache UUID generation when using a seed ───────────────────────────────────
+generate_uuids = cached("uuid", seed_arg="seed")(_core.generate_uuids)
+# ──────────────────────────────────────────────────────────────────────────────
 
 def render():
     # 1. Header
@@ -38,7 +30,7 @@ def render():
         uuids = generate_uuids(count, seed)
         result = "\n".join(uuids)
         show_result(result)
-        st.download_button(
+        download_result(
             label="📥 Download as TXT",
             data=result,
             file_name=f"{count}_uuids.txt",
@@ -0,0 +1,207 @@
+"""
+Shared, byte-bounded result cache for tool functions.
+
+Each tool gets its own LRU namespace with a memory budget. Entries are sized
+when stored; results larger than the namespace's item limit are returned but
+never cached, and the least recently used entries are evicted once the
+budget is exceeded. Cached values are shared, not copied: callers must treat
+them as read-only.
+
+Budgets default to CACHE_BUDGETS_MB and can be overridden per tool with
+DEVTOOLS_CACHE_MB_<TOOL> (e.g. DEVTOOLS_CACHE_MB_JSON=128) or for every tool
+without an explicit budget with DEVTOOLS_CACHE_MB.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+from utils.metrics import timed
+from utils.result_store import get_store
+
+DEFAULT_BUDGET_MB = 16
+CACHE_BUDGETS_MB = {
+    "json": 64,
+    "base64": 64,
+    "markdown": 64,
+    "color": 32,
+}
+ITEM_FRACTION = 4  # a single result may use at most 1/4 of its tool's budget
+
+def estimate_size(value) -> int:
+    """Approximate retained size in bytes of a cached result."""
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        nbytes = getattr(obj, "nbytes", None)  # NumPy arrays
+        if isinstance(nbytes, int):
+            total += nbytes + 112
+            continue
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+def make_key(name: str, args: tuple, kwargs: dict) -> bytes:
+    """Content hash of a function name and its arguments."""
+    h = hashlib.blake2b(name.encode(), digest_size=20)
+    h.update(pickle.dumps((args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL))
+    return h.digest()
+
+class ResultCache:
+    """Thread-safe LRU mapping bounded by total estimated bytes."""
+
+    def __init__(self, name: str, max_bytes: int, max_item_bytes: int | None = None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes if max_item_bytes is not None else max_bytes // ITEM_FRACTION
+        self._data = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.skipped = 0
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value) -> bool:
+        """Store value unless it exceeds the item limit; returns whether it was cached."""
+        size = estimate_size(value)
+        with self._lock:
+            if size > self.max_item_bytes:
+                self.skipped += 1
+                return False
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._data[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._data:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "tool": self.name,
+                "entries": len(self._data),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "max_item_bytes": self.max_item_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "skipped_oversize": self.skipped,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+# ── Per-tool registry ─────────────────────────────────────────────────────────
+_caches: dict[str, ResultCache] = {}
+_registry_lock = threading.Lock()
+
+def _budget_bytes(tool: str) -> int:
+    env = os.environ.get(f"DEVTOOLS_CACHE_MB_{tool.upper()}")
+    if env is None and tool not in CACHE_BUDGETS_MB:
+        env = os.environ.get("DEVTOOLS_CACHE_MB")
+    mb = float(env) if env is not None else CACHE_BUDGETS_MB.get(tool, DEFAULT_BUDGET_MB)
+    return int(mb * 1024 * 1024)
+
+def get_cache(tool: str) -> ResultCache:
+    """Return the shared cache namespace for a tool, creating it on first use."""
+    with _registry_lock:
+        cache = _caches.get(tool)
+        if cache is None:
+            cache = _caches[tool] = ResultCache(tool, _budget_bytes(tool))
+        return cache
+
+def cached(tool: str, instrument: bool = True, seed_arg: str | None = None):
+    """
+    Decorator caching a pure function's results in the tool's namespace.
+    When a shared result store is configured (see utils.result_store) it is
+    consulted on a memory miss and written after every computation.
+    Computations (not cache hits) are timed via utils.metrics unless
+    instrument is False, e.g. when the caller already times the whole call.
+    For random generators, seed_arg names the seed parameter: only seeded
+    calls are cached; unseeded calls always compute afresh.
+    Exceptions are not cached.
+    """
+    def decorator(fn):
+        name = f"{tool}:{fn.__module__}.{fn.__qualname__}"
+        compute = timed(tool)(fn) if instrument else fn
+        signature = inspect.signature(fn) if seed_arg else None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if signature is not None and signature.bind(*args, **kwargs).arguments.get(seed_arg) is None:
+                return compute(*args, **kwargs)
+            cache = get_cache(tool)
+            key = make_key(name, args, kwargs)
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            store = get_store()
+            if store is not None:
+                hit, value = store.get(key)
+                if hit:
+                    cache.put(key, value)
+                    return value
+            value = compute(*args, **kwargs)
+            cache.put(key, value)
+            if store is not None:
+                store.put(key, tool, value)
+            return value
+
+        wrapper.cache_tool = tool
+        return wrapper
+    return decorator
+
+def cache_stats() -> list[dict]:
+    """Statistics for every cache namespace, sorted by tool name."""
+    with _registry_lock:
+        caches = sorted(_caches.values(), key=lambda c: c.name)
+    return [c.stats() for c in caches]
+
+def store_stats() -> dict | None:
+    """Statistics for the shared result store, or None when it is disabled."""
+    store = get_store()
+    return store.stats() if store is not None else None
+
+def clear_caches(include_store: bool = False):
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+    store = get_store()
+    if include_store and store is not None:
+        store.clear()
+# ──────────────────────────────────────────────────────────────────────────────
@@ -1,8 +1,15 @@
 import streamlit as st
 import re
 import json
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
 from datetime import datetime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils import jobs
+from utils.uploads import Upload, BinaryUploadError
 
 # ── Content Security Policy ────────────────────────────────────────────────────
 CSP_META = (
@@ -13,7 +20,10 @@ CSP_META = (
     "img-src 'self' data:; "
     "font-src 'self';\">"
 )
-st.markdown(CSP_META, unsafe_allow_html=True)
+
+def inject_csp():
+    """Emit the Content-Security-Policy meta tag. Call once per page run."""
+    st.markdown(CSP_META, unsafe_allow_html=True)
 # ────────────────────────────────────────────────────────────────────────────────
 
 def setup_page(title, description=""):
@@ -29,60 +39,215 @@ def setup_page(title, description=""):
     </div>
     """, unsafe_allow_html=True)
 
-def show_result(result, language="text"):
+# ── Result display ────────────────────────────────────────────────────────────
+PREVIEW_PAGE_CHARS = 20_000      # characters sent to the browser per preview page
+HIGHLIGHT_MAX_CHARS = 200_000    # longer results are previewed without syntax highlighting
+
+def show_result(result, language="text", key=None):
     """
     Display the tool's result in a code block.
     - result: The text to display.
     - language: Syntax highlighting (e.g., 'json', 'html', 'css').
+    - key: Pager widget key, needed when one page shows several large results.
+    Results over PREVIEW_PAGE_CHARS are shown one page at a time, so the
+    browser only receives the current window; pair with download_result()
+    for the full output.
     """
-    st.code(result, language=language)
+    if len(result) <= PREVIEW_PAGE_CHARS:
+        st.code(result, language=language)
+    else:
+        _paged_result(result, None if len(result) > HIGHLIGHT_MAX_CHARS else language, key)
 
-def handle_file_upload(allowed_types=None, max_mb=10):
+@st.fragment
+def _paged_result(result, language, key):
+    # A fragment reruns on its own with the same arguments, so paging keeps
+    # working inside the `if st.button(...)` blocks the tools render results in.
+    pages = -(-len(result) // PREVIEW_PAGE_CHARS)
+    page = st.number_input(f"Preview page (1–{pages:,}):", min_value=1, max_value=pages, value=1, key=key)
+    start = (page - 1) * PREVIEW_PAGE_CHARS
+    end = min(start + PREVIEW_PAGE_CHARS, len(result))
+    st.code(result[start:end], language=language)
+    note = " Syntax highlighting is off for large results." if language is None else ""
+    st.caption(f"Showing characters {start + 1:,}–{end:,} of {len(result):,}.{note} Download for the full output.")
+
+def download_result(label, data, file_name, mime="text/plain", key=None):
+    """
+    Download button whose content is only produced when it is clicked.
+    - data: str or bytes, a seekable file (e.g. a tool's SpooledTemporaryFile,
+      which the button takes ownership of), or a zero-argument callable
+      returning any of those or an iterable of str or bytes chunks.
+    Nothing is encoded or copied into Streamlit's media store on each rerun;
+    the output is generated on the click's own thread. Streamlit needs the
+    whole payload at once, so files are read in full on the click and then
+    closed; a passed-in file's bytes are kept for repeat clicks.
+    """
+    lock = threading.Lock()
+    read_once = []
+
+    def read_and_close(f):
+        try:
+            f.seek(0)
+            return f.read()
+        finally:
+            f.close()
+
+    def generate():
+        if hasattr(data, "read"):
+            with lock:  # clicks can overlap; only the first reads the file
+                if not read_once:
+                    read_once.append(read_and_close(data))
+                return read_once[0]
+        content = data() if callable(data) else data
+        if hasattr(content, "read"):
+            return read_and_close(content)
+        if isinstance(content, (str, bytes)):
+            return content
+        chunks = list(content)
+        return "".join(chunks) if chunks and isinstance(chunks[0], str) else b"".join(chunks)
+
+    st.download_button(label, generate, file_name, mime, key=key)
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Background jobs ───────────────────────────────────────────────────────────
+JOB_POLL_SECONDS = 0.5
+
+def _session_owner() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+def submit_job(key, tool, fn, items, *args, batch_size=jobs.BATCH_SIZE):
+    """
+    Run fn(item, *args) over items on the background job queue.
+    - key: Name the job is remembered under, in session state and in the URL
+      so reruns and page reloads reattach to it.
+    - fn: A module-level (importable) function; it runs in a worker process.
+    """
+    job = jobs.submit(_session_owner(), tool, fn, items, *args, batch_size=batch_size)
+    st.session_state[key] = job.id
+    st.query_params[key] = job.id
+    return job
+
+def show_job(key):
+    """
+    Reattach to the job remembered under key. While it runs, show live
+    progress with a Cancel button and return None; once finished, return
+    the Job so the page can render its results.
+    """
+    job_id = st.session_state.get(key) or st.query_params.get(key)
+    job = jobs.get_job(job_id) if job_id else None
+    if job is None:
+        return None
+    st.session_state[key] = job.id
+    if job.is_finished:
+        if job.status == jobs.CANCELLED:
+            st.warning(f"⏹️ Cancelled after {job.done:,} of {job.total:,} items.")
+        elif job.status == jobs.FAILED:
+            st.error(f"❌ Job failed: {job.error}")
+        return job
+    _job_progress(job.id)
+    return None
+
+def clear_job(key):
+    """Forget the job remembered under key (it keeps running if unfinished)."""
+    st.session_state.pop(key, None)
+    st.query_params.pop(key, None)
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def _job_progress(job_id):
+    job = jobs.get_job(job_id)
+    if job is None or job.is_finished:
+        st.rerun()  # render the results with a full run
+    st.progress(job.progress, text=f"⏳ {job.status.title()}: {job.done:,} of {job.total:,} items")
+    if st.button("⏹️ Cancel", key=f"cancel_{job_id}"):
+        job.cancel()
+# ──────────────────────────────────────────────────────────────────────────────
+
+def handle_file_upload(allowed_types=None, max_mb=10, raw=False, as_upload=False, key=None):
     """
     Secure file uploader with enhanced validation.
     - allowed_types: List of extensions, e.g. ['txt','json'].
     - max_mb: Maximum file size in megabytes.
+    - raw: Return the validated binary file object instead of decoded text.
+    - as_upload: Return a utils.uploads.Upload for zero-copy, chunked or
+      line-by-line access with encoding detection.
+    - key: Widget key, for pages with more than one uploader.
+    Text is decoded in its detected encoding (UTF-8, UTF-16/32 with BOM,
+    Windows-1252); binary files are rejected unless raw or as_upload.
     """
     allowed = allowed_types or ["txt", "json", "csv", "md"]
-    file = st.file_uploader("Or upload a file:", type=allowed)
+    file = st.file_uploader("Or upload a file:", type=allowed, key=key)
 
-    if not file:
+    if not file or not _validate_upload(file, max_mb):
         return None
 
+    if raw:
+        file.seek(0)
+        return file
+
+    upload = Upload.from_buffer(file.name, file)
+    if as_upload:
+        return upload
+
+    try:
+        text = upload.read_text()
+    except BinaryUploadError:
+        st.error("❌ This looks like a binary file. Please upload a text file.")
+        return None
+    except UnicodeDecodeError:
+        st.error(f"❌ Unable to decode file as {upload.encoding}. Please save it as UTF-8.")
+        return None
+    except Exception as e:
+        st.error("❌ Could not read file. Please try again.")
+        logging.error(f"File read error: {str(e)}")
+        return None
+    if upload.encoding not in ("utf-8", "utf-8-sig"):
+        st.caption(f"Decoded {file.name} as {upload.encoding}.")
+    return text
+
+def handle_file_uploads(allowed_types=None, max_mb=200, label="Upload files:", relaxed_names=False):
+    """
+    Multi-file uploader for binary-safe tools.
+    - allowed_types: List of extensions, or None for any file type.
+    - max_mb: Maximum size of each file in megabytes.
+    - relaxed_names: Accept any printable name without path separators
+      (e.g. app-1.2.3.zip, release.tar.gz), for tools that only display names.
+    Returns a list of utils.uploads.Upload; invalid files are reported and skipped.
+    """
+    files = st.file_uploader(label, type=allowed_types, accept_multiple_files=True)
+    return [Upload.from_buffer(f.name, f) for f in files or [] if _validate_upload(f, max_mb, relaxed_names)]
+
+def _validate_upload(file, max_mb, relaxed_names=False) -> bool:
     # Enhanced size validation
     size_mb = file.size / (1024 * 1024)
     if size_mb > max_mb:
         st.error(f"❌ File too large ({size_mb:.1f} MB). Max allowed is {max_mb} MB.")
-        return None
+        return False
 
+    if relaxed_names:
+        # Names are only displayed: reject path separators and control characters
+        if not file.name or len(file.name) > 255 or re.search(r'[/\\\x00-\x1f\x7f]', file.name):
+            st.error("❌ Invalid filename. Names must not contain slashes or control characters.")
+            return False
     # Sanitize filename - only allow alphanumeric, spaces, hyphens, and valid extensions
-    if not re.match(r'^[\w,\s-]+\.[A-Za-z]{1,5}$', file.name):
+    elif not re.match(r'^[\w,\s-]+\.[A-Za-z]{1,5}$', file.name):
         st.error("❌ Invalid filename. Use only letters, numbers, spaces, and hyphens.")
-        return None
+        return False
 
     # Log file upload for monitoring
     logging.info(f"File uploaded: {file.name} ({size_mb:.1f} MB)")
-
-    try:
-        text = file.read().decode("utf-8")
-        return text
-    except UnicodeDecodeError:
-        st.error("❌ Unable to decode file. Ensure it's a valid UTF-8 text file.")
-        return None
-    except Exception as e:
-        st.error("❌ Could not read file. Please try again.")
-        logging.error(f"File read error: {str(e)}")
-        return None
+    return True
 
 def validate_input(text, min_len=1, max_len=1_000_000):
     """
     Validate text input length with enhanced checks.
     Returns (is_valid, message).
     """
-    if not text or not text.strip():
+    if not text:
         return False, "Input cannot be empty."
 
-    stripped_len = len(text.strip())
+    stripped_len = len(text.strip())  # strip() returns text itself when there is nothing to strip
+    if stripped_len == 0:
+        return False, "Input cannot be empty."
     if stripped_len < min_len:
         return False, f"Input too short (min {min_len} chars)."
     if len(text) > max_len:
@@ -103,9 +268,25 @@ def add_footer():
     """, unsafe_allow_html=True)
 
 
-# Initialize logging for security monitoring
-logging.basicConfig(
-    filename='devtools_hub.log',
-    level=logging.INFO,
-    format='%(asctime)s %(levelname)s %(message)s'
-)
+_log_listener = None
+
+def configure_logging(filename='devtools_hub.log'):
+    """
+    Initialize logging for security monitoring.
+    Called by the app entry point rather than at import, so importing
+    helpers never touches the filesystem. Records go through a queue and are
+    written by a background listener thread, so callers never block on disk.
+    Safe to call on every rerun.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    file_handler = logging.FileHandler(filename)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # final layout is applied by file_handler
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
@@ -0,0 +1,212 @@
+"""
+Background jobs for bulk tool operations.
+
+A job applies one module-level function to every item of a list on a shared
+pool of worker processes, so it keeps running across Streamlit reruns and
+never blocks a session's script thread. Pages remember the job ID and
+reattach to it on every rerun (or reload) instead of recomputing.
+
+Scheduling is fair across owners (one per browser session): jobs run in
+batches, and each dispatcher thread takes the next batch from owners in
+round-robin order. After a batch a job goes back to the end of its owner's
+queue, so a million-line job and a ten-line job from another user make
+progress side by side. Cancellation takes effect at the next batch boundary.
+
+Errors are recorded per item, so one bad line does not fail the job.
+Finished jobs are kept in memory for JOB_TTL seconds (at most MAX_JOBS) and,
+when DEVTOOLS_RESULT_STORE is set, in the shared result store, where other
+processes and restarts can find them by ID.
+
+    DEVTOOLS_JOB_WORKERS=4     # worker processes (default: CPU count, at most 4)
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.metrics import observe
+from utils.result_store import get_store
+
+BATCH_SIZE = 500
+JOB_TTL = 3600
+MAX_JOBS = 200
+STORE_TOOL = "jobs"
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+
+def _run_batch(fn, items, args):
+    """Worker-side: apply fn to each item, capturing per-item errors."""
+    out = []
+    for item in items:
+        try:
+            out.append((True, fn(item, *args)))
+        except Exception as e:
+            out.append((False, str(e)))
+    return out
+
+class Job:
+    """One bulk operation: progress, per-item results and errors."""
+
+    def __init__(self, job_id: str, owner: str, tool: str, fn, items: list, args: tuple, batch_size: int):
+        self.id = job_id
+        self.owner = owner
+        self.tool = tool
+        self.total = len(items)
+        self.done = 0
+        self.results = [None] * self.total
+        self.errors: list[tuple[int, str]] = []   # (0-based item index, message)
+        self.status = QUEUED
+        self.error = ""                           # set when the job as a whole failed
+        self.created = time.time()
+        self.finished: float | None = None
+        self.args = args
+        self._fn, self._items = fn, items
+        self._batch_size = batch_size
+        self._cancelled = threading.Event()
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (DONE, CANCELLED, FAILED)
+
+    def cancel(self):
+        """Stop at the next batch boundary; finished items are kept."""
+        self._cancelled.set()
+
+    def __getstate__(self):
+        # Only the outcome is persisted; work and synchronization stay behind
+        state = self.__dict__.copy()
+        for name in ("_fn", "_items", "_cancelled"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._fn = self._items = None
+        self._cancelled = threading.Event()
+
+class JobQueue:
+    """Process pool fed batch by batch, round-robin across owners."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._cond = threading.Condition()
+        self._queues: OrderedDict[str, deque] = OrderedDict()   # owner -> runnable jobs
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def submit(self, owner: str, tool: str, fn, items, *args, batch_size: int = BATCH_SIZE) -> Job:
+        """Queue fn(item, *args) for every item. fn must be importable by the workers."""
+        job = Job(uuid.uuid4().hex, owner, tool, fn, list(items), args, batch_size)
+        with self._cond:
+            self._start()
+            self._prune()
+            self._jobs[job.id] = job
+            self._queues.setdefault(owner, deque()).append(job)
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._cond:
+            job = self._jobs.get(job_id)
+        if job is None and (store := get_store()) is not None:
+            found, job = store.get(_store_key(job_id))
+            if not found:
+                return None
+        return job
+
+    def _start(self):
+        if self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        for i in range(self.workers):
+            threading.Thread(target=self._dispatch, name=f"job-dispatcher-{i}", daemon=True).start()
+
+    def _next(self) -> Job:
+        with self._cond:
+            while not self._queues:
+                self._cond.wait()
+            owner, queue = next(iter(self._queues.items()))
+            job = queue.popleft()
+            if queue:
+                self._queues.move_to_end(owner)
+            else:
+                del self._queues[owner]
+            return job
+
+    def _dispatch(self):
+        while True:
+            job = self._next()
+            if job._cancelled.is_set():
+                self._finish(job, CANCELLED)
+                continue
+            job.status = RUNNING
+            start = job.done
+            stop = min(start + job._batch_size, job.total)
+            try:
+                batch = self._pool.submit(_run_batch, job._fn, job._items[start:stop], job.args).result()
+            except Exception as e:  # the pool itself failed (unpicklable input, dead worker)
+                job.error = f"{type(e).__name__}: {e}"
+                self._finish(job, FAILED)
+                continue
+            for i, (ok, value) in enumerate(batch, start):
+                if ok:
+                    job.results[i] = value
+                else:
+                    job.errors.append((i, value))
+            job.done = stop
+            if job._cancelled.is_set():
+                self._finish(job, CANCELLED)
+            elif job.done >= job.total:
+                self._finish(job, DONE)
+            else:
+                with self._cond:
+                    self._queues.setdefault(job.owner, deque()).append(job)
+                    self._cond.notify()
+
+    def _finish(self, job: Job, status: str):
+        job._fn = job._items = None
+        job.finished = time.time()
+        job.status = status
+        observe(job.tool, "job", job.finished - job.created, 0, status == FAILED)
+        if (store := get_store()) is not None:
+            store.put(_store_key(job.id), STORE_TOOL, job)
+        logging.info(f"Job {job.id} ({job.tool}) {status}: {job.done}/{job.total} items, {len(job.errors)} errors")
+
+    def _prune(self):
+        """Drop expired finished jobs, then the oldest finished ones over MAX_JOBS."""
+        cutoff = time.time() - JOB_TTL
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        excess = len(self._jobs) - MAX_JOBS + 1
+        for job in finished:
+            if job.finished < cutoff or excess > 0:
+                del self._jobs[job.id]
+                excess -= 1
+
+def _store_key(job_id: str) -> bytes:
+    return f"job:{job_id}".encode()
+
+_queue: JobQueue | None = None
+_queue_lock = threading.Lock()
+
+def get_queue() -> JobQueue:
+    """The process-wide job queue; worker processes start on the first submit."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            workers = int(os.environ.get("DEVTOOLS_JOB_WORKERS") or min(4, os.cpu_count() or 1))
+            _queue = JobQueue(max(1, workers))
+        return _queue
+
+def submit(owner: str, tool: str, fn, items, *args, batch_size: int = BATCH_SIZE) -> Job:
+    return get_queue().submit(owner, tool, fn, items, *args, batch_size=batch_size)
+
+def get_job(job_id: str) -> Job | None:
+    return get_queue().get(job_id)
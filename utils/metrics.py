@@ -0,0 +1,176 @@
+"""
+Hot-path instrumentation for tool functions.
+
+Every tool operation records a latency histogram, an input-size histogram,
+an input byte counter and an error counter, labelled by tool and operation.
+Recording is one lock acquisition and two bisects per call. The registry is
+rendered in the Prometheus text exposition format by render_prometheus(),
+served at /metrics by the API and, for Streamlit, by start_metrics_server()
+when DEVTOOLS_METRICS_PORT is set.
+
+Metrics are per process: API worker processes are measured from the parent
+around each dispatch, so /metrics includes pool queueing and pickling time.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from utils import profiling
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 16 * 1024, 128 * 1024, 1024 ** 2, 8 * 1024 ** 2, 64 * 1024 ** 2)
+
+def input_size(args) -> int:
+    """Cheap size estimate of call arguments: lengths of text, bytes and sequences of them."""
+    total = 0
+    for arg in args:
+        if isinstance(arg, (str, bytes, bytearray, memoryview)):
+            total += len(arg)
+        elif isinstance(arg, (list, tuple)):
+            total += input_size(arg)
+    return total
+
+class _Series:
+    __slots__ = ("latency", "sizes", "latency_sum", "count", "bytes", "errors")
+
+    def __init__(self):
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sizes = [0] * (len(SIZE_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.count = 0
+        self.bytes = 0
+        self.errors = 0
+
+_series: dict[tuple[str, str], _Series] = {}
+_lock = threading.Lock()
+
+def observe(tool: str, op: str, seconds: float, size: int = 0, error: bool = False):
+    """Record one completed operation."""
+    with _lock:
+        s = _series.get((tool, op))
+        if s is None:
+            s = _series[(tool, op)] = _Series()
+        s.latency[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        s.sizes[bisect_left(SIZE_BUCKETS, size)] += 1
+        s.latency_sum += seconds
+        s.count += 1
+        s.bytes += size
+        s.errors += error
+
+@contextmanager
+def track(tool: str, op: str, size: int = 0):
+    """Time the enclosed block as one operation; exceptions are counted and re-raised."""
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        observe(tool, op, time.perf_counter() - start, size, error)
+
+def timed(tool: str, op: str | None = None):
+    """
+    Decorator recording latency and input size of every call, and its memory
+    profile when utils.profiling is enabled.
+    """
+    def decorator(fn):
+        name = op or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            error = False
+            try:
+                if profiling.is_enabled():
+                    return profiling.profile_call(tool, name, fn, args, kwargs, input_size(args))
+                return fn(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                observe(tool, name, time.perf_counter() - start, input_size(args), error)
+        return wrapper
+    return decorator
+
+def snapshot() -> list[dict]:
+    """Per tool/operation summary: calls, errors, bytes and mean latency."""
+    with _lock:
+        items = sorted(_series.items())
+        return [
+            {
+                "tool": tool, "op": op, "calls": s.count, "errors": s.errors,
+                "input_bytes": s.bytes,
+                "mean_ms": round(s.latency_sum / s.count * 1000, 3) if s.count else 0.0,
+                "total_s": round(s.latency_sum, 3),
+            }
+            for (tool, op), s in items
+        ]
+
+def _histogram(lines, name, labels, buckets, counts, total, count):
+    cumulative = 0
+    for bound, n in zip(buckets, counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {total}")
+    lines.append(f"{name}_count{{{labels}}} {count}")
+
+def render_prometheus() -> str:
+    """All series in the Prometheus text exposition format (version 0.0.4)."""
+    with _lock:
+        items = sorted((key, (list(s.latency), list(s.sizes), s.latency_sum, s.count, s.bytes, s.errors))
+                       for key, s in _series.items())
+    latency = ["# HELP devtools_tool_duration_seconds Tool operation latency.",
+               "# TYPE devtools_tool_duration_seconds histogram"]
+    sizes = ["# HELP devtools_tool_input_size_bytes Input size per tool operation.",
+             "# TYPE devtools_tool_input_size_bytes histogram"]
+    counters = ["# HELP devtools_tool_input_bytes_total Input bytes processed.",
+                "# TYPE devtools_tool_input_bytes_total counter"]
+    errors = ["# HELP devtools_tool_errors_total Tool operations that raised.",
+              "# TYPE devtools_tool_errors_total counter"]
+    for (tool, op), (lat, size_counts, lat_sum, count, nbytes, nerrors) in items:
+        labels = f'tool="{tool}",op="{op}"'
+        _histogram(latency, "devtools_tool_duration_seconds", labels, LATENCY_BUCKETS, lat, lat_sum, count)
+        _histogram(sizes, "devtools_tool_input_size_bytes", labels, SIZE_BUCKETS, size_counts, nbytes, count)
+        counters.append(f"devtools_tool_input_bytes_total{{{labels}}} {nbytes}")
+        errors.append(f"devtools_tool_errors_total{{{labels}}} {nerrors}")
+    return "\n".join(latency + sizes + counters + errors) + "\n"
+
+def reset():
+    with _lock:
+        _series.clear()
+
+# ── Standalone exporter ───────────────────────────────────────────────────────
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(port: int, host: str = "0.0.0.0"):
+    """Serve /metrics from a daemon thread; repeated calls are no-ops."""
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return _server
+# ──────────────────────────────────────────────────────────────────────────────
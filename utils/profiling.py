@@ -0,0 +1,111 @@
+"""
+Opt-in tracemalloc profiling of tool invocations.
+
+When enabled (DEVTOOLS_PROFILE_MEMORY=1, or set_enabled(True) from the
+operator-only sidebar panel), every call going through utils.metrics.timed
+records its peak traced memory, the memory it retained, and the top
+allocation sites of that retained memory. Records are logged and kept in a bounded in-memory list.
+
+tracemalloc is process-wide, so profiled calls are serialized with a lock
+and tracing slows allocation-heavy code several times over: this is a
+diagnostic mode, not something to leave on in production.
+"""
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+TRACE_FRAMES = 8
+TOP_SITES = 5
+MAX_RECORDS = 200
+
+_enabled = os.environ.get("DEVTOOLS_PROFILE_MEMORY", "").lower() in ("1", "true", "yes")
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_active = threading.local()  # set while a profiled call runs, so nested calls pass through
+_SKIP_FILES = (tracemalloc.__file__, __file__)
+
+def is_enabled() -> bool:
+    return _enabled
+
+def set_enabled(enabled: bool):
+    """Turn profiling on or off; tracing stops when it is turned off."""
+    global _enabled
+    with _lock:
+        _enabled = enabled
+        if not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+def measure_peak(fn, *args, **kwargs):
+    """
+    Run fn and return (result, peak_bytes, retained_bytes), where both sizes
+    are relative to traced memory before the call.
+    """
+    with _lock:
+        return _measure(fn, args, kwargs, snapshot=False)[:3]
+
+def _measure(fn, args, kwargs, snapshot: bool):
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(TRACE_FRAMES)
+    try:
+        before_snapshot = tracemalloc.take_snapshot() if snapshot else None
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = fn(*args, **kwargs)
+        after, peak = tracemalloc.get_traced_memory()
+        sites = []
+        if snapshot:
+            filters = [tracemalloc.Filter(False, f) for f in _SKIP_FILES]
+            diff = tracemalloc.take_snapshot().filter_traces(filters).compare_to(
+                before_snapshot.filter_traces(filters), "lineno"
+            )
+            for stat in diff[:TOP_SITES]:
+                if stat.size_diff <= 0:
+                    break
+                frame = stat.traceback[0]
+                sites.append({"site": f"{frame.filename}:{frame.lineno}", "bytes": stat.size_diff,
+                              "count": stat.count_diff})
+        return result, peak - before, after - before, sites
+    finally:
+        if started and not _enabled:
+            tracemalloc.stop()
+
+def profile_call(tool: str, op: str, fn, args, kwargs, size: int = 0):
+    """Run one tool call under tracemalloc and record its memory profile."""
+    if getattr(_active, "depth", 0):
+        return fn(*args, **kwargs)
+    with _lock:
+        _active.depth = 1
+        try:
+            start = time.perf_counter()
+            result, peak, retained, sites = _measure(fn, args, kwargs, snapshot=True)
+            seconds = time.perf_counter() - start
+        finally:
+            _active.depth = 0
+    record = {
+        "tool": tool,
+        "op": op,
+        "input_bytes": size,
+        "peak_bytes": peak,
+        "retained_bytes": retained,
+        "peak_per_input_mb": round(peak / size, 2) if size else None,  # MB of peak per MB of input
+        "seconds": round(seconds, 4),
+        "top_sites": sites,
+    }
+    _records.append(record)
+    top = ", ".join(f"{s['site']} ({s['bytes'] / 1024:.0f} KB)" for s in sites[:3]) or "none"
+    logging.info(
+        f"Memory profile {tool}.{op}: input={size / 1024:.0f} KB peak={peak / 1024:.0f} KB "
+        f"retained={retained / 1024:.0f} KB top={top}"
+    )
+    return result
+
+def recent_profiles() -> list[dict]:
+    """Most recent profile records, newest first."""
+    return list(reversed(_records))
+
+def clear_profiles():
+    _records.clear()
@@ -0,0 +1,216 @@
+"""
+Optional on-disk, content-addressed result store shared across processes.
+
+A second tier behind utils.cache: when several Streamlit or API worker
+processes point at the same SQLite file, a result computed by one is served
+to the others without recomputation. The database runs in WAL mode so
+readers never block the single writer, and every process/thread opens its
+own connection.
+
+Entries expire after a TTL and the file is compacted back under its size
+budget by evicting the least recently read results.
+
+Because every process shares entries for up to a day, only deterministic
+results may be stored: random generators are cached (and stored) only when
+called with a seed, via utils.cache.cached(seed_arg=...).
+
+Enabled by setting DEVTOOLS_RESULT_STORE to a database path:
+    DEVTOOLS_RESULT_STORE=/var/cache/devtools/results.db
+    DEVTOOLS_RESULT_STORE_TTL=86400     # seconds (default one day)
+    DEVTOOLS_RESULT_STORE_MB=1024       # size budget (default 1 GB)
+"""
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_MB = 1024
+MAX_ITEM_BYTES = 32 * 1024 * 1024
+COMPACT_EVERY = 256            # puts between compaction passes
+ACCESS_RESOLUTION = 60         # seconds; avoids a write on every hit
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key      BLOB PRIMARY KEY,
+    tool     TEXT NOT NULL,
+    value    BLOB NOT NULL,
+    size     INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed);
+"""
+
+class ResultStore:
+    """SQLite-backed key/value store for pickled tool results."""
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+                 max_item_bytes: int = MAX_ITEM_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.hits = self.misses = self.writes = self.errors = 0
+        self._connect()  # create the schema eagerly so configuration errors surface at startup
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection, reopened after fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None,
+                               check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # only takes effect on a new database
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, attr: str):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def get(self, key: bytes):
+        """Return (True, value) on a fresh hit, (False, None) otherwise."""
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, accessed FROM results WHERE key = ? AND created > ?",
+                (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return False, None
+            if now - row[1] > ACCESS_RESOLUTION:
+                conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            value = pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError) as e:
+            self._count("errors")
+            logging.warning(f"Result store read failed: {e}")
+            return False, None
+        self._count("hits")
+        return True, value
+
+    def put(self, key: bytes, tool: str, value) -> bool:
+        """Persist a result; values over max_item_bytes or that cannot be pickled are skipped."""
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        if len(blob) > self.max_item_bytes:
+            return False
+        now = time.time()
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO results (key, tool, value, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, tool, blob, len(blob), now, now)
+            )
+        except sqlite3.Error as e:
+            self._count("errors")
+            logging.warning(f"Result store write failed: {e}")
+            return False
+        with self._lock:
+            self.writes += 1
+            self._puts += 1
+            due = self._puts >= COMPACT_EVERY
+            if due:
+                self._puts = 0
+        if due:
+            self.compact()
+        return True
+
+    def compact(self):
+        """Drop expired entries, then evict least recently read ones until under budget."""
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM results WHERE created <= ?", (time.time() - self.ttl,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            target = int(self.max_bytes * 0.9)  # leave headroom so compaction isn't rerun on every put
+            if total <= self.max_bytes:
+                target = total
+            while total > target:
+                rows = conn.execute(
+                    "SELECT key, size FROM results ORDER BY accessed LIMIT 256"
+                ).fetchall()
+                if not rows:
+                    break
+                evict, freed = [], 0
+                for key, size in rows:
+                    evict.append((key,))
+                    freed += size
+                    if total - freed <= target:
+                        break
+                conn.executemany("DELETE FROM results WHERE key = ?", evict)
+                total -= freed
+            conn.execute("PRAGMA incremental_vacuum")
+        except sqlite3.Error as e:
+            self._count("errors")
+            logging.warning(f"Result store compaction failed: {e}")
+
+    def clear(self):
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM results")
+            conn.execute("PRAGMA incremental_vacuum")
+        except sqlite3.Error as e:
+            logging.warning(f"Result store clear failed: {e}")
+
+    def stats(self) -> dict:
+        entries, size = 0, 0
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "writes": self.writes,
+                "errors": self.errors,
+            }
+
+# ── Process-wide store from the environment ───────────────────────────────────
+_store = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+def get_store():
+    """Return the configured ResultStore, or None when DEVTOOLS_RESULT_STORE is unset."""
+    global _store, _store_loaded
+    if _store_loaded:
+        return _store
+    with _store_lock:
+        if not _store_loaded:
+            path = os.environ.get("DEVTOOLS_RESULT_STORE")
+            if path:
+                try:
+                    _store = ResultStore(
+                        path,
+                        ttl=float(os.environ.get("DEVTOOLS_RESULT_STORE_TTL", DEFAULT_TTL)),
+                        max_bytes=int(float(os.environ.get("DEVTOOLS_RESULT_STORE_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+                    )
+                except (sqlite3.Error, ValueError) as e:
+                    logging.error(f"Result store disabled: {e}")
+            _store_loaded = True
+    return _store
+# ──────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,78 @@
+import hashlib
+import threading
+import bleach
+from bleach.sanitizer import Cleaner
+from utils.lru import LRUCache
+
+# ── Allowlist ─────────────────────────────────────────────────────────────────
+ALLOWED_TAGS = frozenset({
+    'p', 'br', 'strong', 'em', 'u', 'strike',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'ul', 'ol', 'li', 'blockquote', 'code', 'pre',
+    'a', 'img', 'table', 'thead', 'tbody', 'tr', 'td', 'th'
+})
+ALLOWED_ATTRS = {
+    'a': frozenset({'href', 'title', 'target', 'rel'}),
+    'img': frozenset({'src', 'alt', 'title', 'width', 'height'}),
+    'code': frozenset({'class'})
+}
+ALLOWED_PROTOCOLS = frozenset(bleach.sanitizer.ALLOWED_PROTOCOLS)
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Reusable cleaners ─────────────────────────────────────────────────────────
+# bleach Cleaners keep html5lib parser state, so each thread gets its own
+# instance, built once and reused for every call on that thread.
+_local = threading.local()
+
+def _build_cleaner() -> Cleaner:
+    return Cleaner(
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRS,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True
+    )
+
+def get_cleaner() -> Cleaner:
+    """Return this thread's shared Cleaner, creating it on first use."""
+    cleaner = getattr(_local, "cleaner", None)
+    if cleaner is None:
+        cleaner = _local.cleaner = _build_cleaner()
+    return cleaner
+
+get_cleaner()  # warm the importing thread's cleaner at startup
+# ──────────────────────────────────────────────────────────────────────────────
+
+# ── Content-hash cache ────────────────────────────────────────────────────────
+CLEAN_CACHE_MAX_ENTRIES = 8192
+_ALREADY_CLEAN = True  # stored instead of a copy when output == input
+
+_clean_cache = LRUCache(CLEAN_CACHE_MAX_ENTRIES)
+
+def _digest(html: str) -> bytes:
+    return hashlib.blake2b(html.encode("utf-8"), digest_size=16).digest()
+
+def sanitize_html_uncached(html: str) -> str:
+    """Clean HTML with this thread's reusable Cleaner, bypassing the cache."""
+    return get_cleaner().clean(html)
+
+def sanitize_html(html: str) -> str:
+    """
+    Clean HTML to remove disallowed tags and attributes, preventing XSS.
+    Fragments already sanitized are served from a content-hash cache;
+    output that is its own fixed point is also recorded, so re-sanitizing
+    clean HTML costs one hash instead of an html5lib parse.
+    """
+    key = _digest(html)
+    cached = _clean_cache.get(key)
+    if cached is _ALREADY_CLEAN:
+        return html
+    if cached is not None:
+        return cached
+
+    clean = sanitize_html_uncached(html)
+    if clean == html:
+        _clean_cache.put(key, _ALREADY_CLEAN)
+    else:
+        _clean_cache.put(key, clean)
+    return clean
+# ──────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,198 @@
+"""
+Upload handling shared by the Streamlit pages and the API.
+
+An Upload wraps either an in-memory buffer (Streamlit's UploadedFile) or a
+temporary file the source was spooled into chunk by chunk, with the size
+limit enforced while copying. Either way callers get the same access paths:
+
+- view(): zero-copy memoryview (the buffer itself, or an mmap of the file)
+- open_binary(): seekable binary stream
+- iter_chunks(): memoryview slices of bounded size
+- iter_text() / iter_lines(): incremental decoding in the detected encoding
+- read_text(): the whole text, decoded straight from view() in one copy
+
+Encoding detection looks at byte-order marks, then tries UTF-8, then falls
+back to Windows-1252 / Latin-1. Inputs that look binary (NUL or many
+control bytes) report no encoding and refuse text access.
+"""
+import codecs
+import io
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+
+CHUNK_SIZE = 1024 * 1024
+SNIFF_BYTES = 64 * 1024
+BINARY_CONTROL_RATIO = 0.1   # share of C0 control bytes (other than \t\n\r\f\b\x1b) that marks binary input
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_BINARY_CONTROLS = bytes(b for b in range(0x20) if b not in b"\t\n\r\f\b\x1b")
+
+class UploadLimitError(ValueError):
+    """Raised when an upload exceeds its size limit while being spooled."""
+
+class BinaryUploadError(ValueError):
+    """Raised when text access is requested for input that looks binary."""
+
+def detect_encoding(sample: bytes) -> str | None:
+    """Best-effort text encoding of a leading sample, or None if it looks binary."""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    if not sample:
+        return "utf-8"
+    if b"\x00" in sample:
+        return None
+    controls = len(sample) - len(sample.translate(None, _BINARY_CONTROLS))
+    if controls > len(sample) * BINARY_CONTROL_RATIO:
+        return None
+    try:
+        # final=False tolerates a multi-byte sequence cut at the sample boundary
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+class Upload:
+    """A size-checked upload with zero-copy, chunked and line-oriented access."""
+
+    def __init__(self, name: str, fileobj, size: int, path: str | None = None):
+        self.name = name
+        self.size = size
+        self.path = path            # set for spooled uploads; workers can reopen it
+        self._file = fileobj
+        self._encoding = ...        # detected lazily
+
+    # ── Construction ──
+    @classmethod
+    def from_buffer(cls, name: str, buffer: io.BytesIO) -> "Upload":
+        """Wrap an in-memory BytesIO (e.g. Streamlit's UploadedFile) without copying."""
+        with buffer.getbuffer() as buf:
+            size = buf.nbytes
+        return cls(name, buffer, size)
+
+    @classmethod
+    def spool(cls, name: str, source, max_bytes: int | None = None, chunk_size: int = CHUNK_SIZE) -> "Upload":
+        """
+        Copy a binary stream into a temporary file chunk by chunk, raising
+        UploadLimitError as soon as more than max_bytes have been read.
+        """
+        tmp = tempfile.NamedTemporaryFile(prefix="devtools-upload-", delete=False)
+        size = 0
+        try:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadLimitError(f"File too large. Max allowed is {max_bytes / 1024 / 1024:.0f} MB.")
+                tmp.write(chunk)
+            tmp.flush()
+            tmp.seek(0)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+        return cls(name, tmp, size, path=tmp.name)
+
+    # ── Binary access ──
+    def open_binary(self):
+        """The underlying seekable binary stream, rewound. Do not close it."""
+        self._file.seek(0)
+        return self._file
+
+    @contextmanager
+    def view(self):
+        """Zero-copy memoryview of the whole upload, released on exit."""
+        if self.size == 0:
+            yield memoryview(b"")
+        elif self.path is None:
+            with self._file.getbuffer() as buf:
+                yield buf
+        else:
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                buf = memoryview(mm)
+                try:
+                    yield buf
+                finally:
+                    buf.release()
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE):
+        """Yield memoryview slices of at most chunk_size bytes (valid until the next one)."""
+        with self.view() as buf:
+            for start in range(0, len(buf), chunk_size):
+                piece = buf[start:start + chunk_size]
+                try:
+                    yield piece
+                finally:
+                    piece.release()
+
+    # ── Text access ──
+    @property
+    def encoding(self) -> str | None:
+        if self._encoding is ...:
+            with self.view() as buf:
+                self._encoding = detect_encoding(bytes(buf[:SNIFF_BYTES]))
+        return self._encoding
+
+    def _text_encoding(self, encoding: str | None) -> str:
+        encoding = encoding or self.encoding
+        if encoding is None:
+            raise BinaryUploadError(f"{self.name} looks like a binary file, not text.")
+        return encoding
+
+    def iter_text(self, encoding: str | None = None, chunk_size: int = CHUNK_SIZE, errors: str = "strict"):
+        """Yield decoded text chunks; multi-byte sequences split across chunks are handled."""
+        decoder = codecs.getincrementaldecoder(self._text_encoding(encoding))(errors)
+        for piece in self.iter_chunks(chunk_size):
+            text = decoder.decode(piece)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def iter_lines(self, encoding: str | None = None, errors: str = "strict"):
+        """Yield lines with their original terminators, decoding incrementally."""
+        reader = io.TextIOWrapper(self.open_binary(), encoding=self._text_encoding(encoding),
+                                  errors=errors, newline="")
+        try:
+            yield from reader
+        finally:
+            reader.detach()  # leave the upload's stream open
+
+    def read_text(self, encoding: str | None = None, errors: str = "strict") -> str:
+        """Decode the whole upload in one pass from the zero-copy view."""
+        encoding = self._text_encoding(encoding)
+        with self.view() as buf:
+            return str(buf, encoding, errors)
+
+    # ── Lifetime ──
+    def close(self):
+        """Release the spooled file (memory-backed uploads belong to their owner)."""
+        if self.path is not None:
+            self._file.close()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()